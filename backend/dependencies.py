@@ -1,3 +1,4 @@
+import os
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import Client
@@ -60,3 +61,12 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     except Exception as e:
         print(f"Auth Error: {e}")
         raise HTTPException(status_code=401, detail=f"Authentication Failed: {str(e)}")
+
+def get_admin_user(user: dict = Depends(get_current_user)):
+    """
+    Restricts a route to platform operators listed in ADMIN_EMAILS (comma-separated).
+    """
+    admin_emails = [e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()]
+    if not user.get("email") or user["email"].lower() not in admin_emails:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from backend.dependencies import get_current_user
+from backend.dependencies import get_current_user, get_admin_user
+from backend.services.supabase_client import get_supabase
 from worker.utils.gemini_client import gemini_client
+from worker.utils.quota_ledger import QuotaLedger
 import time
 
 router = APIRouter(prefix="/api/diagnostics", tags=["Diagnostics"])
@@ -39,3 +41,20 @@ async def check_ai_health(user: dict = Depends(get_current_user)):
         "status": "online" if (status["gemini"]["active"] or status["groq"]["active"]) else "degraded",
         "details": status
     }
+
+@router.get("/quotas")
+async def get_provider_quotas(user: dict = Depends(get_admin_user)):
+    """
+    Shared Hydra search-provider quota usage (Serper, SerpApi, Google CSE...) per window.
+    """
+    supabase = get_supabase()
+    if not supabase:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    providers = QuotaLedger(supabase=supabase).get_status()
+    return {
+        "providers": {
+            name: {"windows": info["windows"], "exhausted": any(w["remaining"] == 0 for w in info["windows"])}
+            for name, info in providers.items()
+        }
+    }
@@ -0,0 +1,108 @@
+"""
+Benchmark: single-pass contact extraction vs the per-pattern passes it replaced.
+
+Loads a corpus of saved pages (default: scripts/fixtures/contact_pages) and
+times, per document:
+
+  legacy  - the old WebsiteEngine sequence: email findall, mailto findall,
+            phone findall, one search per social network, two address searches
+  single  - utils.contact_extractor.extract_contacts (one compiled finditer)
+
+Legacy phone counts are not phone counts: its capturing group made findall
+return only the country prefix ("+1 " or ""). Expected entities per page are
+asserted in test_contact_extractor.py. Pages are padded with their own <script> blocks (--pad) to reach the
+multi-hundred-KB size of real WordPress/Wix homepages.
+
+Usage (from repo root):
+    python scripts/benchmark_contact_extractor.py [--corpus DIR] [--pad 40] [--rounds 20]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+import urllib.parse
+
+# Add global worker path to sys.path so we can import modules
+sys.path.append(os.path.join(os.getcwd(), 'worker'))
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "contact_pages")
+
+
+def legacy_extract(document):
+    """The pre-extractor passes, patterns compiled on every call as they were."""
+    emails = set(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", document))
+    for href in re.findall(r"""href\s*=\s*["']mailto:([^"']+)["']""", document, re.I):
+        emails.add(href.split("?")[0].strip())
+    emails = [e for e in emails if not e.endswith(('.png', '.jpg', '.svg', '.gif', '.webp'))]
+    phones = set(re.findall(r"(\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}", document))
+    socials = {}
+    for platform, pattern in {
+        "linkedin": r"linkedin\.com/company/[\w-]+",
+        "facebook": r"facebook\.com/[\w\.]+",
+        "twitter": r"(twitter\.com|x\.com)/[\w]+",
+        "instagram": r"instagram\.com/[\w\.]+",
+        "youtube": r"youtube\.com/(channel|c|user)/[\w]+"
+    }.items():
+        match = re.search(pattern, document)
+        if match:
+            socials[platform] = "https://" + match.group(0)
+    address = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s+[A-Z]{2}\s+\d{5})', document) or \
+        re.search(r'([A-Z][a-z]+,\s+(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY))', document)
+    return emails, phones, socials, address
+
+
+def load_corpus(directory, pad):
+    docs = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        scripts = "".join(re.findall(r"<script\b.*?</script>", html, re.S)) or "<script>var x=1;</script>"
+        # Bulk up the <head> the way bundled JS/CSS does on real sites
+        docs.append((os.path.basename(path), html.replace("</head>", scripts * pad + "</head>", 1)))
+    return docs
+
+
+def time_it(fn, docs, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _, html in docs:
+            fn(html)
+    return (time.perf_counter() - start) / (rounds * len(docs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contact extraction: single compiled pass vs legacy passes")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of saved .html pages")
+    parser.add_argument("--pad", type=int, default=40, help="Times each page's scripts are repeated in <head>")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    from utils.contact_extractor import extract_contacts, summarize
+
+    docs = load_corpus(args.corpus, args.pad)
+    if not docs:
+        print(f"No .html pages in {args.corpus}")
+        return
+    avg_kb = sum(len(html) for _, html in docs) / len(docs) / 1024
+
+    print(f"=== Contact extraction benchmark ({len(docs)} pages, avg {avg_kb:.0f} KB, {args.rounds} rounds) ===")
+    for name, html in docs:
+        emails, phones, socials, _ = legacy_extract(html)
+        found = summarize(extract_contacts(html))
+        print(f"{name}: legacy {len(emails)} emails / {len(phones)} phones / {len(socials)} socials"
+              f" -> single {len(found['emails'])} / {len(found['phones'])} / {len(found['socials'])}")
+        dropped = sorted({urllib.parse.unquote(e).lower() for e in emails} - set(found["emails"]))
+        if dropped:
+            print(f"   filtered: {', '.join(dropped)}")
+
+    legacy = time_it(legacy_extract, docs, args.rounds)
+    single = time_it(extract_contacts, docs, args.rounds)
+    print(f"legacy passes : {legacy * 1000:.2f} ms per page")
+    print(f"single pass   : {single * 1000:.2f} ms per page")
+    print(f"speedup       : {legacy / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
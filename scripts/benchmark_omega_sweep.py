@@ -0,0 +1,119 @@
+"""
+Benchmark: Omega Protocol sweep latency, shared tab vs leased pages.
+
+Runs EnrichmentBridge.omega_protocol_sweep against a simulated browser and a
+simulated Hydra API that comes back empty, so every dork falls through to the
+browser fallback (the worst case). Compares:
+
+  shared  - every fallback queues for the one shared page (MAX_LEASED_PAGES=0)
+  leased  - busy page -> fallbacks lease their own tab from the context
+
+Usage (from repo root):
+    python scripts/benchmark_omega_sweep.py [--nav 0.4] [--api 0.2] [--leads 3] [--pool 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add global worker path to sys.path so we can import modules
+sys.path.append(os.path.join(os.getcwd(), 'worker'))
+
+
+class FakeContext:
+    def __init__(self, nav_seconds):
+        self.nav_seconds = nav_seconds
+        self.pages_opened = 0
+
+    async def new_page(self):
+        self.pages_opened += 1
+        await asyncio.sleep(0.05)  # Page creation cost
+        return FakePage(self)
+
+
+class FakePage:
+    """Just enough of a Playwright page for the dork fallbacks."""
+
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    async def goto(self, url, **kwargs):
+        if url != "about:blank":
+            await asyncio.sleep(self.context.nav_seconds)
+
+    def is_closed(self):
+        return self.closed
+
+    async def content(self):
+        return "<html></html>"
+
+    async def query_selector_all(self, selector):
+        return []
+
+    async def close(self):
+        self.closed = True
+
+
+async def run_sweeps(args, pool_size):
+    import utils.page_pool as page_pool
+    from utils.humanizer import Humanizer
+    from utils.hydra_client import hydra_client
+    from utils.enrichment_bridge import EnrichmentBridge
+    from utils.memory_governor import memory_governor
+
+    page_pool.MAX_LEASED_PAGES = pool_size
+    # Simulated pages cost no memory; don't let the host's usage skew the comparison
+    memory_governor.under_pressure = lambda: False
+
+    async def empty_api(query, type="search", target=30):
+        await asyncio.sleep(args.api)
+        return []
+
+    async def short_sleep(min_s, max_s):
+        await asyncio.sleep(args.nav / 2)
+
+    hydra_client.search_deep = empty_api
+    hydra_client.search = lambda *a, **k: empty_api(None)
+    Humanizer.random_sleep = staticmethod(short_sleep)
+
+    context = FakeContext(args.nav)
+    bridge = EnrichmentBridge(FakePage(context))
+    leads = [{"name": f"Benchmark Co {i}", "website": f"https://benchmark{i}.com"} for i in range(args.leads)]
+
+    start = time.perf_counter()
+    for lead in leads:
+        await bridge.omega_protocol_sweep(lead)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(leads), context.pages_opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Omega sweep latency: shared tab vs leased pages")
+    parser.add_argument("--nav", type=float, default=0.4, help="Simulated navigation seconds")
+    parser.add_argument("--api", type=float, default=0.2, help="Simulated Hydra API seconds")
+    parser.add_argument("--leads", type=int, default=3, help="Leads to sweep per mode")
+    parser.add_argument("--pool", type=int, default=3, help="MAX_LEASED_PAGES for the leased run")
+    args = parser.parse_args()
+
+    # Sweep output is noisy; keep the report readable
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        shared, _ = asyncio.run(run_sweeps(args, 0))
+        leased, opened = asyncio.run(run_sweeps(args, args.pool))
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    print("=== Omega sweep benchmark (all dorks fall back to the browser) ===")
+    print(f"nav={args.nav}s api={args.api}s leads={args.leads}")
+    print(f"shared tab : {shared:.2f}s per lead")
+    print(f"leased tabs: {leased:.2f}s per lead (pool {args.pool}, {opened} pages opened)")
+    if leased:
+        print(f"speedup    : {shared / leased:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: SERP extraction, per-element CDP calls vs one page.content() + local parse.
+
+Loads saved results pages (default: scripts/fixtures/serp_pages) and reports,
+per page:
+
+  legacy  - the CDP round trips LinkedInEngine's old walk issued for that page
+            (query_selector_all, then get_attribute / query_selector /
+            inner_text / evaluate_handle per link), times --rtt
+  parsed  - one page.content() round trip plus utils.serp_parser.parse_serp,
+            measured
+
+The legacy side is a cost model (the walk needs a live browser); the call
+counts per result are read off the code it replaced. Pages are padded with
+their own <script> blocks (--pad) to reach the size of live result pages.
+
+Usage (from repo root):
+    python scripts/benchmark_serp_parser.py [--corpus DIR] [--pad 10] [--rtt 4] [--rounds 20]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+# Add global worker path to sys.path so we can import modules
+sys.path.append(os.path.join(os.getcwd(), 'worker'))
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "serp_pages")
+
+# fixture name prefix -> (engine, CDP calls per result in the old walk)
+#   google desktop: get_attribute, query_selector(h3), inner_text, 2x evaluate_handle, inner_text, query_selector(img), get_attribute
+#   google basic:   query_selector(a), get_attribute, 2x query_selector(title), inner_text, query_selector(snippet), inner_text, query_selector(img), get_attribute
+#   bing / ddg:     get_attribute, inner_text
+ENGINES = {
+    "google_desktop": ("google", 8),
+    "google_basic": ("google", 9),
+    "bing": ("bing", 2),
+    "ddg": ("ddg", 2),
+}
+# page.content() + query_selector_all before the per-result calls
+LEGACY_FIXED_CALLS = 2
+
+
+def load_corpus(directory, pad):
+    docs = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        engine = next((spec for prefix, spec in ENGINES.items() if name.startswith(prefix)), None)
+        if engine is None:
+            continue
+        with open(path, encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        scripts = "".join(re.findall(r"<script\b.*?</script>", html, re.S)) or "<script>var x=1;</script>"
+        docs.append((name, engine, html.replace("</head>", scripts * pad + "</head>", 1)))
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SERP extraction: per-element CDP calls vs local parse")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of saved results pages")
+    parser.add_argument("--pad", type=int, default=10, help="Times each page's scripts are repeated in <head>")
+    parser.add_argument("--rtt", type=float, default=4.0, help="Milliseconds per CDP round trip")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed parses per page")
+    args = parser.parse_args()
+
+    from utils.serp_parser import parse_serp
+
+    docs = load_corpus(args.corpus, args.pad)
+    if not docs:
+        print(f"No results pages in {args.corpus}")
+        return
+
+    print(f"=== SERP extraction benchmark ({len(docs)} pages, rtt {args.rtt:.1f} ms, {args.rounds} rounds) ===")
+    legacy_total = parsed_total = 0.0
+    for name, (engine, per_result), html in docs:
+        results = parse_serp(html, engine)
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            parse_serp(html, engine)
+        parse_ms = (time.perf_counter() - start) / args.rounds * 1000
+
+        calls = LEGACY_FIXED_CALLS + per_result * len(results)
+        legacy_ms = calls * args.rtt
+        parsed_ms = args.rtt + parse_ms
+        legacy_total += legacy_ms
+        parsed_total += parsed_ms
+        print(f"{name} ({len(html) / 1024:.0f} KB): {len(results)} results | "
+              f"legacy {calls} calls ~{legacy_ms:.0f} ms | parsed 1 call + {parse_ms:.1f} ms parse = {parsed_ms:.1f} ms")
+
+    print(f"legacy walk   : ~{legacy_total / len(docs):.0f} ms per page")
+    print(f"content+parse : {parsed_total / len(docs):.1f} ms per page")
+    print(f"speedup       : {legacy_total / parsed_total:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+-- PROVIDER QUOTA LEDGER
+-- Created: 2026-03-04
+-- Purpose: Persistent, cross-worker free-tier accounting for the Hydra search providers
+--          (Serper, SerpApi, Zenserp, Google CSE...). Workers lease small blocks of calls
+--          atomically and spend them locally, so restarts and replicas never re-spend a budget.
+
+CREATE TABLE IF NOT EXISTS provider_quota_usage (
+    provider TEXT NOT NULL,
+    period TEXT NOT NULL CHECK (period IN ('day', 'month', 'total')),
+    period_key TEXT NOT NULL, -- '2026-03-04' (day), '2026-03' (month), 'all' (total)
+    used INTEGER NOT NULL DEFAULT 0,
+    quota_limit INTEGER NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (provider, period, period_key)
+);
+
+-- System table: only the service role (workers/backend) touches it
+ALTER TABLE provider_quota_usage ENABLE ROW LEVEL SECURITY;
+
+-- Atomically claim up to p_amount calls in one window. Returns the number granted (0 = exhausted).
+CREATE OR REPLACE FUNCTION public.fn_lease_provider_quota(
+  p_provider text,
+  p_period text,
+  p_period_key text,
+  p_amount integer,
+  p_limit integer
+)
+RETURNS integer AS $$
+DECLARE
+  current_used integer;
+  granted integer;
+BEGIN
+  INSERT INTO public.provider_quota_usage (provider, period, period_key, used, quota_limit)
+  VALUES (p_provider, p_period, p_period_key, 0, p_limit)
+  ON CONFLICT (provider, period, period_key) DO NOTHING;
+
+  SELECT used INTO current_used
+  FROM public.provider_quota_usage
+  WHERE provider = p_provider AND period = p_period AND period_key = p_period_key
+  FOR UPDATE;
+
+  granted := LEAST(p_amount, GREATEST(p_limit - current_used, 0));
+
+  UPDATE public.provider_quota_usage
+  SET used = used + granted,
+      quota_limit = p_limit,
+      updated_at = now()
+  WHERE provider = p_provider AND period = p_period AND period_key = p_period_key;
+
+  RETURN granted;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Return unspent leased calls on worker shutdown.
+CREATE OR REPLACE FUNCTION public.fn_release_provider_quota(
+  p_provider text,
+  p_period text,
+  p_period_key text,
+  p_amount integer
+)
+RETURNS void AS $$
+BEGIN
+  UPDATE public.provider_quota_usage
+  SET used = GREATEST(used - p_amount, 0),
+      updated_at = now()
+  WHERE provider = p_provider AND period = p_period AND period_key = p_period_key;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -0,0 +1,6 @@
+-- WORKER PROVIDER STATS
+-- Created: 2026-03-05
+-- Purpose: Hydra search-provider routing telemetry (rolling latency, success rate, yield per
+--          query type) published by each worker on its mesh pulse, for the swarm dashboards.
+
+ALTER TABLE worker_status ADD COLUMN IF NOT EXISTS provider_stats JSONB DEFAULT '{}'::jsonb;
@@ -0,0 +1,6 @@
+-- WORKER HTTP METRICS
+-- Created: 2026-03-06
+-- Purpose: Per-host outbound HTTP request counts, retries and latency from the shared
+--          worker HTTP client, published on each mesh pulse.
+
+ALTER TABLE worker_status ADD COLUMN IF NOT EXISTS http_metrics JSONB DEFAULT '{}'::jsonb;
@@ -0,0 +1,18 @@
+-- COMPANY ENRICHMENT CACHE
+-- Created: 2026-03-07
+-- Purpose: Per-company enrichment layer results shared across jobs and orgs. Rows are keyed
+--          by normalized domain ('d:acme.com') and by normalized-name hash ('n:<md5>'); each
+--          layer carries its own fetched_at so workers can apply per-layer TTLs.
+
+CREATE TABLE IF NOT EXISTS company_enrichment_cache (
+    company_key TEXT PRIMARY KEY,
+    domain TEXT,
+    company_name TEXT,
+    layers JSONB NOT NULL DEFAULT '{}'::jsonb, -- {"reputation": {"fields": {...}, "fetched_at": 1772841600}}
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_company_enrichment_cache_domain ON company_enrichment_cache(domain);
+
+-- System table: only the service role (workers) touches it
+ALTER TABLE company_enrichment_cache ENABLE ROW LEVEL SECURITY;
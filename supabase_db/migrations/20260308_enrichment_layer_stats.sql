@@ -0,0 +1,50 @@
+-- ENRICHMENT LAYER STATS
+-- Created: 2026-03-08
+-- Purpose: Measured yield and cost of each enrichment layer (attempts, hits, fields filled,
+--          seconds, search credits, timeouts, errors), shared by every worker. Feeds the
+--          adaptive enablement policy that samples or pauses low-yield layers.
+
+CREATE TABLE IF NOT EXISTS enrichment_layer_stats (
+    layer TEXT PRIMARY KEY,
+    attempts BIGINT NOT NULL DEFAULT 0,
+    hits BIGINT NOT NULL DEFAULT 0,           -- runs that filled at least one missing field
+    fields_filled BIGINT NOT NULL DEFAULT 0,
+    seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    credits BIGINT NOT NULL DEFAULT 0,        -- Hydra search credits spent
+    timeouts BIGINT NOT NULL DEFAULT 0,
+    errors BIGINT NOT NULL DEFAULT 0,
+    state TEXT DEFAULT 'active' CHECK (state IN ('active', 'sampled', 'disabled')),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- System table: only the service role (workers) touches it
+ALTER TABLE enrichment_layer_stats ENABLE ROW LEVEL SECURITY;
+
+-- Atomically add one worker's buffered counters.
+CREATE OR REPLACE FUNCTION public.fn_record_layer_stats(
+  p_layer text,
+  p_attempts integer,
+  p_hits integer,
+  p_fields_filled integer,
+  p_seconds double precision,
+  p_credits integer,
+  p_timeouts integer,
+  p_errors integer,
+  p_state text
+)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.enrichment_layer_stats (layer, attempts, hits, fields_filled, seconds, credits, timeouts, errors, state)
+  VALUES (p_layer, p_attempts, p_hits, p_fields_filled, p_seconds, p_credits, p_timeouts, p_errors, p_state)
+  ON CONFLICT (layer) DO UPDATE
+  SET attempts = enrichment_layer_stats.attempts + EXCLUDED.attempts,
+      hits = enrichment_layer_stats.hits + EXCLUDED.hits,
+      fields_filled = enrichment_layer_stats.fields_filled + EXCLUDED.fields_filled,
+      seconds = enrichment_layer_stats.seconds + EXCLUDED.seconds,
+      credits = enrichment_layer_stats.credits + EXCLUDED.credits,
+      timeouts = enrichment_layer_stats.timeouts + EXCLUDED.timeouts,
+      errors = enrichment_layer_stats.errors + EXCLUDED.errors,
+      state = EXCLUDED.state,
+      updated_at = now();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
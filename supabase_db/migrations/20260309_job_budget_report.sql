@@ -0,0 +1,7 @@
+-- JOB BUDGET REPORT
+-- Created: 2026-03-09
+-- Purpose: How each mission spent its time budget (budget, elapsed, deadline hit) and what
+--          work was skipped to meet it (stealth profiles, scrolls, enrichment leads/layers).
+--          Jobs set the budget via search_metadata.deadline_seconds / deadline_at or priority.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS budget_report JSONB DEFAULT '{}'::jsonb;
@@ -0,0 +1,19 @@
+-- WEBSITE FINGERPRINTS
+-- Created: 2026-03-10
+-- Purpose: Per-site conditional re-fetch state for the website contact crawler. For every
+--          crawled URL the worker keeps its ETag, Last-Modified and content hash, plus the
+--          contacts last extracted from the site, so a revisit that only gets 304s (or
+--          identical hashes) reuses the extraction instead of parsing the site again.
+
+CREATE TABLE IF NOT EXISTS website_fingerprints (
+    site_url TEXT PRIMARY KEY, -- lowercased, no trailing slash
+    pages JSONB NOT NULL DEFAULT '{}'::jsonb, -- {"https://acme.com/contact": {"etag": "...", "last_modified": "...", "hash": "<sha256>"}}
+    extracted JSONB, -- emails, phones, socials, logo_url, meta_description, location
+    checked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(), -- last revalidation
+    changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() -- last full crawl
+);
+
+CREATE INDEX IF NOT EXISTS idx_website_fingerprints_checked_at ON website_fingerprints(checked_at);
+
+-- System table: only the service role (workers) touches it
+ALTER TABLE website_fingerprints ENABLE ROW LEVEL SECURITY;
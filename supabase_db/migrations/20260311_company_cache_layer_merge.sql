@@ -0,0 +1,34 @@
+-- COMPANY CACHE LAYER MERGE
+-- Created: 2026-03-11
+-- Purpose: Write company enrichment layers without clobbering the row. A worker only holds
+--          the layers it loaded or ran for one lead; a plain upsert replaced every other
+--          cached layer for that company. Layers are merged one by one, newest fetched_at wins.
+
+CREATE OR REPLACE FUNCTION public.fn_merge_company_layers(
+  p_company_key text,
+  p_domain text,
+  p_company_name text,
+  p_layers jsonb
+)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.company_enrichment_cache (company_key, domain, company_name, layers, updated_at)
+  VALUES (p_company_key, p_domain, p_company_name, COALESCE(p_layers, '{}'::jsonb), now())
+  ON CONFLICT (company_key) DO UPDATE
+  SET layers = (
+        SELECT COALESCE(jsonb_object_agg(newest.key, newest.value), '{}'::jsonb)
+        FROM (
+          SELECT DISTINCT ON (both_sides.key) both_sides.key, both_sides.value
+          FROM (
+            SELECT key, value FROM jsonb_each(company_enrichment_cache.layers)
+            UNION ALL
+            SELECT key, value FROM jsonb_each(EXCLUDED.layers)
+          ) both_sides
+          ORDER BY both_sides.key, COALESCE((both_sides.value->>'fetched_at')::double precision, 0) DESC
+        ) newest
+      ),
+      domain = COALESCE(EXCLUDED.domain, company_enrichment_cache.domain),
+      company_name = COALESCE(EXCLUDED.company_name, company_enrichment_cache.company_name),
+      updated_at = now();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
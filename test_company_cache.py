@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+COMPANY CACHE TEST
+Namesake companies must not share cached enrichment.
+"""
+import asyncio
+import sys
+import os
+
+# Add worker to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'worker'))
+
+
+def _contacts(email):
+    return {"email": email, "emails": [email]}
+
+
+def test_namesakes_do_not_share_contacts():
+    """Two "Joe's Pizza" with different domains keep their own contacts"""
+    print("\n=== TEST 1: Namesakes With Domains ===")
+    from utils.company_cache import CompanyCache
+
+    cache = CompanyCache()
+    austin = {"name": "Joe's Pizza", "website": "https://joes-austin.com"}
+    boston = {"name": "Joe's Pizza", "website": "https://www.joes-boston.com/menu"}
+
+    entry = asyncio.run(cache.open(austin))
+    entry.store("contacts", _contacts("joe@joes-austin.com"))
+    entry.store("website_discovery", {"website": austin["website"]})
+    entry.flush()
+
+    entry = asyncio.run(cache.open(boston))
+    assert entry.get_fresh("contacts") is None, "[FAIL] Boston got Austin's contacts"
+    entry.store("contacts", _contacts("joe@joes-boston.com"))
+    entry.flush()
+
+    entry = asyncio.run(cache.open(austin))
+    assert entry.get_fresh("contacts")["email"] == "joe@joes-austin.com", "[FAIL] Austin's contacts were overwritten"
+    assert not any(k.startswith("n:") and set(v) - {"website_discovery"} for k, v in cache.memory.items()), \
+        "[FAIL] Non-website layers written under the name alias"
+    print("[OK] Each domain keeps its own contacts")
+    return True
+
+
+def test_domainless_namesake_gets_website_only():
+    """A lead without a domain reuses the name alias for website_discovery and nothing else"""
+    print("\n=== TEST 2: Namesake Without Domain ===")
+    from utils.company_cache import CompanyCache
+
+    cache = CompanyCache()
+    austin = {"name": "Joe's Pizza", "website": "https://joes-austin.com"}
+    entry = asyncio.run(cache.open(austin))
+    entry.store("contacts", _contacts("joe@joes-austin.com"))
+    entry.store("website_discovery", {"website": austin["website"]})
+    entry.flush()
+
+    entry = asyncio.run(cache.open({"name": "Joes Pizza"}))
+    assert entry.get_fresh("contacts") is None, "[FAIL] Domainless namesake got contacts"
+    assert entry.get_fresh("website_discovery") == {"website": austin["website"]}, "[FAIL] Website alias missed"
+    assert cache.seen_domain("Joe's Pizza") == "joes-austin.com"
+    print("[OK] Only website_discovery is shared by name")
+    return True
+
+
+def test_discovered_website_reuses_domain_record():
+    """A lead whose website is discovered mid-run picks up the domain's cached layers and keeps them"""
+    print("\n=== TEST 3: Website Discovered Mid-Run ===")
+    from utils.company_cache import CompanyCache
+    from utils.layer_scheduler import Layer, LayerScheduler
+
+    cache = CompanyCache()
+    first = {"name": "Acme", "website": "https://acme.com"}
+    entry = asyncio.run(cache.open(first))
+    entry.store("contacts", _contacts("hi@acme.com"))
+    entry.store("reputation", {"reputation_score": 80})
+    entry.flush()
+
+    class MockPage:
+        pass
+
+    ran = []
+
+    async def discover(lead, page):
+        lead["website"] = "https://www.acme.com"
+
+    def layer(name):
+        async def run(lead, page):
+            ran.append(name)
+        return run
+
+    async def enrich(lead):
+        entry = await cache.open(lead)
+        layers = [
+            Layer("website_discovery", discover, provides=("website",)),
+            Layer("contacts", layer("contacts"), after=("website_discovery",), needs=("website",), provides=("email",)),
+        ]
+
+        async def on_website():
+            entry.follow_website()
+
+        await LayerScheduler(layers).run(lead, MockPage(), entry, on_website=on_website)
+        entry.flush()
+
+    second = {"name": "Acme Inc"}
+    asyncio.run(enrich(second))
+    assert "contacts" not in ran, "[FAIL] Contacts recomputed although cached for the domain"
+    assert second.get("email") == "hi@acme.com", "[FAIL] Cached contacts not applied"
+    assert set(cache.memory["d:acme.com"]) >= {"contacts", "reputation", "website_discovery"}, \
+        "[FAIL] Domain record lost layers on save"
+    print("[OK] Domain record followed and kept whole")
+    return True
+
+
+def test_save_merges_layers():
+    """Two leads of one company each saving a different layer keep both"""
+    print("\n=== TEST 4: Layer-by-Layer Save ===")
+    from utils.company_cache import CompanyCache
+
+    cache = CompanyCache()
+    lead = {"name": "Acme", "website": "https://acme.com"}
+    one = asyncio.run(cache.open(lead))
+    two = asyncio.run(cache.open(dict(lead)))
+    one.store("contacts", _contacts("hi@acme.com"))
+    two.store("tech_stack", {"tech_stack": ["wordpress"]})
+    one.flush()
+    two.flush()
+    assert set(cache.memory["d:acme.com"]) == {"contacts", "tech_stack"}, "[FAIL] A save replaced the record"
+    print("[OK] Saves merge per layer")
+    return True
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("COMPANY CACHE VERIFICATION")
+    print("=" * 60)
+
+    tests = [
+        test_namesakes_do_not_share_contacts,
+        test_domainless_namesake_gets_website_only,
+        test_discovered_website_reuses_domain_record,
+        test_save_merges_layers,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"[FAIL] Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+CONTACT EXTRACTOR TEST
+Expected entities for each saved page in scripts/fixtures/contact_pages.
+"""
+import sys
+import os
+
+# Add worker to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'worker'))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "fixtures", "contact_pages")
+
+
+def _page(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _confidences(entities, kind):
+    """value -> best confidence, as summarize() would rank it"""
+    from utils.contact_extractor import CONFIDENCE_RANK
+    best = {}
+    for e in entities:
+        if e.kind == kind and CONFIDENCE_RANK[e.confidence] > CONFIDENCE_RANK.get(best.get(e.value), 0):
+            best[e.value] = e.confidence
+    return best
+
+
+def test_plumber_static():
+    """tel: link vs text phones, fax dropped, mailto high, placeholders and retina images filtered"""
+    print("\n=== TEST 1: plumber_static ===")
+    from utils.contact_extractor import extract_contacts, summarize
+
+    entities = extract_contacts(_page("plumber_static.html"))
+    found = summarize(entities)
+
+    assert found["phones"] == ["+15125550142", "512-555-0199"], f"[FAIL] Phones {found['phones']}"
+    phones = _confidences(entities, "phone")
+    assert phones["+15125550142"] == "high", "[FAIL] tel: link should rank high"
+    assert phones["(512) 555-0142"] == "medium" and phones["512-555-0199"] == "medium"
+    assert "512.555.0198" not in phones, "[FAIL] Fax number kept"
+
+    assert found["emails"] == ["service@lonestarplumbing.com", "mike.hernandez@lonestarplumbing.com"], f"[FAIL] Emails {found['emails']}"
+    emails = _confidences(entities, "email")
+    assert emails == {"service@lonestarplumbing.com": "high", "mike.hernandez@lonestarplumbing.com": "medium"}, emails
+
+    assert found["socials"] == {
+        "facebook": "https://facebook.com/LoneStarPlumbingATX",
+        "linkedin": "https://linkedin.com/company/lone-star-plumbing-drain",
+    }, f"[FAIL] Socials {found['socials']} (share/intent links must be skipped)"
+    assert found["address"] == "Austin, TX 78756"
+    print("[OK] 2 phones (tel: high), 2 emails, 2 socials, address")
+    return True
+
+
+def test_agency_wordpress():
+    """Encoded emails decoded, site-domain emails high, noreply low, Sentry DSN and image names filtered"""
+    print("\n=== TEST 2: agency_wordpress ===")
+    from utils.contact_extractor import extract_contacts, summarize
+
+    entities = extract_contacts(_page("agency_wordpress.html"), site_domain="www.northwindcreative.co")
+    found = summarize(entities)
+
+    assert _confidences(entities, "email") == {
+        "hello@northwindcreative.co": "high",
+        "priya@northwindcreative.co": "high",       # &#64; entity
+        "tom.becker@northwindcreative.co": "high",  # mailto: with %40
+        "jess.ortiz.design@gmail.com": "medium",
+        "noreply@northwindcreative.co": "low",
+    }, f"[FAIL] Emails {_confidences(entities, 'email')}"
+    assert found["emails"][-1] == "noreply@northwindcreative.co", "[FAIL] noreply should rank last"
+    assert not any("sentry" in e or "@2x" in e or "@3x" in e for e in found["emails"])
+
+    # JSON-LD "+1 (303) 555-0177" and footer "(303) 555-0177" are one number
+    assert found["phones"] == ["+1 (303) 555-0177"], f"[FAIL] Phones {found['phones']}"
+    assert found["socials"] == {
+        "instagram": "https://instagram.com/northwindcreative",
+        "linkedin": "https://linkedin.com/company/northwind-creative",
+        "twitter": "https://x.com/northwindco",
+        "youtube": "https://youtube.com/c/NorthwindCreative",
+    }, f"[FAIL] Socials {found['socials']}"
+    assert found["address"] == "Denver, CO 80205"
+    print("[OK] 5 emails ranked, 1 phone, 4 socials, address")
+    return True
+
+
+def test_impressum_de():
+    """International numbers, Telefax dropped, mailto beats the plain-text duplicate"""
+    print("\n=== TEST 3: impressum_de ===")
+    from utils.contact_extractor import extract_contacts, summarize
+
+    entities = extract_contacts(_page("impressum_de.html"))
+    found = summarize(entities)
+
+    assert found["phones"] == ["+49 711 555 0123", "+1 704-555-0161"], f"[FAIL] Phones {found['phones']}"
+    assert found["emails"] == ["info@keller-maschinenbau.de", "sales.us@keller-maschinenbau.de"], f"[FAIL] Emails {found['emails']}"
+    assert _confidences(entities, "email")["info@keller-maschinenbau.de"] == "high"
+    assert found["socials"] == {"linkedin": "https://linkedin.com/company/keller-maschinenbau"}
+    assert found["address"] == "Charlotte, NC 28202"
+    print("[OK] 2 phones, 2 emails, US address")
+    return True
+
+
+def test_inline_false_positives():
+    """Snippet-style text: IDs glued to digits and asset names are not contacts"""
+    print("\n=== TEST 4: Inline False Positives ===")
+    from utils.contact_extractor import extract_contacts, summarize
+
+    found = summarize(extract_contacts(
+        "order #A5125550142 icon@2x.min.js sprite@3x.webp support@example.com "
+        "Call 737-555-0101 or write jo%40acme-co.com"
+    ))
+    assert found["phones"] == ["737-555-0101"], f"[FAIL] Phones {found['phones']}"
+    assert found["emails"] == ["jo@acme-co.com"], f"[FAIL] Emails {found['emails']}"
+    print("[OK] Only the real phone and email survive")
+    return True
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CONTACT EXTRACTOR VERIFICATION")
+    print("=" * 60)
+
+    tests = [
+        test_plumber_static,
+        test_agency_wordpress,
+        test_impressum_de,
+        test_inline_false_positives,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"[FAIL] Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+    sys.exit(0 if failed == 0 else 1)
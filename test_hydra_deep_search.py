@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+HYDRA DEEP SEARCH TEST
+search_deep() walks pages until the listing really ends, not at the first short page.
+"""
+import asyncio
+import sys
+import os
+
+# Add worker to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'worker'))
+
+
+def _client(pages, fetched):
+    """A client whose only provider serves `pages` (page number -> list of results)."""
+    from utils.hydra_client import HydraClient
+
+    client = HydraClient()
+    client.api_keys = {"serpapi": "test-key"}
+
+    async def fetch_page(provider, query, type, query_type, page):
+        fetched.append(page)
+        return pages.get(page, [])
+
+    client._fetch_page = fetch_page
+    return client
+
+
+def _hits(start, count):
+    return [{"name": f"Result {i}", "source_url": f"https://example.com/{i}"} for i in range(start, start + count)]
+
+
+def test_short_pages_do_not_end_listing():
+    """Google often serves 7-9 organic hits; the next page still has results"""
+    print("\n=== TEST 1: Short Pages ===")
+    fetched = []
+    client = _client({0: _hits(0, 8), 1: _hits(8, 9), 2: _hits(17, 7), 3: _hits(24, 10)}, fetched)
+
+    results = asyncio.run(client.search_deep("plumbers austin", target=30))
+    assert len(results) == 30, f"[FAIL] Stopped early with {len(results)} results (pages {fetched})"
+    assert 3 in fetched
+    print(f"[OK] {len(results)} results from pages {sorted(set(fetched))}")
+    return True
+
+
+def test_listing_end_signals():
+    """Empty page, repeated page and the provider's own end marker stop paging"""
+    print("\n=== TEST 2: End Signals ===")
+    from utils.hydra_client import _end_of_listing
+
+    fetched = []
+    client = _client({0: _hits(0, 10), 1: _hits(10, 10)}, fetched)
+    results = asyncio.run(client.search_deep("empty after two", target=25))
+    assert len(results) == 20 and sorted(fetched) == [0, 1, 2], f"[FAIL] Empty page ignored (pages {fetched})"
+
+    fetched = []
+    client = _client({0: _hits(0, 10), 1: _hits(0, 10), 2: _hits(0, 10)}, fetched)
+    results = asyncio.run(client.search_deep("repeating provider", target=50))
+    assert len(results) == 10, f"[FAIL] Repeated page counted ({len(results)} results)"
+
+    fetched = []
+    first = _end_of_listing(_hits(0, 6), has_next=None)
+    client = _client({0: first, 1: _hits(6, 10)}, fetched)
+    results = asyncio.run(client.search_deep("one page only", target=30))
+    assert fetched == [0], f"[FAIL] Paged past the provider's last page (pages {fetched})"
+
+    assert not _end_of_listing(_hits(0, 10), "https://serpapi.com/search?start=10").last
+    assert _end_of_listing(_hits(0, 10), "next", total="1,240", page=123).last, "[FAIL] Total results ignored"
+    assert not _end_of_listing(_hits(0, 10), "next", total="1,240", page=2).last
+    print("[OK] Empty, repeated and provider-reported last pages end the listing")
+    return True
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("HYDRA DEEP SEARCH VERIFICATION")
+    print("=" * 60)
+
+    tests = [
+        test_short_pages_do_not_end_listing,
+        test_listing_end_signals,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"[FAIL] Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+    sys.exit(0 if failed == 0 else 1)
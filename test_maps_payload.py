@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+GOOGLE MAPS PAYLOAD TEST
+Decodes saved Maps responses (scripts/fixtures/maps_payloads) and checks that
+DOM cards and network places merge by identity.
+
+The fixtures follow the layout of a `tbm=map` XHR body and a search page's
+APP_INITIALIZATION_STATE, trimmed to a few places and the positions the
+decoder reads; ids and phone numbers are placeholders. When Google moves a
+field, save a fresh response over them and update the expected values here:
+a broken decode must fail here, not fall back to DOM cards unnoticed.
+"""
+import sys
+import os
+
+# Add worker to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'worker'))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "fixtures", "maps_payloads")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_decode_tbm_map_response():
+    """XHR results body: every place, with its fields where the decoder expects them"""
+    print("\n=== TEST 1: tbm=map Response ===")
+    from utils.maps_payload import decode_places
+
+    places = decode_places(_fixture("search_tbm_map.json"))
+    assert [p["name"] for p in places] == ["Starbucks", "Starbucks", "Joe's Plumbing & Drain", "Blue Door Bakery"], \
+        f"[FAIL] Decoded {[p['name'] for p in places]}"
+
+    joes = places[2]
+    assert joes["address"] == "4301 Duval St, Austin, TX 78751"
+    assert joes["phone"] == "(512) 555-0199"
+    assert joes["website"] == "http://joesplumbingatx.com/"
+    assert joes["category"] == "Plumber"
+    assert joes["place_id"] == "ChIJr7mU1ZS1RIYRq2x6b0n2aQ8"
+    assert (round(joes["geo_lat"], 4), round(joes["geo_lng"], 4)) == (30.3072, -97.7261)
+    assert joes["rating"] == "4.8(127)" and joes["reviews_count"] == 127
+    assert joes["source_url"] == "https://www.google.com/maps/place/?q=place_id:ChIJr7mU1ZS1RIYRq2x6b0n2aQ8"
+
+    # Chain branches are separate places
+    assert {p["address"] for p in places[:2]} == {"100 Congress Ave, Austin, TX 78701", "500 W 5th St, Austin, TX 78701"}
+
+    # Sparse place: address from its parts, no phone/website/place_id
+    bakery = places[3]
+    assert bakery["address"] == "S Lamar Blvd, Austin, TX", f"[FAIL] Address {bakery['address']!r}"
+    assert bakery["phone"] == "N/A" and bakery["website"] is None and bakery["place_id"] is None
+    assert bakery["rating"] == "N/A"
+    print(f"[OK] {len(places)} places decoded with phone, website, place_id and coordinates")
+    return True
+
+
+def test_decode_init_state_page():
+    """Search page HTML: places embedded in APP_INITIALIZATION_STATE"""
+    print("\n=== TEST 2: APP_INITIALIZATION_STATE ===")
+    from utils.maps_payload import decode_places
+
+    places = decode_places(_fixture("search_page_init_state.html"))
+    assert [p["name"] for p in places] == ["Austin Java", "Starbucks"], f"[FAIL] Decoded {[p['name'] for p in places]}"
+    java = places[0]
+    assert java["phone"] == "(512) 555-0111"
+    assert java["website"] == "https://austinjava.com/"
+    assert java["categories"] == ["Coffee shop", "Breakfast restaurant"]
+    assert java["place_id"] == "ChIJ7bWq9X61RIYR0p7gBSXq4mA"
+    print(f"[OK] {len(places)} places decoded from the page")
+    return True
+
+
+def test_merge_dom_cards_with_network_places():
+    """DOM cards merge into the network place they show; chain branches and unseen places stay separate"""
+    print("\n=== TEST 3: DOM / Network Merge ===")
+    from utils.maps_payload import decode_places
+    from scrapers.google_maps_engine import listing_keys, merge_listings, parse_listings
+
+    network = decode_places(_fixture("search_tbm_map.json"))
+    dom = parse_listings([
+        # Same branch as the first network Starbucks (coordinates in the href)
+        {"href": "https://www.google.com/maps/place/Starbucks/data=!4m7!3m6!1s0x8644b5a0b1f2a6b1:0x2b1c3f0d6c0e8a11!8m2!3d30.2665482!4d-97.7428321",
+         "text": "Starbucks\n4.2(812)\nCoffee shop · 100 Congress Ave"},
+        # Same place as Joe's, matched by name + street number
+        {"href": "https://www.google.com/maps/place/Joe's+Plumbing/data=!4m2!3m1!1s0x8644b5d4d5a1b9af:0x0f69f2b46f7a6cab",
+         "text": "Joe's Plumbing & Drain\n4.8(127)\nPlumber · 4301 Duval St, Austin"},
+        # A third Starbucks branch the capture missed
+        {"href": "https://www.google.com/maps/place/Starbucks/data=!4m7!3m6!1s0x8644b4aa:0x77!8m2!3d30.2401200!4d-97.7860100",
+         "text": "Starbucks\n3.9(210)\nCoffee shop · 2300 S Lamar Blvd, Austin"},
+    ])
+    assert len(dom) == 3
+
+    assert "na:starbucks|100" in listing_keys(network[0])
+    assert any(key.startswith("ll:starbucks|30.267,-97.743") for key in listing_keys(dom[0]))
+
+    merged = merge_listings([dict(p) for p in network], dom)
+    starbucks = [p for p in merged if p["name"] == "Starbucks"]
+    assert len(merged) == 5, f"[FAIL] Expected 4 network places + 1 new DOM card, got {len(merged)}"
+    assert len(starbucks) == 3, "[FAIL] Chain branches collapsed or duplicated"
+    assert merged[0]["source_url"] == dom[0]["source_url"], "[FAIL] Matched card's place link not kept"
+    assert merged[0]["capture"] == "network" and merged[0]["place_id"] == network[0]["place_id"]
+    assert merged[-1]["source_url"] == dom[2]["source_url"], "[FAIL] Unseen branch not appended"
+    print("[OK] Cards matched by coordinates / street number; branches kept apart")
+    return True
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("GOOGLE MAPS PAYLOAD VERIFICATION")
+    print("=" * 60)
+
+    tests = [
+        test_decode_tbm_map_response,
+        test_decode_init_state_page,
+        test_merge_dom_cards_with_network_places,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"[FAIL] Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+SERP PARSER TEST
+Expected results for each saved page in scripts/fixtures/serp_pages.
+"""
+import sys
+import os
+
+# Add worker to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'worker'))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "fixtures", "serp_pages")
+
+SLUGS = [
+    "jane-doe-0a0b", "marcus-lee-1a1b", "priya-raman-2a2b", "tom-becker-3a3b", "ana-souza-4a4b",
+    "david-kim-5a5b", "elena-petrova-6a6b", "sam-okafor-7a7b", "rachel-green-8a8b", "luis-ortega-9a9b",
+]
+FIRST_TITLE = "Jane Doe - Chief Technology Officer - Acme Robotics | LinkedIn"
+
+
+def _parse(name, engine):
+    from utils.serp_parser import parse_serp
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return parse_serp(f.read(), engine)
+
+
+def _check_common(results, count):
+    """Profile URLs unwrapped and in page order, titles and snippets filled"""
+    assert len(results) == count, f"[FAIL] Expected {count} results, got {len(results)}"
+    assert [r.url for r in results] == [f"https://www.linkedin.com/in/{s}" for s in SLUGS[:count]], \
+        f"[FAIL] URLs {[r.url for r in results]}"
+    assert [r.position for r in results] == list(range(1, count + 1))
+    assert results[0].title == FIRST_TITLE, f"[FAIL] Title {results[0].title!r}"
+    assert all(r.title.endswith("| LinkedIn") for r in results), "[FAIL] Title cut or merged with the snippet"
+    assert all(r.snippet for r in results), "[FAIL] Missing snippet"
+    assert all(r.snippet not in r.title and r.title not in r.snippet for r in results)
+
+
+def test_google_desktop():
+    """Desktop Google: 10 results with inline favicon thumbnails"""
+    print("\n=== TEST 1: google_desktop ===")
+    results = _parse("google_desktop.html", "google")
+    _check_common(results, 10)
+    assert results[0].snippet.startswith("Austin, TX. Chief Technology Officer at Acme Robotics."), \
+        f"[FAIL] Snippet {results[0].snippet!r}"
+    assert all(r.image and r.image.startswith("data:image/png;base64,") for r in results), "[FAIL] Thumbnail missing"
+    print("[OK] 10 results with titles, snippets and thumbnails")
+    return True
+
+
+def test_google_basic():
+    """Basic HTML Google: /url?q= redirects unwrapped, no thumbnails"""
+    print("\n=== TEST 2: google_basic ===")
+    results = _parse("google_basic.html", "google")
+    _check_common(results, 8)
+    assert results[0].snippet.startswith("Austin, TX · Chief Technology Officer at Acme Robotics"), \
+        f"[FAIL] Snippet {results[0].snippet!r}"
+    assert all(r.image is None for r in results)
+    print("[OK] 8 results from redirect links")
+    return True
+
+
+def test_bing():
+    """Bing: ck/a redirects decoded, "Web" caption label not in the snippet"""
+    print("\n=== TEST 3: bing ===")
+    results = _parse("bing.html", "bing")
+    _check_common(results, 10)
+    assert results[0].snippet.startswith("Austin, TX · Chief Technology Officer · Acme Robotics"), \
+        f"[FAIL] Snippet {results[0].snippet!r}"
+    assert not any(r.snippet.startswith("Web") or r.text.startswith("Web") for r in results), \
+        "[FAIL] Caption label kept in the snippet"
+    assert all(r.image == "https://th.bing.com/th?id=ODLS.linkedin&w=32&h=32" for r in results), "[FAIL] Favicon missing"
+    print("[OK] 10 results, clean snippets, favicons")
+    return True
+
+
+def test_ddg():
+    """DuckDuckGo: 9 results, duplicate links counted once"""
+    print("\n=== TEST 4: ddg ===")
+    results = _parse("ddg.html", "ddg")
+    _check_common(results, 9)
+    assert results[0].snippet.startswith("Austin, TX · Chief Technology Officer · Acme Robotics."), \
+        f"[FAIL] Snippet {results[0].snippet!r}"
+    assert all(r.image is None for r in results)
+    print("[OK] 9 results")
+    return True
+
+
+def test_clean_href():
+    """Redirect unwrapping per engine; in-engine links dropped"""
+    print("\n=== TEST 5: clean_href ===")
+    from utils.serp_parser import clean_href
+
+    target = "https://www.linkedin.com/in/jane-doe-0a0b"
+    assert clean_href("/url?q=https%3A%2F%2Fwww.linkedin.com%2Fin%2Fjane-doe-0a0b&sa=U&ved=2ahUKE0") == target
+    assert clean_href("https://www.google.com/url?sa=t&url=https%3A%2F%2Fwww.linkedin.com%2Fin%2Fjane-doe-0a0b") == target
+    assert clean_href(
+        "https://www.bing.com/ck/a?!&&p=ab0&ptn=3&ver=2&hsh=3&u=a1aHR0cHM6Ly93d3cubGlua2VkaW4uY29tL2luL2phbmUtZG9lLTBhMGI&ntb=1"
+    ) == target, "[FAIL] Bing base64 redirect"
+    assert clean_href("//duckduckgo.com/l/?uddg=https%3A%2F%2Fwww.linkedin.com%2Fin%2Fjane-doe-0a0b&rut=abc") == target
+    assert clean_href("//www.linkedin.com/in/jane-doe-0a0b") == target
+
+    assert clean_href("/search?q=jane+doe&tbm=isch") is None, "[FAIL] In-engine link kept"
+    assert clean_href("/images/search?q=jane+doe") is None
+    assert clean_href("#") is None and clean_href("") is None
+    print("[OK] Google, Bing and DuckDuckGo redirects unwrapped")
+    return True
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SERP PARSER VERIFICATION")
+    print("=" * 60)
+
+    tests = [
+        test_google_desktop,
+        test_google_basic,
+        test_bing,
+        test_ddg,
+        test_clean_href,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"[FAIL] Test failed with exception: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+    sys.exit(0 if failed == 0 else 1)
@@ -26,6 +26,14 @@ from utils.geocoder import geocoder
 from utils.ghostwriter import ghostwriter
 from utils.deduplication_service import get_dedup_service
 from utils.rate_limiter import get_rate_limiter
+from utils.quota_ledger import quota_ledger
+from utils.company_cache import company_cache
+from utils.layer_stats import layer_stats
+from utils.site_fingerprints import site_fingerprints
+from utils.enrichment_goal import EnrichmentGoal
+from utils.time_budget import TimeBudget, use_budget
+from utils.hydra_client import hydra_client
+from utils.http_client import http_client
 
 # Try to import Supabase, but don't fail immediately if missing (allows local dev setup)
 try:
@@ -42,6 +50,12 @@ except ImportError:
 load_dotenv()
 load_dotenv("zero_cost.env") # Ensure Zero-Cost settings are loaded
 
+# --- JOB TIME BUDGET SPLIT ---
+SCRAPE_SHARE = 0.5           # Share of the remaining budget one scrape attempt may use
+SCRAPE_GRACE_SECONDS = 15    # Extra time for engines to hand back partial results
+SAVE_RESERVE_SECONDS = 20    # Kept back from enrichment for vaulting leads
+MIN_ATTEMPT_SECONDS = 45     # Don't start another stealth profile with less than this left
+
 
 class HydraController:
     def __init__(self, worker_id=None):
@@ -62,6 +76,10 @@ class HydraController:
                 print(f"[{self.worker_id}] Supabase Connection Active.")
                 geocoder.supabase = self.supabase
                 ghostwriter.supabase = self.supabase
+                quota_ledger.supabase = self.supabase  # Shared provider quota counters
+                company_cache.supabase = self.supabase  # Cross-job company enrichment cache
+                layer_stats.supabase = self.supabase  # Shared per-layer yield stats
+                site_fingerprints.supabase = self.supabase  # Website ETag/hash for conditional re-fetch
                 self.dedup_service = get_dedup_service(self.supabase)  # Initialize dedup service
                 print(f"✅ Deduplication service initialized")
                 # Schema discovery will happen lazily in mesh_pulse or heartbeat
@@ -131,7 +149,7 @@ class HydraController:
                 else:
                     flat_leads.append(item)
             
-            return await bridge.enrich_business_leads(flat_leads)
+            return [lead async for lead in bridge.enrich_business_leads(flat_leads)]
         return data
 
     async def poll_and_claim(self):
@@ -162,6 +180,10 @@ class HydraController:
         compliance = job_data.get('compliance', {})
         
         print(f"⚔️ Engaging Target: {query} [{platform}]")
+
+        # Deadline for the whole mission (search_metadata or priority); engines and the bridge read it
+        budget = TimeBudget.for_job(job_data)
+        print(f"   ⏳ Time budget: {budget.seconds:.0f}s")
         
         # --- INITIALIZATION SAFETY ---
         scraped_data = {}
@@ -289,7 +311,11 @@ class HydraController:
 
         from playwright.async_api import async_playwright
 
-        for attempt_profile in stealth_profiles:
+        for attempt_index, attempt_profile in enumerate(stealth_profiles):
+            if budget.remaining() < MIN_ATTEMPT_SECONDS:
+                print(f"[{self.worker_id}] ⏳ Budget too low for another cloak, stopping persistence.")
+                budget.note_skip("stealth_profiles", len(stealth_profiles) - attempt_index)
+                break
             print(f"[{self.worker_id}] 🛡️ Eternal Persistence: Attempting {attempt_profile.upper()} Cloak...")
             try:
                 async with async_playwright() as p:
@@ -341,106 +367,24 @@ class HydraController:
                         
                         if platform != 'linkedin':
                             print(f"   -> Navigating to {target_url}...")
-                            await page.goto(target_url, timeout=30000)
+                            await page.goto(target_url, timeout=max(1000, budget.cap(30) * 1000))
                             await page.wait_for_load_state("networkidle")
                             await stealth_v2.enact_human_behavior(page)
                         
                         final_url = page.url
                         
-                        # Platform Dispatcher
-                        if platform == "linkedin":
-                            from scrapers.linkedin_engine import LinkedInEngine
-                            engine = LinkedInEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == "google_maps":
-                            from scrapers.google_maps_engine import GoogleMapsEngine
-                            engine = GoogleMapsEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == "google_maps_grid":
-                            from scrapers.google_maps_grid_engine import GoogleMapsGridEngine
-                            engine = GoogleMapsGridEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == "directory":
-                            from scrapers.directory_engine import DirectoryEngine
-                            engine = DirectoryEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ["producthunt", "tiktok", "amazon", "shopify", "omni"]:
-                            from scrapers.omni_scout_engine import OmniScoutEngine
-                            engine = OmniScoutEngine(page)
-                            data_results = await engine.unified_scout(query)
-                        elif platform == 'twitter':
-                            from scrapers.social_radar import TwitterEngine
-                            engine = TwitterEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == 'instagram':
-                            from scrapers.social_radar import InstagramEngine
-                            engine = InstagramEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['google_news', 'news']:
-                            from scrapers.news_pulse_engine import NewsPulseEngine
-                            engine = NewsPulseEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == 'real_estate':
-                            from scrapers.real_estate_engine import RealEstateEngine
-                            engine = RealEstateEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['job_scout', 'hiring']:
-                            from scrapers.job_scout_engine import JobScoutEngine
-                            engine = JobScoutEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == 'facebook':
-                            from scrapers.facebook_engine_v2 import FacebookEngineV2
-                            engine = FacebookEngineV2(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == 'trade':
-                            from scrapers.trade_data_engine import TradeDataEngine
-                            engine = TradeDataEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['gov', 'government', 'contracts']:
-                            from scrapers.government_contracts_engine import GovernmentContractsEngine
-                            engine = GovernmentContractsEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['patent', 'patents', 'innovation', 'ip']:
-                            from scrapers.patent_intelligence_engine import PatentIntelligenceEngine
-                            engine = PatentIntelligenceEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['event', 'events', 'networking', 'meetup']:
-                            from scrapers.events_networking_engine import EventsNetworkingEngine
-                            engine = EventsNetworkingEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['reputation', 'reviews', 'trust', 'ratings']:
-                            from scrapers.reputation_engine import ReputationEngine
-                            engine = ReputationEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['capital', 'finance', 'sec', 'funding']:
-                            from scrapers.capital_growth_engine import CapitalGrowthEngine
-                            engine = CapitalGrowthEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform in ['academic', 'research', 'papers', 'science']:
-                            from scrapers.academic_research_engine import AcademicResearchEngine
-                            engine = AcademicResearchEngine(page)
-                            data_results = await engine.scrape(query)
-                        elif platform == "generic" and not query.startswith("http"):
-                            # INTELLIGENT ROUTING: Detect if query is for a LIST or a SPECIFIC COMPANY
-                            query_lower = query.lower()
-                            list_indicators = ["companies", "agencies", "firms", "startups", "providers", "services", " in ", " near ", "list of", "top "]
-                            is_list_query = any(ind in query_lower for ind in list_indicators)
-                            
-                            if is_list_query:
-                                print(f"[{self.worker_id}] 🔀 Routing 'generic' list query to Google Maps Engine: {query}")
-                                from scrapers.google_maps_engine import GoogleMapsEngine
-                                engine = GoogleMapsEngine(page)
-                                # Maps engine expects "scrape(query)"
-                                data_results = await engine.scrape(query)
-                            else:
-                                print(f"[{self.worker_id}] 🎯 Routing 'generic' specific query to Global Radar: {query}")
-                                from scrapers.base_dork_engine import BaseDorkEngine
-                                engine = BaseDorkEngine(page, "Global Radar")
-                                data_results = await engine.run_dork_search(query, "")
-                        else:
-                            from scrapers.website_engine import WebsiteEngine
-                            engine = WebsiteEngine(page)
-                            data_results = await engine.scrape(target_url)
+                        # Platform Dispatcher (engines read the scrape budget and return partial results)
+                        scrape_budget = budget.sub("scrape", fraction=SCRAPE_SHARE)
+                        with use_budget(scrape_budget):
+                            try:
+                                data_results = await asyncio.wait_for(
+                                    self._run_engine(platform, query, target_url, page, job_data.get('search_metadata') or {}),
+                                    timeout=scrape_budget.remaining() + SCRAPE_GRACE_SECONDS
+                                )
+                            except asyncio.TimeoutError:
+                                print(f"   ⏳ Scrape phase ran out of budget ({attempt_profile.upper()}).")
+                                budget.note_skip("scrape_timeout")
+                                data_results = []
 
 
                         if data_results:
@@ -453,24 +397,36 @@ class HydraController:
                             print(f"📂 Auto-detected category: {category}")
                             
                             # Execute Bridge with Streaming WITHIN BROWSER CONTEXT
-                            needs_enrichment = any(not lead.get('email') for lead in data_results[:10])
+                            # Jobs may declare target fields; leads stop enriching once they're met
+                            goal = EnrichmentGoal.from_metadata(job_data.get('search_metadata'))
+                            if goal:
+                                needs_enrichment = any(not goal.satisfied(lead) for lead in data_results[:50])
+                            else:
+                                needs_enrichment = any(not lead.get('email') for lead in data_results[:10])
                             is_person_platform = platform in ['linkedin', 'twitter', 'instagram']
                             
                             if (needs_enrichment and not is_person_platform) or platform in ['google_maps', 'duckduckgo']:
                                  print(f"🌉 Bridge: Running Streaming Enrichment for {len(data_results)} entities...")
                                  bridge = EnrichmentBridge(page)
-                                 # Process top 50 (Self-Healing)
-                                 async for enriched_lead in bridge.enrich_business_leads(data_results[:50]):
-                                      # Check for cancellation between each lead
-                                      try:
-                                          if self.supabase:
-                                              refresh_res = self.supabase.table('jobs').select('status').eq('id', job_id).execute()
-                                              if refresh_res.data and refresh_res.data[0]['status'] == 'cancelled':
-                                                  print(f"[{self.worker_id}] 🛑 Mission cancelled during enrichment. Saving progress and exiting.")
-                                                  break
-                                      except: pass
-                                      
-                                      await process_and_save_lead(enriched_lead)
+                                 # Process top 50 (Self-Healing), several leads at a time on a page pool
+                                 enrichment = bridge.enrich_business_leads(data_results[:50], goal=goal)
+                                 enrichment_budget = budget.sub("enrichment", reserve=SAVE_RESERVE_SECONDS)
+                                 try:
+                                     with use_budget(enrichment_budget):
+                                         async for enriched_lead in enrichment:
+                                             # Check for cancellation between each lead
+                                             try:
+                                                 if self.supabase:
+                                                     refresh_res = self.supabase.table('jobs').select('status').eq('id', job_id).execute()
+                                                     if refresh_res.data and refresh_res.data[0]['status'] == 'cancelled':
+                                                         print(f"[{self.worker_id}] 🛑 Mission cancelled during enrichment. Saving progress and exiting.")
+                                                         break
+                                             except: pass
+                                          
+                                             await process_and_save_lead(enriched_lead)
+                                 finally:
+                                     # Stops in-flight pool workers and closes their pages right away
+                                     await enrichment.aclose()
                                  
                                  # Save remaining non-enriched leads if any (less likely to be useful but keeps parity)
                                  for lead in data_results[50:]:
@@ -506,6 +462,7 @@ class HydraController:
                                     print(f"   📍 With Location: {quality_stats['with_location']} ({quality_stats['with_location']/quality_stats['total_leads']*100:.1f}%)")
                                     print(f"   🔗 With Social Media: {quality_stats['with_socials']} ({quality_stats['with_socials']/quality_stats['total_leads']*100:.1f}%)")
                             
+                            self._record_budget(job_id, budget)
                             print(f"🏁 Mission {job_id} Complete. {saved_count} flags planted in the Vault.")
                             
                             # SUCCESSFUL EXIT - Browser will be closed by finally block
@@ -557,7 +514,125 @@ class HydraController:
                     'result_count': 0,
                     'completed_at': datetime.now().isoformat()
                 }).eq('id', job_id).execute()
+        self._record_budget(job_id, budget)
+
+    def _record_budget(self, job_id, budget):
+        """Store how the time budget was spent and what was skipped to meet it."""
+        report = budget.report()
+        if report['skipped']:
+            print(f"   ⏳ Budget report: {report['elapsed_s']}s of {report['budget_s']:.0f}s, skipped {report['skipped']}")
+        if not self.supabase:
+            return
+        try:
+            self.supabase.table('jobs').update({'budget_report': report}).eq('id', job_id).execute()
+        except Exception as e:
+            print(f"   ⚠️ Could not store budget report: {e}")
+
 
+    async def _run_engine(self, platform, query, target_url, page, search_metadata=None):
+        """
+        Platform Dispatcher: runs the scraping engine for a job's platform on the page.
+        search_metadata carries per-job engine options (e.g. "place_details" for Maps).
+        """
+        search_metadata = search_metadata or {}
+        if platform == "linkedin":
+            from scrapers.linkedin_engine import LinkedInEngine
+            engine = LinkedInEngine(page)
+            return await engine.scrape(query)
+        elif platform == "google_maps":
+            from scrapers.google_maps_engine import GoogleMapsEngine
+            engine = GoogleMapsEngine(page)
+            # Place pages for cards without website/phone: opt-in per job (MAPS_DETAIL_PASS otherwise)
+            return await engine.scrape(query, details=search_metadata.get('place_details'))
+        elif platform == "google_maps_grid":
+            from scrapers.google_maps_grid_engine import GoogleMapsGridEngine
+            engine = GoogleMapsGridEngine(page)
+            # "plumbers in Austin, TX" -> tile Austin's bounding box searching "plumbers"
+            what, _, where = query.partition(" in ")
+            if what.strip() and where.strip():
+                return await engine.scrape(what.strip(), location_grid=where.strip())
+            return await engine.scrape(query)
+        elif platform == "directory":
+            from scrapers.directory_engine import DirectoryEngine
+            engine = DirectoryEngine(page)
+            return await engine.scrape(query)
+        elif platform in ["producthunt", "tiktok", "amazon", "shopify", "omni"]:
+            from scrapers.omni_scout_engine import OmniScoutEngine
+            engine = OmniScoutEngine(page)
+            return await engine.unified_scout(query)
+        elif platform == 'twitter':
+            from scrapers.social_radar import TwitterEngine
+            engine = TwitterEngine(page)
+            return await engine.scrape(query)
+        elif platform == 'instagram':
+            from scrapers.social_radar import InstagramEngine
+            engine = InstagramEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['google_news', 'news']:
+            from scrapers.news_pulse_engine import NewsPulseEngine
+            engine = NewsPulseEngine(page)
+            return await engine.scrape(query)
+        elif platform == 'real_estate':
+            from scrapers.real_estate_engine import RealEstateEngine
+            engine = RealEstateEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['job_scout', 'hiring']:
+            from scrapers.job_scout_engine import JobScoutEngine
+            engine = JobScoutEngine(page)
+            return await engine.scrape(query)
+        elif platform == 'facebook':
+            from scrapers.facebook_engine_v2 import FacebookEngineV2
+            engine = FacebookEngineV2(page)
+            return await engine.scrape(query)
+        elif platform == 'trade':
+            from scrapers.trade_data_engine import TradeDataEngine
+            engine = TradeDataEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['gov', 'government', 'contracts']:
+            from scrapers.government_contracts_engine import GovernmentContractsEngine
+            engine = GovernmentContractsEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['patent', 'patents', 'innovation', 'ip']:
+            from scrapers.patent_intelligence_engine import PatentIntelligenceEngine
+            engine = PatentIntelligenceEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['event', 'events', 'networking', 'meetup']:
+            from scrapers.events_networking_engine import EventsNetworkingEngine
+            engine = EventsNetworkingEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['reputation', 'reviews', 'trust', 'ratings']:
+            from scrapers.reputation_engine import ReputationEngine
+            engine = ReputationEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['capital', 'finance', 'sec', 'funding']:
+            from scrapers.capital_growth_engine import CapitalGrowthEngine
+            engine = CapitalGrowthEngine(page)
+            return await engine.scrape(query)
+        elif platform in ['academic', 'research', 'papers', 'science']:
+            from scrapers.academic_research_engine import AcademicResearchEngine
+            engine = AcademicResearchEngine(page)
+            return await engine.scrape(query)
+        elif platform == "generic" and not query.startswith("http"):
+            # INTELLIGENT ROUTING: Detect if query is for a LIST or a SPECIFIC COMPANY
+            query_lower = query.lower()
+            list_indicators = ["companies", "agencies", "firms", "startups", "providers", "services", " in ", " near ", "list of", "top "]
+            is_list_query = any(ind in query_lower for ind in list_indicators)
+
+            if is_list_query:
+                print(f"[{self.worker_id}] 🔀 Routing 'generic' list query to Google Maps Engine: {query}")
+                from scrapers.google_maps_engine import GoogleMapsEngine
+                engine = GoogleMapsEngine(page)
+                # Maps engine expects "scrape(query)"
+                return await engine.scrape(query, details=search_metadata.get('place_details'))
+            else:
+                print(f"[{self.worker_id}] 🎯 Routing 'generic' specific query to Global Radar: {query}")
+                from scrapers.base_dork_engine import BaseDorkEngine
+                engine = BaseDorkEngine(page, "Global Radar")
+                return await engine.run_dork_search(query, "")
+        else:
+            from scrapers.website_engine import WebsiteEngine
+            engine = WebsiteEngine(page)
+            return await engine.scrape(target_url)
 
     async def check_opt_out(self, identifier):
         """
@@ -824,19 +899,17 @@ class HydraController:
         """
         print("🌍 Discovering residential node identity...")
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10) as client:
-                res = await client.get("https://ipapi.co/json/")
-                if res.status_code == 200:
-                    data = res.json()
-                    self.node_geo = {
-                        "public_ip": data.get("ip"),
-                        "geo_city": data.get("city"),
-                        "geo_country": data.get("country_name"),
-                        "ip_authority": 9.5 if "Residential" in data.get("org", "") or "ISP" in data.get("org", "") else 5.0
-                    }
-                    print(f"🛰️ Node Identified: {self.node_geo['geo_city']}, {self.node_geo['geo_country']} ({self.node_geo['public_ip']})")
-                    return self.node_geo
+            res = await http_client.get("https://ipapi.co/json/", timeout=10)
+            if res.status == 200:
+                data = res.json()
+                self.node_geo = {
+                    "public_ip": data.get("ip"),
+                    "geo_city": data.get("city"),
+                    "geo_country": data.get("country_name"),
+                    "ip_authority": 9.5 if "Residential" in data.get("org", "") or "ISP" in data.get("org", "") else 5.0
+                }
+                print(f"🛰️ Node Identified: {self.node_geo['geo_city']}, {self.node_geo['geo_country']} ({self.node_geo['public_ip']})")
+                return self.node_geo
         except Exception as e:
             print(f"⚠️ Node Discovery Failed: {e}")
             self.node_geo = {"public_ip": "Unknown", "geo_city": "Unknown", "geo_country": "Unknown", "ip_authority": 1.0}
@@ -871,7 +944,9 @@ class HydraController:
             "public_ip": self.node_geo.get("public_ip"),
             "geo_city": self.node_geo.get("geo_city"),
             "geo_country": self.node_geo.get("geo_country"),
-            "ip_authority_score": self.node_geo.get("ip_authority")
+            "ip_authority_score": self.node_geo.get("ip_authority"),
+            "provider_stats": hydra_client.get_provider_stats(),  # Hydra routing telemetry (dashboards)
+            "http_metrics": http_client.get_metrics()  # Per-host outbound request/latency counters
         }
         
         # DEFENSIVE PULSE: Only send what the DB supports
@@ -901,14 +976,23 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     hydra = HydraController()
+
+    async def _run(coro):
+        try:
+            await coro
+        finally:
+            # Hand leased-but-unspent provider calls back to the shared pool,
+            # then close the shared keep-alive pool before the loop goes away
+            quota_ledger.release_unused()
+            await http_client.close()
     
     if args.timeout > 0:
         # Run safely with timeout
         print(f"[{hydra.worker_id}] Running with timeout: {args.timeout}s")
         try:
-             asyncio.run(asyncio.wait_for(hydra.run_loop(), timeout=args.timeout))
+             asyncio.run(_run(asyncio.wait_for(hydra.run_loop(), timeout=args.timeout)))
         except asyncio.TimeoutError:
              print(f"[{hydra.worker_id}] Timeout reached ({args.timeout}s). Exiting gracefully.")
     else:
         # Run forever
-        asyncio.run(hydra.run_loop())
+        asyncio.run(_run(hydra.run_loop()))
@@ -1,9 +1,9 @@
 import asyncio
 import json
 import os
-import aiohttp
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from utils.http_client import http_client
 
 class AcademicResearchEngine:
     """
@@ -33,50 +33,49 @@ class AcademicResearchEngine:
         }
         
         results = []
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Step 1: Get IDs
-                async with session.get(search_url, params=params, timeout=10) as resp:
-                    if resp.status != 200:
-                        return []
-                    data = await resp.json()
-                    ids = data.get('esearchresult', {}).get('idlist', [])
+        try:
+            # Step 1: Get IDs
+            resp = await http_client.get(search_url, params=params, timeout=10)
+            if resp.status != 200:
+                return []
+            data = resp.json()
+            ids = data.get('esearchresult', {}).get('idlist', [])
                     
-                if not ids:
-                    return []
+            if not ids:
+                return []
 
-                # Step 2: Get Summaries
-                summary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-                sum_params = {
-                    "db": "pubmed",
-                    "id": ",".join(ids),
-                    "retmode": "json"
-                }
+            # Step 2: Get Summaries
+            summary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+            sum_params = {
+                "db": "pubmed",
+                "id": ",".join(ids),
+                "retmode": "json"
+            }
                 
-                async with session.get(summary_url, params=sum_params, timeout=10) as resp:
-                    if resp.status == 200:
-                        sum_data = await resp.json()
-                        uid_data = sum_data.get('result', {})
+            resp = await http_client.get(summary_url, params=sum_params, timeout=10)
+            if resp.status == 200:
+                sum_data = resp.json()
+                uid_data = sum_data.get('result', {})
                         
-                        for uid in ids:
-                            doc = uid_data.get(uid)
-                            if doc:
-                                results.append({
-                                    "source": "PubMed (NIH)",
-                                    "title": doc.get('title', 'Unknown Title'),
-                                    "journal": doc.get('fulljournalname', 'Unknown Journal'),
-                                    "authors": [a['name'] for a in doc.get('authors', [])],
-                                    "pub_date": doc.get('pubdate', ''),
-                                    "pmid": uid,
-                                    "link": f"https://pubmed.ncbi.nlm.nih.gov/{uid}/",
-                                    "is_live_data": True
-                                })
+                for uid in ids:
+                    doc = uid_data.get(uid)
+                    if doc:
+                        results.append({
+                            "source": "PubMed (NIH)",
+                            "title": doc.get('title', 'Unknown Title'),
+                            "journal": doc.get('fulljournalname', 'Unknown Journal'),
+                            "authors": [a['name'] for a in doc.get('authors', [])],
+                            "pub_date": doc.get('pubdate', ''),
+                            "pmid": uid,
+                            "link": f"https://pubmed.ncbi.nlm.nih.gov/{uid}/",
+                            "is_live_data": True
+                        })
                                 
-                await self.log(f"   -> Found {len(results)} PubMed citations")
-                return results
-            except Exception as e:
-                await self.log(f"   -> PubMed Connection Failed: {e}")
-                return []
+            await self.log(f"   -> Found {len(results)} PubMed citations")
+            return results
+        except Exception as e:
+            await self.log(f"   -> PubMed Connection Failed: {e}")
+            return []
 
     async def scrape_arxiv(self, keyword):
         """
@@ -92,39 +91,38 @@ class AcademicResearchEngine:
         }
         
         results = []
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, params=params, timeout=10) as resp:
-                    if resp.status == 200:
-                        xml_data = await resp.text()
-                        # Simple XML parsing (namespace aware)
-                        root = ET.fromstring(xml_data)
-                        ns = {'atom': 'http://www.w3.org/2005/Atom'}
+        try:
+            resp = await http_client.get(url, params=params, timeout=10)
+            if resp.status == 200:
+                xml_data = resp.text
+                # Simple XML parsing (namespace aware)
+                root = ET.fromstring(xml_data)
+                ns = {'atom': 'http://www.w3.org/2005/Atom'}
                         
-                        for entry in root.findall('atom:entry', ns):
-                            title = entry.find('atom:title', ns).text.strip().replace('\n', ' ')
-                            summary = entry.find('atom:summary', ns).text.strip().replace('\n', ' ')
-                            published = entry.find('atom:published', ns).text
-                            link = entry.find('atom:id', ns).text
+                for entry in root.findall('atom:entry', ns):
+                    title = entry.find('atom:title', ns).text.strip().replace('\n', ' ')
+                    summary = entry.find('atom:summary', ns).text.strip().replace('\n', ' ')
+                    published = entry.find('atom:published', ns).text
+                    link = entry.find('atom:id', ns).text
                             
-                            authors = [a.find('atom:name', ns).text for a in entry.findall('atom:author', ns)]
+                    authors = [a.find('atom:name', ns).text for a in entry.findall('atom:author', ns)]
                             
-                            results.append({
-                                "source": "arXiv (Live)",
-                                "title": title,
-                                "summary": summary[:200] + "...",
-                                "authors": authors,
-                                "published": published[:10],
-                                "link": link,
-                                "is_live_data": True
-                            })
+                    results.append({
+                        "source": "arXiv (Live)",
+                        "title": title,
+                        "summary": summary[:200] + "...",
+                        "authors": authors,
+                        "published": published[:10],
+                        "link": link,
+                        "is_live_data": True
+                    })
                             
-                await self.log(f"   -> Found {len(results)} arXiv papers")
-                return results
+            await self.log(f"   -> Found {len(results)} arXiv papers")
+            return results
                 
-            except Exception as e:
-                await self.log(f"   -> arXiv Connection Failed: {e}")
-                return []
+        except Exception as e:
+            await self.log(f"   -> arXiv Connection Failed: {e}")
+            return []
 
     async def scrape(self, query):
         """
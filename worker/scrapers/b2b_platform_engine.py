@@ -3,6 +3,15 @@ import re
 import urllib.parse
 import json
 from scrapers.base_dork_engine import BaseDorkEngine
+from utils.dork_planner import DorkPlanner
+
+# Hub profiles: key -> (site filter, extra terms for a single-site query)
+B2B_TARGETS = {
+    "clutch": ("clutch.co/profile", ""),
+    "g2": ("g2.com/products", "reviews"),
+    "crunchbase": ("crunchbase.com/organization", "funding"),
+    "wellfound": ("wellfound.com/company", ""),
+}
 
 class B2BPlatformEngine:
     """
@@ -13,15 +22,17 @@ class B2BPlatformEngine:
     def __init__(self, page):
         self.page = page
         self.dork_engine = BaseDorkEngine(page, "b2b_hubs")
+        self.planner = DorkPlanner(self.dork_engine)
 
-    async def scrape_clutch(self, company_name):
+    async def scrape_clutch(self, company_name, results=None):
         """
         Extracts Agency metadata from Clutch.co.
         Signal: Project sizes, ratings, employee verification.
         """
         print(f"[B2B Engine] 🔍 Probing Clutch.co for '{company_name}'...")
-        query = f'site:clutch.co/profile "{company_name}"'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:clutch.co/profile "{company_name}"'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         if not results: return None
         
@@ -42,14 +53,15 @@ class B2BPlatformEngine:
             "verified_on_clutch": True
         }
 
-    async def scrape_g2(self, product_name):
+    async def scrape_g2(self, product_name, results=None):
         """
         Extracts SaaS metadata from G2.com.
         Signal: Market segment (SMB/Mid/Ent), satisfaction scores.
         """
         print(f"[B2B Engine] 🔍 Probing G2 for '{product_name}'...")
-        query = f'site:g2.com/products "{product_name}" reviews'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:g2.com/products "{product_name}" reviews'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         if not results: return None
         
@@ -66,14 +78,15 @@ class B2BPlatformEngine:
             "category_g2": "SaaS / Software"
         }
 
-    async def scrape_crunchbase(self, company_name):
+    async def scrape_crunchbase(self, company_name, results=None):
         """
         Extracts Funding metadata from Crunchbase.
         Signal: Funding stage, Total raised, Lead investors.
         """
         print(f"[B2B Engine] 🔍 Probing Crunchbase for '{company_name}'...")
-        query = f'site:crunchbase.com/organization "{company_name}" funding'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:crunchbase.com/organization "{company_name}" funding'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         if not results: return None
         
@@ -90,14 +103,15 @@ class B2BPlatformEngine:
             "capital_signal": "HIGH" if total_raised else "MODERATE"
         }
 
-    async def scrape_wellfound(self, company_name):
+    async def scrape_wellfound(self, company_name, results=None):
         """
         Extracts Startup metadata from Wellfound (AngelList).
         Signal: Hiring status, team velocity.
         """
         print(f"[B2B Engine] 🔍 Probing Wellfound for '{company_name}'...")
-        query = f'site:wellfound.com/company "{company_name}"'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:wellfound.com/company "{company_name}"'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         if not results: return None
         
@@ -121,11 +135,14 @@ class B2BPlatformEngine:
         name = lead.get('name')
         if not name: return lead
         
+        # One combined SERP call covers all four hubs; results are routed back by domain
+        hits = await self.planner.lookup(name, B2B_TARGETS)
+        
         tasks = [
-            self.scrape_clutch(name),
-            self.scrape_g2(name),
-            self.scrape_crunchbase(name),
-            self.scrape_wellfound(name)
+            self.scrape_clutch(name, hits.get("clutch")),
+            self.scrape_g2(name, hits.get("g2")),
+            self.scrape_crunchbase(name, hits.get("crunchbase")),
+            self.scrape_wellfound(name, hits.get("wellfound"))
         ]
         
         intel_results = await asyncio.gather(*tasks, return_exceptions=True)
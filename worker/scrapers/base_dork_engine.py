@@ -2,6 +2,11 @@ import asyncio
 import urllib.parse
 from utils.humanizer import Humanizer
 from utils.hydra_client import hydra_client
+from utils.page_pool import lease_page
+from utils.serp_parser import fetch_serp
+
+# Results a list-building dork pages through the API for (lookups take one page)
+LIST_TARGET = 30
 
 class BaseDorkEngine:
     """
@@ -13,7 +18,11 @@ class BaseDorkEngine:
         self.page = page
         self.platform = platform_name
 
-    async def run_dork_search(self, query, site_filter):
+    async def run_dork_search(self, query, site_filter, target=None):
+        """
+        target: results to page through the API for (list building, e.g. LIST_TARGET).
+        None = one results page, for lookups that only want the top hits.
+        """
         full_query = f"site:{site_filter} {query}" if site_filter else query
         print(f"[{self.platform}] Launching 'Total Recall' Radar for: {full_query}")
         
@@ -33,9 +42,12 @@ class BaseDorkEngine:
                 print(f"[{self.platform}] [OK] {source_name} added {count} unique leads.")
 
         # 1. API LAYER (The Speed of Light)
-        # Try Hydra Client first (Serper/SearchAPI etc.)
+        # Try Hydra Client first (Serper/SearchAPI etc.), paging through deep lists
         try:
-             api_results = await hydra_client.search(full_query, type="search", num=20)
+             if target:
+                 api_results = await hydra_client.search_deep(full_query, type="search", target=target)
+             else:
+                 api_results = await hydra_client.search(full_query, type="search", num=10)
              if api_results:
                  add_unique(api_results, "Hydra API")
                  # If we got good results from API, we can return early and skip slow browser
@@ -48,24 +60,26 @@ class BaseDorkEngine:
         # 2. BROWSER LAYER (The Fallback)
         print(f"[{self.platform}] 🐢 API exhausted/insufficient. Engaging Playwright Fallback...")
         
-        # Google Fallback
-        try:
-            google_results = await self._search_google(query, site_filter)
-            add_unique(google_results, "Google (Browser)")
-        except Exception as e:
-            print(f"[{self.platform}] [ERR] Google failed: {e}")
-
-        # ISO-BLAST
-        await self._hard_reset()
-        
-        # Bing Fallback (only if needed)
-        if len(all_results) < 5:
+        # Own tab for the fallback: the shared page if free, else a leased one (parallel dorks)
+        async with lease_page(self.page) as page:
+            # Google Fallback
             try:
-                print(f"[{self.platform}] Engaging BING for additional coverage...")
-                bing_results = await self._search_bing(query, site_filter)
-                add_unique(bing_results, "Bing")
+                google_results = await self._search_google(query, site_filter, page=page)
+                add_unique(google_results, "Google (Browser)")
             except Exception as e:
-                print(f"[{self.platform}] [ERR] Bing failed: {e}")
+                print(f"[{self.platform}] [ERR] Google failed: {e}")
+
+            # ISO-BLAST
+            await self._hard_reset(page)
+        
+            # Bing Fallback (only if needed)
+            if len(all_results) < 5:
+                try:
+                    print(f"[{self.platform}] Engaging BING for additional coverage...")
+                    bing_results = await self._search_bing(query, site_filter, page=page)
+                    add_unique(bing_results, "Bing")
+                except Exception as e:
+                    print(f"[{self.platform}] [ERR] Bing failed: {e}")
 
         if not all_results:
              print(f"[{self.platform}] All strategies exhausted. Returning fallback.")
@@ -80,16 +94,18 @@ class BaseDorkEngine:
         print(f"[{self.platform}] Total Recall Complete. Aggregated {len(all_results)} leads.")
         return all_results
 
-    async def _hard_reset(self):
+    async def _hard_reset(self, page=None):
         """Memory & State Isolation"""
+        page = page or self.page
         try:
-            if not self.page.is_closed():
-                await self.page.goto("about:blank")
+            if not page.is_closed():
+                await page.goto("about:blank")
                 # clear_cookies might fail if context is closed
         except: pass
 
 
-    async def _search_google(self, query, site_filter, use_proxy=False):
+    async def _search_google(self, query, site_filter, use_proxy=False, page=None):
+        page = page or self.page
         try:
             dork_query = f"site:{site_filter} {query}" if site_filter else query
             encoded_val = urllib.parse.quote(dork_query)
@@ -99,88 +115,51 @@ class BaseDorkEngine:
             print(f"[{self.platform}] Google Browser: {url}")
             
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             except Exception as nav_err:
                  print(f"[{self.platform}] [ERR] Google Browser Nav Error: {nav_err}")
                  return []
                  
             await Humanizer.random_sleep(2, 3)
             
-            if self.page.is_closed(): return []
-            
-            content = await self.page.content()
-            is_basic = "ZINbbc" in content
+            if page.is_closed(): return []
             
+            # One page.content(), parsed locally (desktop and Basic HTML layouts alike)
             results = []
-            if is_basic:
-                # Basic HTML parser
-                items = await self.page.query_selector_all("div.ZINbbc")
-                for item in items:
-                    link_handle = await item.query_selector("a[href*='/url?q=']")
-                    if not link_handle: continue
-
-                    href = await link_handle.get_attribute("href")
-                    if "/url?q=" in href:
-                        href = href.split("/url?q=")[1].split("&")[0]
-                        href = urllib.parse.unquote(href)
-                    
-                    if site_filter and site_filter not in href: continue
-
-                    title_handle = await item.query_selector("h3") or await item.query_selector("div.vvjwJb")
-                    title = await title_handle.inner_text() if title_handle else "Social Profile"
-                    
-                    results.append({
-                        "name": title,
-                        "company": self.platform.capitalize(),
-                        "source_url": href,
-                        "verified": True,
-                        "snippet": f"Via Google Basic ({self.platform})"
-                    })
-            else:
-                # Standard HTML parser
-                links = await self.page.query_selector_all("div.g a")
-                for link in links:
-                    href = await link.get_attribute("href")
-                    if not href or (site_filter and site_filter not in href): continue
-                    
-                    title_handle = await link.query_selector("h3")
-                    if not title_handle: continue 
-                    
-                    title = await title_handle.inner_text()
-                    
-                    results.append({
-                        "name": title,
-                        "company": self.platform.capitalize(),
-                        "source_url": href,
-                        "verified": True,
-                        "snippet": f"Via Google Stealth ({self.platform})"
-                    })
+            for result in await fetch_serp(page, "google"):
+                if site_filter and site_filter not in result.url: continue
+                results.append({
+                    "name": result.title,
+                    "company": self.platform.capitalize(),
+                    "source_url": result.url,
+                    "verified": True,
+                    "snippet": f"Via Google Stealth ({self.platform})"
+                })
             
             return results
         except Exception as e:
             print(f"[{self.platform}] [ERR] Google Browser Error: {e}")
             return []
 
-    async def _search_bing(self, query, site_filter):
+    async def _search_bing(self, query, site_filter, page=None):
+        page = page or self.page
         try:
             encoded = urllib.parse.quote(f"site:{site_filter} {query}")
             url = f"https://www.bing.com/search?q={encoded}"
             
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=15000)
             except: return []
                  
             await asyncio.sleep(1)
             
-            links = await self.page.query_selector_all("li.b_algo h2 a")
             results = []
-            for link in links:
-                href = await link.get_attribute("href")
-                if href and site_filter in href:
+            for result in await fetch_serp(page, "bing"):
+                if site_filter in result.url:
                     results.append({
-                        "name": await link.inner_text(),
+                        "name": result.title,
                         "company": self.platform.capitalize(),
-                        "source_url": href,
+                        "source_url": result.url,
                         "verified": True,
                         "snippet": f"Via Bing ({self.platform})"
                     })
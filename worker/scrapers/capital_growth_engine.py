@@ -1,10 +1,10 @@
 import asyncio
 import json
 import os
-import aiohttp
 import random
 from datetime import datetime
 from utils.humanizer import Humanizer
+from utils.http_client import http_client
 
 class CapitalGrowthEngine:
     """
@@ -37,22 +37,21 @@ class CapitalGrowthEngine:
         url = "https://www.sec.gov/files/company_tickers.json"
         headers = {"User-Agent": "PearlDataIntelligence/1.0 (admin@pearldata.com)"}
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=headers, timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        # Structure: {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}, ...}
-                        for key in data:
-                            entry = data[key]
-                            ticker = entry['ticker'].upper()
-                            title = entry['title'].upper()
-                            cik = f"{entry['cik_str']:010d}" # Pad to 10 digits
+        try:
+            resp = await http_client.get(url, headers=headers, timeout=10)
+            if resp.status == 200:
+                data = resp.json()
+                # Structure: {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}, ...}
+                for key in data:
+                    entry = data[key]
+                    ticker = entry['ticker'].upper()
+                    title = entry['title'].upper()
+                    cik = f"{entry['cik_str']:010d}" # Pad to 10 digits
                             
-                            self.cik_map[ticker] = cik
-                            self.cik_map[title] = cik
-            except Exception as e:
-                await self.log(f"   -> Failed to load SEC CIK map: {e}")
+                    self.cik_map[ticker] = cik
+                    self.cik_map[title] = cik
+        except Exception as e:
+            await self.log(f"   -> Failed to load SEC CIK map: {e}")
 
     async def scrape_sec_edgar(self, query):
         """
@@ -78,39 +77,38 @@ class CapitalGrowthEngine:
         url = f"https://data.sec.gov/submissions/CIK{cik}.json"
         headers = {"User-Agent": "PearlDataIntelligence/1.0 (admin@pearldata.com)"}
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=headers, timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        filings = data.get('filings', {}).get('recent', {})
+        try:
+            resp = await http_client.get(url, headers=headers, timeout=10)
+            if resp.status == 200:
+                data = resp.json()
+                filings = data.get('filings', {}).get('recent', {})
                         
-                        results = []
-                        # Zip lists together
-                        forms = filings.get('form', [])
-                        dates = filings.get('filingDate', [])
-                        accs = filings.get('accessionNumber', [])
+                results = []
+                # Zip lists together
+                forms = filings.get('form', [])
+                dates = filings.get('filingDate', [])
+                accs = filings.get('accessionNumber', [])
                         
-                        for i in range(min(5, len(forms))):
-                            form = forms[i]
-                            if form in ['10-K', '10-Q', '8-K']:
-                                acc = accs[i].replace('-', '')
-                                results.append({
-                                    "source": "SEC EDGAR (Live)",
-                                    "entity": data.get('name'),
-                                    "filing_type": form,
-                                    "filing_date": dates[i],
-                                    "cik": cik,
-                                    "url": f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc}/{data.get('primaryDocument', '')}",
-                                    "is_live_data": True
-                                })
+                for i in range(min(5, len(forms))):
+                    form = forms[i]
+                    if form in ['10-K', '10-Q', '8-K']:
+                        acc = accs[i].replace('-', '')
+                        results.append({
+                            "source": "SEC EDGAR (Live)",
+                            "entity": data.get('name'),
+                            "filing_type": form,
+                            "filing_date": dates[i],
+                            "cik": cik,
+                            "url": f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc}/{data.get('primaryDocument', '')}",
+                            "is_live_data": True
+                        })
                                 
-                        await self.log(f"   -> Found {len(results)} SEC filings for {data.get('name')}")
-                        return results
-                    else:
-                        await self.log(f"   -> SEC API Error: {resp.status}")
-            except Exception as e:
-                await self.log(f"   -> SEC Connection Failed: {e}")
+                await self.log(f"   -> Found {len(results)} SEC filings for {data.get('name')}")
+                return results
+            else:
+                await self.log(f"   -> SEC API Error: {resp.status}")
+        except Exception as e:
+            await self.log(f"   -> SEC Connection Failed: {e}")
                 
         return []
 
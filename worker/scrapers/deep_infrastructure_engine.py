@@ -1,7 +1,7 @@
 import asyncio
-import aiohttp
 import os
 from scrapers.base_dork_engine import BaseDorkEngine
+from utils.http_client import http_client
 
 class DeepInfrastructureEngine:
     """
@@ -31,23 +31,22 @@ class DeepInfrastructureEngine:
             url = f"https://www.virustotal.com/api/v3/domains/{domain}"
             headers = {"x-apikey": api_key}
             
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.get(url, headers=headers, timeout=10) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            stats = data.get('data', {}).get('attributes', {}).get('last_analysis_stats', {})
+            try:
+                resp = await http_client.get(url, headers=headers, timeout=10)
+                if resp.status == 200:
+                    data = resp.json()
+                    stats = data.get('data', {}).get('attributes', {}).get('last_analysis_stats', {})
                             
-                            malicious = stats.get('malicious', 0)
-                            return {
-                                "source": "VirusTotal (API)",
-                                "malicious_score": malicious,
-                                "is_safe": malicious == 0,
-                                "reputation": data.get('data', {}).get('attributes', {}).get('reputation', 0),
-                                "is_live_data": True
-                            }
-                except Exception as e:
-                    await self.log(f"VT API Error: {e}")
+                    malicious = stats.get('malicious', 0)
+                    return {
+                        "source": "VirusTotal (API)",
+                        "malicious_score": malicious,
+                        "is_safe": malicious == 0,
+                        "reputation": data.get('data', {}).get('attributes', {}).get('reputation', 0),
+                        "is_live_data": True
+                    }
+            except Exception as e:
+                await self.log(f"VT API Error: {e}")
 
         # Fallback: Dorking for VT Report
         # site:virustotal.com/gui/domain "example.com"
@@ -85,22 +84,21 @@ class DeepInfrastructureEngine:
         params = {}
         if token: params['token'] = token
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, params=params, timeout=5) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return {
-                            "source": "IPinfo",
-                            "ip": ip,
-                            "org": data.get('org', ''),
-                            "country": data.get('country', ''),
-                            "city": data.get('city', ''),
-                            "asn": data.get('org', '').split(' ')[0], 
-                            "is_live_data": True
-                        }
-            except Exception as e:
-                await self.log(f"IPinfo Error: {e}")
+        try:
+            resp = await http_client.get(url, params=params, timeout=5)
+            if resp.status == 200:
+                data = resp.json()
+                return {
+                    "source": "IPinfo",
+                    "ip": ip,
+                    "org": data.get('org', ''),
+                    "country": data.get('country', ''),
+                    "city": data.get('city', ''),
+                    "asn": data.get('org', '').split(' ')[0], 
+                    "is_live_data": True
+                }
+        except Exception as e:
+            await self.log(f"IPinfo Error: {e}")
                 
         return None
 
@@ -1,4 +1,4 @@
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 import asyncio
 
 class DirectoryEngine:
@@ -17,14 +17,14 @@ class DirectoryEngine:
         print(f"📡 Clarity Pearl: Crawling Global Directories for '{query}'...")
         
         # 1. Yellow Pages Dork
-        yp_results = await self.dork_engine.run_dork_search(f'"{query}"', "yellowpages.com")
+        yp_results = await self.dork_engine.run_dork_search(f'"{query}"', "yellowpages.com", target=LIST_TARGET)
         
         # 2. Yelp / Local Dork
-        yelp_results = await self.dork_engine.run_dork_search(f'"{query}"', "yelp.com")
+        yelp_results = await self.dork_engine.run_dork_search(f'"{query}"', "yelp.com", target=LIST_TARGET)
         
         # 3. Industry Specific (e.g., Angi, Houzz if applicable)
         # We use a broad "GMB" helper dork
-        gmb_results = await self.dork_engine.run_dork_search(f'"{query}" listing', "business.site")
+        gmb_results = await self.dork_engine.run_dork_search(f'"{query}" listing', "business.site", target=LIST_TARGET)
         
         all_results = yp_results + yelp_results + gmb_results
         
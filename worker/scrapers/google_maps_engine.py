@@ -1,23 +1,181 @@
 import asyncio
+import os
+import re
 import urllib.parse
 from utils.humanizer import Humanizer
+from utils.time_budget import get_budget
+from utils.contact_extractor import LISTING_PHONE
+from utils.feed_scroller import scroll_feed
+from utils.maps_payload import ResponseCapture
+from scrapers.google_maps_grid_engine import NON_ALNUM, dedupe_keys
+
+# Runs in the page: every loaded listing as {href, text} in one CDP round trip
+# instead of inner_text/get_attribute/query_selector awaits per listing.
+LISTINGS_JS = """
+(feedSelector) => {
+    let items = Array.from(document.querySelectorAll("div[role='article']"));
+    if (!items.length) items = Array.from(document.querySelectorAll("a[href*='/maps/place/']"));
+    if (!items.length) items = Array.from(document.querySelectorAll(feedSelector + " a[href*='/maps/place/']"));
+    const records = [];
+    for (const item of items) {
+        let href = item.getAttribute("href");
+        if (!href || !href.includes("/maps/place/")) {
+            const link = item.querySelector("a[href*='/maps/place/']");
+            if (!link) continue;
+            href = link.getAttribute("href");
+        }
+        records.push({href: href, text: item.innerText || ""});
+    }
+    return records;
+}
+"""
+
+# Runs on a /maps/place/ page: the detail panel fields in one round trip
+PLACE_DETAIL_JS = """
+() => {
+    const attr = (selector, name) => document.querySelector(selector)?.getAttribute(name) || null;
+    const text = (selector) => document.querySelector(selector)?.innerText || null;
+    return {
+        name: text("h1"),
+        address: attr("button[data-item-id='address']", "aria-label"),
+        phone: attr("button[data-item-id*='phone']", "aria-label"),
+        website: attr("a[data-item-id='authority']", "href"),
+        category: text("button[jsaction*='category']"),
+        hours: attr("[data-item-id='oh']", "aria-label") || attr("div[aria-label*='Monday']", "aria-label")
+    };
+}
+"""
+
+# Detail pass: open place pages for listings the feed card left without website/phone.
+# Off by default (up to DETAIL_LIMIT extra page loads); jobs opt in with
+# search_metadata {"place_details": true}, or scrape(details=True).
+MAPS_DETAIL_PASS = os.getenv("MAPS_DETAIL_PASS", "0") == "1"
+DETAIL_LIMIT = 40
+# Seconds of budget one place page needs to be worth opening
+DETAIL_BUDGET = 12
+
+# Listing line heuristics, compiled once for the whole batch
+ADDRESS_WORDS = re.compile(r"United States|USA|Street|St\.|Ave|Road|Blvd|Lane|Suite|Floor")
+HAS_DIGIT = re.compile(r"\d")
+WEBSITE_HINT = re.compile(r"http|\.com|\.net|\.org")
+NOT_WEBSITE = re.compile(r"google\.com|maps|search")
+# Place coordinates in a /maps/place/ href (...!3d30.2672!4d-97.7431...)
+HREF_COORDS = re.compile(r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)")
+
+
+def parse_listing(text: str, href: str):
+    """One feed listing's rendered text -> lead dict (None for placeholders)."""
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    if not lines:
+        return None
+    name = lines[0]
+    # Filter out purely coordinate names or placeholders
+    if len(name) < 2 or name.startswith("Coordinates"):
+        return None
+
+    rating = "N/A"
+    address = "Unknown"
+    phone = "N/A"
+    website = None
+    for line in lines:
+        if len(line) < 20 and "(" in line and ")" in line and ("." in line or "," in line):
+            rating = line.split("·")[0].strip()
+        if address == "Unknown":
+            if ADDRESS_WORDS.search(line):
+                address = line
+            elif len(line) > 10 and "," in line and HAS_DIGIT.search(line):
+                address = line
+        if phone == "N/A" and LISTING_PHONE.search(line):
+            phone = line
+        if WEBSITE_HINT.search(line) and not NOT_WEBSITE.search(line):
+            website = line
+
+    return {
+        "name": name,
+        "rating": rating,
+        "address": address,
+        "phone": phone,
+        "website": website,
+        "source_url": href,
+        "verified": True,
+        "snippet": f"{name} ({rating}) - {address}"
+    }
+
+
+def parse_listings(records):
+    """Batch of {href, text} records from LISTINGS_JS -> lead dicts, one per place."""
+    results = []
+    seen = set()
+    for record in records or []:
+        href = record.get("href")
+        if not href or href in seen:
+            continue
+        lead = parse_listing(record.get("text") or "", href)
+        if lead:
+            seen.add(href)
+            results.append(lead)
+    return results
+
+
+def listing_keys(lead):
+    """
+    Identities a listing is matched by: the grid engine's dedupe_keys (place_id,
+    name + street number) plus name + coordinates, read from the place href for
+    DOM cards. Never the name alone: branches of a chain share it.
+    """
+    if lead.get("address") == "Unknown":
+        lead = {**lead, "address": ""}
+    keys = [key for key in dedupe_keys(lead) if not key.endswith("|")]  # "nm:name|": no address to go on
+    lat, lng = lead.get("geo_lat"), lead.get("geo_lng")
+    if lat is None:
+        coords = HREF_COORDS.search(lead.get("source_url") or "")
+        if coords:
+            lat, lng = float(coords.group(1)), float(coords.group(2))
+    if lat is not None:
+        key = f"ll:{NON_ALNUM.sub('', (lead.get('name') or '').lower())}|{lat:.3f},{lng:.3f}"
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def merge_listings(network, dom):
+    """
+    Network-decoded places first (coordinates, categories, exact phone/website);
+    DOM listings only fill in places the capture missed. Matched by listing_keys.
+    """
+    merged = list(network)
+    index = {}
+    for place in merged:
+        for key in listing_keys(place):
+            index.setdefault(key, place)
+    for listing in dom:
+        place = next((index[key] for key in listing_keys(listing) if key in index), None)
+        if place is None:
+            merged.append(listing)
+        elif listing.get("source_url", "").startswith("http"):
+            place["source_url"] = listing["source_url"]
+    return merged
 
 class GoogleMapsEngine:
     def __init__(self, page):
         self.page = page
         self.platform = "google_maps"
 
-    async def scrape(self, query):
+    async def scrape(self, query, target=None, details=None):
         print(f"[{self.platform}] 🗺️  Navigating to Google Maps for: {query}")
         
         # 1. Navigate
         encoded_query = urllib.parse.quote(query)
         url = f"https://www.google.com/maps/search/{encoded_query}"
         
+        budget = get_budget()
+        # Listing data arrives as JSON before it's rendered; decode it as it loads
+        capture = ResponseCapture()
+        capture.attach(self.page)
         try:
             # 1. Navigate (Hardened against timeouts)
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=45000)
+                await self.page.goto(url, wait_until="domcontentloaded", timeout=max(1000, budget.cap(45) * 1000))
             except Exception as nav_err:
                 print(f"[{self.platform}] ⚠️ Navigation timeout (partial load). Attempting extraction anyway...")
             
@@ -45,95 +203,109 @@ class GoogleMapsEngine:
                 await self.page.wait_for_selector(feed_selector, timeout=20000)
             except:
                 print(f"[{self.platform}] ⚠️ Feed selector not found. Checking for single result or alternate layout...")
-                return await self._scrape_single_result()
+                places = await capture.places()
+                return places or await self._scrape_single_result()
 
-            # 3. Scroll to load more (Deep Scoping)
+            # 3. Scroll to load more, only while the feed keeps growing
             print(f"[{self.platform}] 📜 Scrolling feed...")
-            for _ in range(15): 
-                await self.page.evaluate(f'document.querySelector("{feed_selector}").scrollTop = 10000')
-                await Humanizer.random_sleep(2, 3)
-
-            # 4. Extract
-            results = []
-            # More specific selectors for current Google Maps layout
-            feed_children = await self.page.query_selector_all("div[role='article']")
-            if not feed_children:
-                feed_children = await self.page.query_selector_all("a[href*='/maps/place/']")
-            
-            # If still nothing, try to find any link inside the feed
-            if not feed_children:
-                 feed_children = await self.page.query_selector_all(f"{feed_selector} a[href*='/maps/place/']")
+            await scroll_feed(self.page, feed_selector, target=target, label=self.platform)
 
+            # 4. Extract: captured responses first, one DOM round trip for what they missed
             print(f"[{self.platform}] 🧐 Extracting all loaded listings...")
+            places = await capture.places()
+            listings = await self._extract_listings(feed_selector)
+            results = merge_listings(places, listings)
+            print(f"[{self.platform}] 📡 {len(places)} places from {capture.responses} responses, {len(results) - len(places)} from the DOM.")
 
-            for item in feed_children:
-                try:
-                    text_content = await item.inner_text()
-                    href = await item.get_attribute("href")
-                    
-                    if not href or "/maps/place/" not in href:
-                        link_el = await item.query_selector("a[href*='/maps/place/']")
-                        if link_el: href = await link_el.get_attribute("href")
-                        else: continue
-
-                    lines = [line.strip() for line in text_content.split("\n") if line.strip()]
-                    if len(lines) < 1: continue
-                    
-                    name = lines[0]
-                    # Filter out purely coordinate names or placeholders
-                    if len(name) < 2 or name.startswith("Coordinates"): continue
-
-                    rating = "N/A"
-                    address = "Unknown"
-                    phone = "N/A"
-                    website = None
-                    
-                    rating = "N/A"
-                    address = "Unknown"
-                    phone = "N/A"
-                    website = None
-                    
-                    # Enhanced Line Parsing
-                    import re
-                    phone_pattern = re.compile(r"(\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
-                    
-                    for line in lines:
-                        if "(" in line and ")" in line and ("." in line or "," in line) and len(line) < 20:
-                            rating = line.split("·")[0].strip()
-                        
-                        # Better Address Detection
-                        if not address or address == "Unknown":
-                            if any(x in line for x in ["United States", "USA", "Street", "St.", "Ave", "Road", "Blvd", "Lane", "Suite", "Floor"]):
-                                address = line
-                            elif "," in line and any(char.isdigit() for char in line) and len(line) > 10:
-                                address = line
-                                
-                        # Regex Phone Detection
-                        if (phone == "N/A" or not phone) and phone_pattern.search(line):
-                            phone = line
-                            
-                        # Website Detection
-                        if "http" in line or ".com" in line or ".net" in line or ".org" in line:
-                            if "google.com" not in line and "maps" not in line and "search" not in line:
-                                website = line.strip()
-
-                    results.append({
-                        "name": name,
-                        "rating": rating,
-                        "address": address,
-                        "phone": phone,
-                        "website": website,
-                        "source_url": href,
-                        "verified": True,
-                        "snippet": f"{name} ({rating}) - {address}"
-                    })
-                except: continue
-            
+            # 5. Place pages for cards without website/phone (saves website discovery later)
+            if MAPS_DETAIL_PASS if details is None else details:
+                capture.detach()
+                await self._detail_pass(results)
             return results
 
         except Exception as e:
             print(f"[{self.platform}] ❌ Extraction Failed: {e}")
             return [] # Return empty list so bridge doesn't pivot on errors
+        finally:
+            capture.detach()
+
+    async def _extract_listings(self, feed_selector):
+        """All loaded feed listings, read in a single page.evaluate."""
+        try:
+            records = await self.page.evaluate(LISTINGS_JS, feed_selector)
+        except Exception as e:
+            print(f"[{self.platform}] ⚠️ Listing extraction failed: {e}")
+            return []
+        return parse_listings(records)
+
+    async def _detail_pass(self, results):
+        """
+        Fill website / phone / hours / category from each listing's place page.
+        Pages are leased from the pool, so several load at once.
+        """
+        from utils.page_pool import MAX_LEASED_PAGES
+
+        todo = [lead for lead in results if needs_details(lead)][:DETAIL_LIMIT]
+        if not todo:
+            return
+        budget = get_budget()
+        gate = asyncio.Semaphore(MAX_LEASED_PAGES + 1)
+        filled = 0
+
+        async def run(lead):
+            nonlocal filled
+            async with gate:
+                if budget.remaining() < DETAIL_BUDGET:
+                    budget.note_skip("maps_place_details")
+                    return
+                if await self._place_details(lead):
+                    filled += 1
+
+        print(f"[{self.platform}] 🔎 Opening {len(todo)} place pages for missing website/phone...")
+        await asyncio.gather(*(run(lead) for lead in todo), return_exceptions=True)
+        print(f"[{self.platform}] ✅ Place details filled for {filled}/{len(todo)} listings.")
+
+    async def _place_details(self, lead):
+        """One listing's place page -> fields merged into the lead. True if anything was added."""
+        from utils.page_pool import lease_page
+
+        url = urllib.parse.urljoin("https://www.google.com", lead["source_url"])
+        async with lease_page(self.page) as page:
+            capture = ResponseCapture()
+            capture.attach(page)
+            try:
+                try:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=max(1000, get_budget().cap(20) * 1000))
+                except Exception:
+                    pass  # Partial load still has the panel most of the time
+                try:
+                    await page.wait_for_selector("h1", timeout=8000)
+                    detail = await page.evaluate(PLACE_DETAIL_JS)
+                except Exception:
+                    detail = {}
+                places = await capture.places(timeout=1.5)
+            finally:
+                capture.detach()
+
+        # The place response is structured; the panel covers what it lacks
+        name = lead["name"].strip().lower()
+        place = next((p for p in places if p["name"].strip().lower() == name), None)
+        found = {
+            "website": (place or {}).get("website") or detail.get("website"),
+            "phone": ((place or {}).get("phone") if (place or {}).get("phone") != "N/A" else None)
+                     or _strip_label(detail.get("phone"), "Phone: "),
+            "address": _strip_label(detail.get("address"), "Address: "),
+            "category": (place or {}).get("category") or detail.get("category"),
+            "hours": detail.get("hours"),
+        }
+        added = False
+        for field, value in found.items():
+            if value and lead.get(field) in (None, "", "N/A", "Unknown"):
+                lead[field] = value
+                added = True
+        if place and lead.get("geo_lat") is None:
+            lead["geo_lat"], lead["geo_lng"] = place["geo_lat"], place["geo_lng"]
+        return added
 
     async def _scrape_single_result(self):
         """Fallback for when Maps redirects directly to a single result."""
@@ -142,35 +314,32 @@ class GoogleMapsEngine:
             
             # Wait for content
             await self.page.wait_for_selector("h1", timeout=10000)
-            h1 = await self.page.query_selector("h1")
-            name = await h1.inner_text() if h1 else None
+            detail = await self.page.evaluate(PLACE_DETAIL_JS)
+            name = detail.get("name")
             
             if not name or "Maps" in name: return []
-                
-            address = "N/A"
-            phone = "N/A"
-            website = "N/A"
-            rating = "N/A"
-
-            try:
-                addr_btn = await self.page.query_selector("button[data-item-id='address']") 
-                if addr_btn: address = await addr_btn.get_attribute("aria-label")
-                
-                phone_btn = await self.page.query_selector("button[data-item-id*='phone']")
-                if phone_btn: phone = await phone_btn.get_attribute("aria-label")
-                
-                web_btn = await self.page.query_selector("a[data-item-id='authority']")
-                if web_btn: website = await web_btn.get_attribute("href")
-            except: pass
 
             return [{
                 "name": name,
-                "address": address.replace("Address: ", ""),
-                "phone": phone.replace("Phone: ", ""),
-                "website": website,
-                "rating": rating,
+                "address": _strip_label(detail.get("address"), "Address: ") or "N/A",
+                "phone": _strip_label(detail.get("phone"), "Phone: ") or "N/A",
+                "website": detail.get("website") or "N/A",
+                "category": detail.get("category"),
+                "hours": detail.get("hours"),
+                "rating": "N/A",
                 "source_url": self.page.url,
                 "verified": True,
                 "snippet": f"Single Result: {name}"
             }]
         except: return []
+
+
+def needs_details(lead):
+    """Feed cards often stop at name/rating/address; the place page has the rest."""
+    if lead.get("capture") == "network" or "/maps/place/" not in (lead.get("source_url") or ""):
+        return False  # A decoded place already says everything the page would
+    return not lead.get("website") or lead.get("phone") in (None, "", "N/A")
+
+
+def _strip_label(value, label):
+    return value.replace(label, "").strip() if value else None
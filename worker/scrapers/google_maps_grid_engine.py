@@ -1,85 +1,184 @@
 import asyncio
+import math
+import re
+import urllib.parse
 from datetime import datetime
+from utils.feed_scroller import scroll_feed
+from utils.maps_payload import ResponseCapture
+from utils.time_budget import get_budget
+
+# --- ADS BOT STEALTH ---
+# Tricking Google into thinking we are a crawler to bypass JS redirects/blocks
+ADSBOT_HEADERS = {"User-Agent": "AdsBot-Google (+http://www.google.com/adsbot.html)"}
+FEED_SELECTOR = "div[role='feed']"
+
+# Tiling: start with tiles about this wide, split the ones that come back full
+TILE_KM = 4.0
+# Maps stops a feed around 120 results; a tile this full probably has more
+DENSE_TILE = 100
+MAX_SPLIT_DEPTH = 2
+MAX_TILES = 64
+# First pass tiles; big areas get bigger tiles so splits still fit under MAX_TILES
+INITIAL_TILES = 16
+# Seconds of budget a tile search needs to be worth starting
+TILE_BUDGET = 20
+KM_PER_DEGREE = 111.0
+# Horizontal degrees a ~1280px wide map shows at zoom 0 (360 * 1280 / 256)
+VIEWPORT_DEGREES = 1800
+
+GRID_LISTINGS_JS = """
+() => {
+    const items = document.querySelectorAll('div[role="article"]');
+    const results = [];
+    items.forEach(item => {
+        const name = item.querySelector('div.fontHeadlineSmall')?.innerText || '';
+        const rating = item.querySelector('span.MW4Y7c')?.innerText || '';
+        const reviews = item.querySelector('span.UY7F9')?.innerText || '';
+
+        // Smart parsing of address and category
+        const subInfo = item.querySelectorAll('div.W4Efsd');
+        let address = '';
+        if (subInfo.length > 1) {
+            address = subInfo[1]?.innerText || '';
+        }
+
+        const phone = item.querySelector('span.Us6YCc')?.innerText || '';
+        const website = item.querySelector('a[aria-label*="website"]')?.href || '';
+        const place = item.querySelector('a[href*="/maps/place/"]')?.href || '';
+
+        if (name) {
+            results.push({
+                "name": name,
+                "rating": rating,
+                "reviews_count": parseInt(reviews.replace(/[( )]/g, '')) || 0,
+                "address": address,
+                "phone": phone,
+                "store_url": website,
+                "source_url": place,
+                "category": "directory",
+                "source_platform": "google_maps",
+                "verified": parseFloat(rating) >= 4.0
+            });
+        }
+    });
+    return results;
+}
+"""
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+STREET_NUMBER = re.compile(r"\d+")
+
+
+def split_box(box, tile_km=TILE_KM, max_tiles=INITIAL_TILES):
+    """(south, west, north, east) -> row-major tiles roughly tile_km wide (wider if that makes more than max_tiles)."""
+    south, west, north, east = box
+    mid_lat = math.radians((south + north) / 2)
+    height_km = (north - south) * KM_PER_DEGREE
+    width_km = (east - west) * KM_PER_DEGREE * max(math.cos(mid_lat), 0.01)
+    tile_km = max(tile_km, math.sqrt(height_km * width_km / max_tiles))
+    rows = max(1, math.ceil(height_km / tile_km))
+    cols = max(1, math.ceil(width_km / tile_km))
+    while rows * cols > max_tiles:
+        if rows >= cols:
+            rows -= 1
+        else:
+            cols -= 1
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    return [
+        (south + r * lat_step, west + c * lng_step, south + (r + 1) * lat_step, west + (c + 1) * lng_step)
+        for r in range(rows) for c in range(cols)
+    ]
+
+
+def tile_url(query, box):
+    """Search URL with the map viewport centred on (and zoomed to) a tile."""
+    south, west, north, east = box
+    span = max(east - west, 1e-4)
+    zoom = min(18, max(10, int(math.log2(VIEWPORT_DEGREES / span))))
+    return (f"https://www.google.com/maps/search/{urllib.parse.quote(query)}/"
+            f"@{(south + north) / 2:.6f},{(west + east) / 2:.6f},{zoom}z")
+
+
+def dedupe_keys(lead):
+    """Identities a place can be recognised by across tiles (place_id, name + street number or coordinates)."""
+    keys = []
+    if lead.get("place_id"):
+        keys.append("id:" + lead["place_id"])
+    name = NON_ALNUM.sub("", (lead.get("name") or "").lower())
+    number = STREET_NUMBER.search(lead.get("address") or "")
+    if number:
+        keys.append(f"na:{name}|{number.group()}")
+    elif lead.get("geo_lat") is not None:
+        keys.append(f"ll:{name}|{lead['geo_lat']:.3f},{lead['geo_lng']:.3f}")
+    else:
+        keys.append(f"nm:{name}|{NON_ALNUM.sub('', (lead.get('address') or '').lower())}")
+    return keys
+
+
+def from_place(place):
+    """Network-decoded Maps place (utils.maps_payload) -> grid lead record."""
+    rating = place.get("rating") or ""
+    try:
+        verified = float(rating.split("(")[0]) >= 4.0
+    except ValueError:
+        verified = False
+    return {
+        "name": place["name"],
+        "rating": rating.split("(")[0] if rating != "N/A" else "",
+        "reviews_count": place.get("reviews_count") or 0,
+        "address": place.get("address") if place.get("address") != "Unknown" else "",
+        "phone": place.get("phone") if place.get("phone") != "N/A" else "",
+        "store_url": place.get("website") or "",
+        "source_url": place.get("source_url") or "",
+        "category": place.get("category") or "directory",
+        "source_platform": "google_maps",
+        "place_id": place.get("place_id"),
+        "geo_lat": place.get("geo_lat"),
+        "geo_lng": place.get("geo_lng"),
+        "verified": verified
+    }
+
 
 class GoogleMapsGridEngine:
     """
     NEXUS SCOUT - GOOGLE MAPS GRID ENGINE
     Mission: Bypass the 120-result limit by slicing a city into a grid.
     """
-    
+
     def __init__(self, page):
         self.page = page
         self.platform = "google_maps_grid"
 
-    async def scrape(self, query, location_grid=None):
+    async def scrape(self, query, location_grid=None, target=None):
         """
-        Performs a 'Grid Search'. 
+        Performs a 'Grid Search'.
         If no grid is provided, it does a standard high-stealth scrape.
+
+        location_grid: a bounding box (south, west, north, east) - tuple or dict
+        with those keys - or a place name ("Austin, TX") to geocode into one.
         """
+        if location_grid:
+            return await self._scrape_tiled(query, location_grid, target)
+
         print(f"📡 Clarity Pearl: Grid-Scanning Google Maps for '{query}'...")
-        
-        # --- ADS BOT STEALTH ---
-        # Tricking Google into thinking we are a crawler to bypass JS redirects/blocks
-        await self.page.set_extra_http_headers({"User-Agent": "AdsBot-Google (+http://www.google.com/adsbot.html)"})
-        
+
+        await self.page.set_extra_http_headers(ADSBOT_HEADERS)
+
         base_url = f"https://www.google.com/maps/search/{query}"
-        
+
         try:
             await self.page.goto(base_url, timeout=45000, wait_until="domcontentloaded")
-            
+
             # 2. Infinite Scroll to Trigger Load
             print("⏳ Clarity Pearl: Triggering Deep Scroll for Local Businesses...")
-            scrollable_div = "div[role='feed']"
-            
-            for _ in range(8):
-                # Using a more robust scroll targeting the feed container
-                try:
-                    await self.page.evaluate(f"document.querySelector('{scrollable_div}').scrollBy(0, 1000)")
-                except:
-                    await self.page.mouse.wheel(0, 2000)
-                await asyncio.sleep(1.5)
-            
+            await scroll_feed(self.page, FEED_SELECTOR, target=target, label=self.platform)
+
             # 3. Extract Business Data
-            leads = await self.page.evaluate("""
-                () => {
-                    const items = document.querySelectorAll('div[role="article"]');
-                    const results = [];
-                    items.forEach(item => {
-                        const name = item.querySelector('div.fontHeadlineSmall')?.innerText || '';
-                        const rating = item.querySelector('span.MW4Y7c')?.innerText || '';
-                        const reviews = item.querySelector('span.UY7F9')?.innerText || '';
-                        
-                        // Smart parsing of address and category
-                        const subInfo = item.querySelectorAll('div.W4Efsd');
-                        let address = '';
-                        let category = '';
-                        if (subInfo.length > 1) {
-                            address = subInfo[1]?.innerText || '';
-                        }
-                        
-                        const phone = item.querySelector('span.Us6YCc')?.innerText || '';
-                        const website = item.querySelector('a[aria-label*="website"]')?.href || '';
-                        
-                        if (name) {
-                            results.push({
-                                "name": name,
-                                "rating": rating,
-                                "reviews_count": parseInt(reviews.replace(/[( )]/g, '')) || 0,
-                                "address": address,
-                                "phone": phone,
-                                "store_url": website,
-                                "category": "directory",
-                                "source_platform": "google_maps",
-                                "verified": parseFloat(rating) >= 4.0
-                            });
-                        }
-                    });
-                    return results;
-                }
-            """)
-            
+            leads = await self.page.evaluate(GRID_LISTINGS_JS)
+
             print(f"✅ Clarity Pearl: Captured {len(leads)} local business leads.")
-            
+
             return [{
                 "source": "google_maps",
                 "data": leads,
@@ -88,11 +187,129 @@ class GoogleMapsGridEngine:
             }]
 
         except Exception as e:
-            print(f"[{self.platform}] ❌ Scout-01: Google Maps Grid Failure: {e}")
-            return [{
-                "name": "Grid Search Fallback",
-                "address": query,
-                "verified": False,
-                "snippet": "Grid search encountered an error. Manual verification advised.",
-                "error": str(e)
-            }]
+            return self._failure(query, e)
+
+    async def _scrape_tiled(self, query, location_grid, target=None):
+        """
+        Tile the area, search the tiles concurrently (leased pages) and merge
+        the results. Tiles that come back full are split in four and searched
+        again, up to MAX_SPLIT_DEPTH.
+        """
+        from utils.page_pool import MAX_LEASED_PAGES
+
+        box = await self._bounding_box(location_grid)
+        if not box:
+            print(f"[{self.platform}] ⚠️ No bounding box for '{location_grid}', running a single search.")
+            if isinstance(location_grid, str):
+                query = f"{query} in {location_grid}"
+            return await self.scrape(query, target=target)
+
+        budget = get_budget()
+        pending = [(tile, 0) for tile in split_box(box)][:MAX_TILES]
+        print(f"📡 Clarity Pearl: Grid-Scanning Google Maps for '{query}' over {len(pending)} tiles...")
+
+        merged, index = [], {}
+        searched = 0
+        # The shared page plus every page the pool may lend out
+        gate = asyncio.Semaphore(MAX_LEASED_PAGES + 1)
+
+        async def run(tile):
+            async with gate:
+                if budget.remaining() < TILE_BUDGET:
+                    budget.note_skip("maps_tiles")
+                    return None
+                return await self._scrape_tile(query, tile)
+
+        try:
+            while pending and searched < MAX_TILES:
+                wave = pending[:MAX_TILES - searched]
+                pending = []
+                outcomes = await asyncio.gather(*(run(tile) for tile, _ in wave), return_exceptions=True)
+                searched += len(wave)
+
+                for (tile, depth), outcome in zip(wave, outcomes):
+                    if outcome is None or isinstance(outcome, Exception):
+                        continue
+                    for lead in outcome:
+                        keys = dedupe_keys(lead)
+                        if any(key in index for key in keys):
+                            continue
+                        for key in keys:
+                            index[key] = lead
+                        merged.append(lead)
+                    if len(outcome) >= DENSE_TILE and depth < MAX_SPLIT_DEPTH:
+                        pending.extend((sub, depth + 1) for sub in _quarter(tile))
+
+                if target and len(merged) >= target:
+                    break
+        except Exception as e:
+            return self._failure(query, e)
+
+        print(f"✅ Clarity Pearl: Captured {len(merged)} local business leads from {searched} tiles.")
+        return [{
+            "source": "google_maps",
+            "data": merged[:target] if target else merged,
+            "verified": True,
+            "tiles": searched,
+            "timestamp": datetime.now().isoformat()
+        }]
+
+    async def _scrape_tile(self, query, tile):
+        """One tile's listings: network-decoded places plus DOM cards they missed."""
+        from utils.page_pool import lease_page
+
+        async with lease_page(self.page) as page:
+            capture = ResponseCapture()
+            capture.attach(page)
+            try:
+                await page.set_extra_http_headers(ADSBOT_HEADERS)
+                try:
+                    await page.goto(tile_url(query, tile), timeout=45000, wait_until="domcontentloaded")
+                except Exception:
+                    print(f"[{self.platform}] ⚠️ Tile navigation timeout (partial load). Extracting anyway...")
+                try:
+                    await page.wait_for_selector(FEED_SELECTOR, timeout=15000)
+                    await scroll_feed(page, FEED_SELECTOR, label=self.platform)
+                    cards = await page.evaluate(GRID_LISTINGS_JS)
+                except Exception:
+                    cards = []  # No feed: single place or empty area
+                places = [from_place(place) for place in await capture.places()]
+            finally:
+                capture.detach()
+
+        leads, seen = [], set()
+        for lead in places + (cards or []):
+            keys = dedupe_keys(lead)
+            if seen.isdisjoint(keys):
+                seen.update(keys)
+                leads.append(lead)
+        return leads
+
+    async def _bounding_box(self, location_grid):
+        if isinstance(location_grid, dict):
+            try:
+                return tuple(float(location_grid[k]) for k in ("south", "west", "north", "east"))
+            except (KeyError, TypeError, ValueError):
+                return None
+        if isinstance(location_grid, (list, tuple)) and len(location_grid) == 4:
+            return tuple(float(v) for v in location_grid)
+        if isinstance(location_grid, str):
+            from utils.geocoder import geocoder
+            return await geocoder.get_bounding_box(location_grid)
+        return None
+
+    def _failure(self, query, e):
+        print(f"[{self.platform}] ❌ Scout-01: Google Maps Grid Failure: {e}")
+        return [{
+            "name": "Grid Search Fallback",
+            "address": query,
+            "verified": False,
+            "snippet": "Grid search encountered an error. Manual verification advised.",
+            "error": str(e)
+        }]
+
+
+def _quarter(box):
+    south, west, north, east = box
+    lat, lng = (south + north) / 2, (west + east) / 2
+    return [(south, west, lat, lng), (south, lng, lat, east), (lat, west, north, lng), (lat, lng, north, east)]
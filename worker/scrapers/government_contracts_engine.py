@@ -1,10 +1,10 @@
 import asyncio
 import json
 import os
-import aiohttp
 import random
 from datetime import datetime
 from utils.humanizer import Humanizer
+from utils.http_client import http_client
 
 class GovernmentContractsEngine:
     """
@@ -113,29 +113,28 @@ class GovernmentContractsEngine:
             "page": 1
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, json=payload, timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        results = []
-                        for item in data.get('results', []):
-                            results.append({
-                                "source": "USAspending.gov (API)",
-                                "recipient": item.get('Recipient Name'),
-                                "amount": item.get('Award Amount'),
-                                "agency": item.get('Awarding Agency'),
-                                "description": item.get('Description'),
-                                "start_date": item.get('Start Date'),
-                                "is_live_data": True
-                            })
+        try:
+            resp = await http_client.post(url, json_body=payload, timeout=10)
+            if resp.status == 200:
+                data = resp.json()
+                results = []
+                for item in data.get('results', []):
+                    results.append({
+                        "source": "USAspending.gov (API)",
+                        "recipient": item.get('Recipient Name'),
+                        "amount": item.get('Award Amount'),
+                        "agency": item.get('Awarding Agency'),
+                        "description": item.get('Description'),
+                        "start_date": item.get('Start Date'),
+                        "is_live_data": True
+                    })
                         
-                        await self.log(f"   -> Found {len(results)} historical awards via API")
-                        return results
-                    else:
-                        await self.log(f"   -> USAspending API Error: {resp.status}")
-            except Exception as e:
-                await self.log(f"   -> USAspending Connection Failed: {e}")
+                await self.log(f"   -> Found {len(results)} historical awards via API")
+                return results
+            else:
+                await self.log(f"   -> USAspending API Error: {resp.status}")
+        except Exception as e:
+            await self.log(f"   -> USAspending Connection Failed: {e}")
                 
         return []
 
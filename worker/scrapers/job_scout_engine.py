@@ -1,6 +1,6 @@
 import asyncio
 import random
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 from utils.humanizer import Humanizer
 
 class JobScoutEngine(BaseDorkEngine):
@@ -126,7 +126,7 @@ class JobScoutEngine(BaseDorkEngine):
         
         # 2. Dorking (Greenhouse & Lever are best dorked)
         # site:boards.greenhouse.io "software engineer"
-        gh_jobs = await self.run_dork_search(f'site:boards.greenhouse.io "{query}"', "")
+        gh_jobs = await self.run_dork_search(f'site:boards.greenhouse.io "{query}"', "", target=LIST_TARGET)
         
         # Transform dork results
         for r in gh_jobs:
@@ -5,62 +5,85 @@ import urllib.parse
 import re
 from playwright.async_api import TimeoutError
 from utils.humanizer import Humanizer
+from utils.hydra_client import hydra_client
+from utils.page_pool import lease_page
+from utils.serp_parser import fetch_serp
+
+# Profiles worth collecting before the remaining searches are cancelled
+TARGET_PROFILES = 30
+PROFILE_RE = re.compile(r"linkedin\.com/in/([^/?#&]+)", re.I)
+
+
+def profile_key(url):
+    """Same profile whatever the subdomain / trailing slash / query: 'linkedin.com/in/jane-doe'."""
+    match = PROFILE_RE.search(urllib.parse.unquote(url or ""))
+    return match.group(1).lower() if match else None
+
 
 class LinkedInEngine:
     def __init__(self, page):
         self.page = page
         self.platform = "linkedin"
 
-    async def scrape(self, query):
+    async def scrape(self, query, target=TARGET_PROFILES):
         """
         Executes a targeted search on LinkedIn using the 'Total Recall' Protocol.
-        Aggregates results from Google -> Bing -> DDG (Sequential Multi-Source).
+        Hydra API first; if it falls short, Google, Bing and DDG run at once on
+        their own tabs, merged by profile as they finish. Searches still running
+        are cancelled once `target` profiles are in.
         """
         print(f"[{self.platform}] 🚀 Launching 'Total Recall' Search for: {query}")
         
         all_results = []
-        seen_urls = set()
+        seen_profiles = set()
 
         # Helper to deduplicate and add
         def add_unique(new_results, source_name):
             count = 0
             for res in new_results:
-                url = res.get('source_url') or res.get('linkedin_url')
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
+                key = profile_key(res.get('source_url') or res.get('linkedin_url'))
+                if key and key not in seen_profiles:
+                    seen_profiles.add(key)
                     all_results.append(res)
                     count += 1
             if count > 0:
                 print(f"[{self.platform}] ✅ {source_name} added {count} unique leads.")
 
-        # 1. Google Search
+        # 1. API LAYER: no browser at all when Hydra delivers
         try:
-            google_results = await self._search_google(query)
-            add_unique(google_results, "Google")
+            api_results = await hydra_client.search_deep(f"site:linkedin.com/in/ {query}", type="search", target=target)
+            add_unique(self._from_api(api_results), "Hydra API")
+            if len(all_results) >= target:
+                print(f"[{self.platform}] ⚡ Hydra API delivered {len(all_results)} profiles. Skipping browser crawl.")
+                return all_results
         except Exception as e:
-            print(f"[{self.platform}] ⚠️ Google failed: {e}")
+            print(f"[{self.platform}] ⚠️ Hydra API failed: {e}")
 
-        # ISO-BLAST: Clear context before next engine
-        await self._hard_reset()
-        
-        # 2. Bing Search
-        try:
-            print(f"[{self.platform}] 🔎 Engaging BING for additional coverage...")
-            bing_results = await self._search_bing(query)
-            add_unique(bing_results, "Bing")
-        except Exception as e:
-            print(f"[{self.platform}] ⚠️ Bing failed: {e}")
+        # 2. BROWSER LAYER: the three engines in parallel, each on its own tab
+        sources = {"Google": self._search_google, "Bing": self._search_bing, "DuckDuckGo": self._search_ddg}
 
-        # ISO-BLAST: Clear context
-        await self._hard_reset()
+        async def run(name, search):
+            async with lease_page(self.page) as page:
+                return name, await search(query, page=page)
 
-        # 3. DuckDuckGo Search
+        tasks = [asyncio.ensure_future(run(name, search)) for name, search in sources.items()]
         try:
-            print(f"[{self.platform}] 🦆 Engaging DUCKDUCKGO for deep web coverage...")
-            ddg_results = await self._search_ddg(query)
-            add_unique(ddg_results, "DuckDuckGo")
-        except Exception as e:
-            print(f"[{self.platform}] ⚠️ DDG failed: {e}")
+            for done in asyncio.as_completed(tasks):
+                try:
+                    name, results = await done
+                    add_unique(results or [], name)
+                except Exception as e:
+                    print(f"[{self.platform}] ⚠️ Browser search failed: {e}")
+                if len(all_results) >= target:
+                    print(f"[{self.platform}] 🎯 Target of {target} profiles reached. Cancelling remaining searches.")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # ISO-BLAST: leave the shared page clean for whoever uses it next
+        await self._hard_reset(self.page, clear_cookies=True)
 
         # 4. Fallback if ABSOLUTELY nothing found
         if not all_results:
@@ -70,21 +93,32 @@ class LinkedInEngine:
         print(f"[{self.platform}] 🏁 Total Recall Complete. Aggregated {len(all_results)} unique leads.")
         return all_results
 
-    async def _hard_reset(self):
+    def _from_api(self, api_results):
+        """Hydra organic results -> profile leads (same parser as the Google SERP)."""
+        results = []
+        for item in api_results or []:
+            href = item.get('source_url') or item.get('link')
+            if not href or "linkedin.com/in/" not in href:
+                continue
+            results.append(self._parse_linkedin_title(item.get('name') or item.get('title') or "LinkedIn Profile", href, item.get('snippet') or ""))
+        return results
+
+    async def _hard_reset(self, page=None, clear_cookies=False):
         """
         Memory & State Isolation (The Iron Wall).
         Prevents cross-engine contamination and frees RAM.
         """
+        page = page or self.page
         try:
+            if page.is_closed():
+                return
             # Navigate to blank to stop all network requests
-            await self.page.goto("about:blank")
-            # Clear cookies/storage if possible (context-dependent)
-            try:
-                await self.page.context.clear_cookies()
-            except: pass
-            
-            # Brief cool-down for memory release
-            await asyncio.sleep(2)
+            await page.goto("about:blank")
+            # Cookies are per context: only clear them once no search is in flight
+            if clear_cookies:
+                try:
+                    await page.context.clear_cookies()
+                except: pass
         except Exception as e:
             print(f"⚠️ Hard Reset Warning: {e}")
 
@@ -113,7 +147,8 @@ class LinkedInEngine:
             print(f"❌ ScraperAPI Proxy Search Error: {e}")
         return []
 
-    async def _search_google(self, query, use_proxy=False):
+    async def _search_google(self, query, use_proxy=False, page=None):
+        page = page or self.page
         try:
             # Dorking query
             encoded_query = urllib.parse.quote(f"site:linkedin.com/in/ {query}")
@@ -126,83 +161,22 @@ class LinkedInEngine:
             
             print(f"[{self.platform}] 📡 Google: {url}")
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             except Exception as nav_err:
                 print(f"[{self.platform}] ⚠️ Google Navigation Interrupted: {nav_err}")
-                await self._hard_reset()
+                await self._hard_reset(page)
                 return [] # Fail gracefully for this engine
 
             await Humanizer.random_sleep(2, 3)
             
             # Re-check page state before selecting
-            if self.page.is_closed(): return []
-            
-            # Check for "Basic HTML" (legacy) which happens on aggressive blocking
-            content = await self.page.content()
-            is_basic_html = "<!DOCTYPE html PUBLIC" in content or "ZINbbc" in content or "google.com/search" in content and "gb_e" not in content
+            if page.is_closed(): return []
             
+            # One page.content(), parsed locally; Basic HTML (served on aggressive blocking) included
             results = []
-            if is_basic_html:
-                print(f"[{self.platform}] 🔦 Detected 'Basic HTML' Layout. Extraction bypass active...")
-                # In Basic HTML, results are in div.ZINbbc
-                items = await self.page.query_selector_all("div.ZINbbc")
-                for item in items:
-                    link_handle = await item.query_selector("a[href*='/url?q=']")
-                    if not link_handle: continue
-                    
-                    href = await link_handle.get_attribute("href")
-                    if "/url?q=" in href:
-                        href = href.split("/url?q=")[1].split("&")[0]
-                        href = urllib.parse.unquote(href)
-                    
-                    if "/in/" not in href: continue
-
-                    title_handle = await item.query_selector("h3") or await item.query_selector("div.vvjwJb")
-                    title_text = await title_handle.inner_text() if title_handle else "LinkedIn Profile"
-                    
-                    # Snippet extraction
-                    snippet_handle = await item.query_selector("div.s3v9rd")
-                    snippet = await snippet_handle.inner_text() if snippet_handle else ""
-                    
-                    # Avatar Extraction
-                    avatar_url = None
-                    try:
-                        img_handle = await item.query_selector("img")
-                        if img_handle:
-                            avatar_url = await img_handle.get_attribute("src")
-                    except: pass
-
-                    results.append(self._parse_linkedin_title(title_text, href, snippet, avatar_url))
-            else:
-                # Standard Modern Layout
-                links = await self.page.query_selector_all("div.g a[href*='linkedin.com/in/']")
-                for link in links:
-                    href = await link.get_attribute("href")
-                    if not href or "/in/" not in href: continue
-                    
-                    title_handle = await link.query_selector("h3")
-                    title_text = await title_handle.inner_text() if title_handle else await link.inner_text()
-                    
-                    # Find snippet in the same .g container
-                    snippet = ""
-                    try:
-                        container = await self.page.evaluate_handle("el => el.closest('.g')", link)
-                        if container:
-                            snippet = await container.as_element().inner_text()
-                    except: pass
-                    
-                    # Avatar Extraction
-                    avatar_url = None
-                    try:
-                        # In modern Google, avatars are often in the parent .g container or adjacent
-                        container = await self.page.evaluate_handle("el => el.closest('.g')", link)
-                        if container:
-                            img_handle = await container.as_element().query_selector("img")
-                            if img_handle:
-                                avatar_url = await img_handle.get_attribute("src")
-                    except: pass
-                    
-                    results.append(self._parse_linkedin_title(title_text, href, snippet, avatar_url))
+            for result in await fetch_serp(page, "google"):
+                if "/in/" not in result.url: continue
+                results.append(self._parse_linkedin_title(result.title, result.url, result.text, result.image))
 
             if results:
                  print(f"[{self.platform}] ✅ Google found {len(results)} leads.")
@@ -257,13 +231,14 @@ class LinkedInEngine:
             "verified": True
         }
 
-    async def _search_bing(self, query):
+    async def _search_bing(self, query, page=None):
+        page = page or self.page
         try:
             encoded_query = urllib.parse.quote(f"site:linkedin.com/in/ {query}")
             url = f"https://www.bing.com/search?q={encoded_query}"
             
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=20000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=20000)
             except Exception as nav_err:
                  print(f"[{self.platform}] ⚠️ Bing Navigation Interrupted: {nav_err}")
                  return []
@@ -271,25 +246,19 @@ class LinkedInEngine:
             await Humanizer.random_sleep(2, 3)
             
             # Re-check page state before selecting
-            if self.page.is_closed(): return []
-            
-            # Bing Selectors
-            links = await self.page.query_selector_all("li.b_algo h2 a")
+            if page.is_closed(): return []
             
             results = []
-            for link in links:
-                href = await link.get_attribute("href")
-                title_text = await link.inner_text()
-                
-                if href and "linkedin.com/in/" in href:
+            for result in await fetch_serp(page, "bing"):
+                if "linkedin.com/in/" in result.url:
                      # Parse Title
-                     parts = title_text.split(" - ")
+                     parts = result.title.split(" - ")
                      name = parts[0].replace("| LinkedIn", "").strip()
                      results.append({
                         "name": name,
                         "title": parts[1].strip() if len(parts)>1 else "Professional",
                          "company": parts[2].strip() if len(parts)>2 else "Unknown",
-                        "source_url": href,
+                        "source_url": result.url,
                         "verified": True,
                         "snippet": "Via Bing Fallback"
                      })
@@ -302,14 +271,15 @@ class LinkedInEngine:
             print(f"[{self.platform}] ❌ Bing Error: {e}")
             return []
 
-    async def _search_ddg(self, query):
+    async def _search_ddg(self, query, page=None):
+        page = page or self.page
         try:
             # DuckDuckGo
             encoded_query = urllib.parse.quote(f"site:linkedin.com/in/ {query}")
             url = f"https://duckduckgo.com/?q={encoded_query}&t=hp&ia=web"
             
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=20000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=20000)
             except Exception as nav_err:
                  print(f"[{self.platform}] ⚠️ DDG Navigation Interrupted: {nav_err}")
                  return []
@@ -317,21 +287,16 @@ class LinkedInEngine:
             await Humanizer.random_sleep(2, 3)
             
             # Re-check page state before selecting
-            if self.page.is_closed(): return []
-            
-            links = await self.page.query_selector_all("a[data-testid='result-title-a']")
+            if page.is_closed(): return []
             
             results = []
-            for link in links:
-                href = await link.get_attribute("href")
-                title_text = await link.inner_text()
-                
-                if href and "linkedin.com/in/" in href:
+            for result in await fetch_serp(page, "ddg"):
+                if "linkedin.com/in/" in result.url:
                     results.append({
-                        "name": title_text.split("-")[0].strip(),
+                        "name": result.title.split("-")[0].strip(),
                         "title": "Professional", # DDG titles are often cleaner/shorter
                         "company": "LinkedIn",
-                        "source_url": href,
+                        "source_url": result.url,
                         "verified": True,
                         "snippet": "Via DDG Fallback"
                     })
@@ -1,6 +1,14 @@
 import asyncio
 import re
 from scrapers.base_dork_engine import BaseDorkEngine
+from utils.dork_planner import DorkPlanner
+
+# Profile-style probes that can share one SERP call: key -> (site filter, extra terms)
+OMEGA_TARGETS = {
+    "trade": ("volza.com/p/import/buyer", "export data"),
+    "events": ("eventbrite.com", "attend"),
+    "public_sector": ("sam.gov", '"contract award"'),
+}
 
 class OmegaEngine:
     """
@@ -11,15 +19,17 @@ class OmegaEngine:
     def __init__(self, page):
         self.page = page
         self.dork_engine = BaseDorkEngine(page, "omega_master")
+        self.planner = DorkPlanner(self.dork_engine)
 
-    async def probe_trade_logistics(self, company_name):
+    async def probe_trade_logistics(self, company_name, results=None):
         """
         Dorks Volza / ImportGenius for Bill of Lading signals.
         Signal: What they import and their supply chain velocity.
         """
         print(f"[Omega Engine] 🚢 Probing Trade Logistics for '{company_name}'...")
-        query = f'site:volza.com/p/import/buyer "{company_name}" export data'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:volza.com/p/import/buyer "{company_name}" export data'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         has_shipments = len(results) > 0
         details = re.search(r'([\d,]+)\s+shipments', str(results), re.I)
@@ -30,14 +40,15 @@ class OmegaEngine:
             "layer": "Logistics & Supply Chain"
         }
 
-    async def probe_event_intelligence(self, company_name):
+    async def probe_event_intelligence(self, company_name, results=None):
         """
         Dorks Eventbrite / Luma / Meetup for networking activity.
         Signal: Active attendance at industry meetups = High human networking.
         """
         print(f"[Omega Engine] 🎟️  Probing Event Intelligence for '{company_name}'...")
-        query = f'site:eventbrite.com "{company_name}" attend'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:eventbrite.com "{company_name}" attend'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         active_networker = len(results) > 0
         
@@ -47,14 +58,15 @@ class OmegaEngine:
             "layer": "Social & Networking"
         }
 
-    async def probe_public_sector(self, company_name):
+    async def probe_public_sector(self, company_name, results=None):
         """
         Dorks SAM.gov / GovTenders for award signals.
         Signal: Winner of public contracts.
         """
         print(f"[Omega Engine] 🏛️  Probing Public Sector Awards for '{company_name}'...")
-        query = f'site:sam.gov "{company_name}" "contract award"'
-        results = await self.dork_engine.run_dork_search(query, "")
+        if results is None:
+            query = f'site:sam.gov "{company_name}" "contract award"'
+            results = await self.dork_engine.run_dork_search(query, "")
         
         is_gov_contractor = len(results) > 0
         
@@ -88,14 +100,22 @@ class OmegaEngine:
         name = lead.get('name')
         if not name: return lead
         
+        # Trade/Events/Gov share one combined SERP call; Scholar runs alongside on its own
+        planned, academic = await asyncio.gather(
+            self.planner.lookup(name, OMEGA_TARGETS),
+            self.probe_academic_frontier(name),
+            return_exceptions=True
+        )
+        hits = planned if isinstance(planned, dict) else {}
+        
         tasks = [
-            self.probe_trade_logistics(name),
-            self.probe_event_intelligence(name),
-            self.probe_public_sector(name),
-            self.probe_academic_frontier(name)
+            self.probe_trade_logistics(name, hits.get("trade")),
+            self.probe_event_intelligence(name, hits.get("events")),
+            self.probe_public_sector(name, hits.get("public_sector"))
         ]
         
         intel = await asyncio.gather(*tasks, return_exceptions=True)
+        intel.append(academic)
         
         for res in intel:
             if res and isinstance(res, dict):
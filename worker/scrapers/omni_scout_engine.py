@@ -2,7 +2,7 @@ import asyncio
 import re
 import urllib.parse
 from datetime import datetime
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 
 class OmniScoutEngine:
     """
@@ -45,7 +45,7 @@ class OmniScoutEngine:
         print(f"📡 Clarity Pearl: Hunting TikTok Bios for '{query}'...")
         # site:tiktok.com "@" email "query"
         dork_query = f'site:tiktok.com "@{query}" email'
-        results = await self.dork_engine.run_dork_search(dork_query, "tiktok.com")
+        results = await self.dork_engine.run_dork_search(dork_query, "tiktok.com", target=LIST_TARGET)
         
         for r in results:
             r["category"] = "social"
@@ -63,10 +63,10 @@ class OmniScoutEngine:
         """
         print(f"📡 Clarity Pearl: Discovering E-commerce Hubs for '{query}'...")
         # Shopify dork: site:myshopify.com "query"
-        shopify_results = await self.dork_engine.run_dork_search(query, "myshopify.com")
+        shopify_results = await self.dork_engine.run_dork_search(query, "myshopify.com", target=LIST_TARGET)
         
         # Amazon Seller dork: site:amazon.com "seller profile" "query"
-        amazon_results = await self.dork_engine.run_dork_search(f'"seller profile" {query}', "amazon.com")
+        amazon_results = await self.dork_engine.run_dork_search(f'"seller profile" {query}', "amazon.com", target=LIST_TARGET)
         
         all_res = shopify_results + amazon_results
         for r in all_res:
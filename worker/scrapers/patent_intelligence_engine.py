@@ -1,10 +1,10 @@
 import asyncio
 import json
 import os
-import aiohttp
 import random
 from datetime import datetime
 from utils.humanizer import Humanizer
+from utils.http_client import http_client
 
 class PatentIntelligenceEngine:
     """
@@ -59,38 +59,37 @@ class PatentIntelligenceEngine:
             "o": json.dumps({"per_page": 10})
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, params=params, timeout=15) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        total = data.get("total_patent_count", 0)
-                        patents = data.get("patents", [])
+        try:
+            resp = await http_client.get(url, params=params, timeout=15)
+            if resp.status == 200:
+                data = resp.json()
+                total = data.get("total_patent_count", 0)
+                patents = data.get("patents", [])
                         
-                        results = []
-                        for p in patents:
-                            # Safely extract nested lists
-                            assignees = [a.get('assignee_organization') for a in p.get('assignees', []) if a.get('assignee_organization')]
-                            inventors = [f"{i.get('inventor_first_name')} {i.get('inventor_last_name')}" for i in p.get('inventors', [])]
+                results = []
+                for p in patents:
+                    # Safely extract nested lists
+                    assignees = [a.get('assignee_organization') for a in p.get('assignees', []) if a.get('assignee_organization')]
+                    inventors = [f"{i.get('inventor_first_name')} {i.get('inventor_last_name')}" for i in p.get('inventors', [])]
                             
-                            results.append({
-                                "source": "USPTO PatentsView",
-                                "patent_id": p.get("patent_number"),
-                                "title": p.get("patent_title"),
-                                "assignee": assignees[0] if assignees else "Individual",
-                                "inventors": inventors,
-                                "filing_date": p.get("patent_date"),
-                                "status": "Granted",
-                                "abstract": (p.get("patent_abstract") or "")[:200] + "...",
-                                "is_live_data": True
-                            })
+                    results.append({
+                        "source": "USPTO PatentsView",
+                        "patent_id": p.get("patent_number"),
+                        "title": p.get("patent_title"),
+                        "assignee": assignees[0] if assignees else "Individual",
+                        "inventors": inventors,
+                        "filing_date": p.get("patent_date"),
+                        "status": "Granted",
+                        "abstract": (p.get("patent_abstract") or "")[:200] + "...",
+                        "is_live_data": True
+                    })
                             
-                        await self.log(f"   -> USPTO Success: Found {len(results)} patents (Total in DB: {total})")
-                        return results
-                    else:
-                        await self.log(f"   -> USPTO API Error: {resp.status}")
-            except Exception as e:
-                await self.log(f"   -> USPTO Connection Failed: {e}")
+                await self.log(f"   -> USPTO Success: Found {len(results)} patents (Total in DB: {total})")
+                return results
+            else:
+                await self.log(f"   -> USPTO API Error: {resp.status}")
+        except Exception as e:
+            await self.log(f"   -> USPTO Connection Failed: {e}")
                 
         return []
 
@@ -1,4 +1,4 @@
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 
 class RealEstateEngine(BaseDorkEngine):
     """
@@ -16,14 +16,14 @@ class RealEstateEngine(BaseDorkEngine):
         print(f"[{self.platform}] 🏘️  Searching for Shadow Signals in: {query}")
         
         # 1. Probate/Inheritance Signals
-        probate_results = await self.run_dork_search(f'"{query}" probate records filings 2024 2025', "county.gov")
+        probate_results = await self.run_dork_search(f'"{query}" probate records filings 2024 2025', "county.gov", target=LIST_TARGET)
         
         # 2. Code Violations (Tall grass, structural neglect)
         # Often found on local gov or specialized "ugly house" portals
-        violation_results = await self.run_dork_search(f'"{query}" city code violations list 2024', ".gov")
+        violation_results = await self.run_dork_search(f'"{query}" city code violations list 2024', ".gov", target=LIST_TARGET)
         
         # 3. Standard Comp Verification (Zillow/Realtor)
-        comp_results = await self.run_dork_search(query, "zillow.com/homes")
+        comp_results = await self.run_dork_search(query, "zillow.com/homes", target=LIST_TARGET)
 
         all_results = probate_results + violation_results + comp_results
         
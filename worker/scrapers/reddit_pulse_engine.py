@@ -1,4 +1,4 @@
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 
 class RedditPulseEngine(BaseDorkEngine):
     """
@@ -16,11 +16,11 @@ class RedditPulseEngine(BaseDorkEngine):
         print(f"[{self.platform}] 🗨️ Tuning into the Reddit Hivemind for: {query}")
         
         # 1. Broad Search (via Dorking)
-        results = await self.run_dork_search(query, "reddit.com")
+        results = await self.run_dork_search(query, "reddit.com", target=LIST_TARGET)
         
         # 2. Targeted Subreddit Search
         # Examples: "query" in /r/startups, /r/realestate, /r/ecommerce
-        sub_results = await self.run_dork_search(f'"{query}"', "reddit.com/r")
+        sub_results = await self.run_dork_search(f'"{query}"', "reddit.com/r", target=LIST_TARGET)
         
         all_results = results + sub_results
         
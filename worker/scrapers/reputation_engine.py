@@ -1,6 +1,19 @@
 import asyncio
 import re
 from scrapers.base_dork_engine import BaseDorkEngine
+from utils.dork_planner import DorkPlanner
+
+# Review/trust platforms: key -> (site filter, extra terms for a single-site query)
+SOFTWARE_TARGETS = {
+    "capterra": ("capterra.com/p", "reviews"),
+    "trustradius": ("trustradius.com/products", "reviews"),
+    "getapp": ("getapp.com/software", "reviews"),
+}
+TRUST_TARGETS = {
+    "bbb": ("bbb.org/us", ""),
+    "glassdoor": ("glassdoor.com/Reviews", ""),
+    "indeed": ("indeed.com/cmp", "reviews"),
+}
 
 class ReputationEngine:
     """
@@ -12,19 +25,22 @@ class ReputationEngine:
     def __init__(self, page):
         self.page = page
         self.dork_engine = BaseDorkEngine(page, "reputation_hunter")
+        self.planner = DorkPlanner(self.dork_engine)
         
     async def log(self, msg):
         print(f"   ⭐ [ReputationEngine] {msg}")
 
-    async def scrape_software_reviews(self, company_name):
+    async def scrape_software_reviews(self, company_name, hits=None):
         """
-        Scrapes Capterra / TrustRadius for SaaS reputation.
+        Scrapes Capterra / TrustRadius / GetApp for SaaS reputation.
+        hits: pre-fetched planner results (looked up here if not given).
         """
         await self.log(f"Checking Software Reviews for '{company_name}'...")
+        if hits is None:
+            hits = await self.planner.lookup(company_name, SOFTWARE_TARGETS)
         
         # Capterra Dork
-        capterra_query = f'site:capterra.com/p "{company_name}" reviews'
-        results = await self.dork_engine.run_dork_search(capterra_query, "")
+        results = hits.get("capterra")
         
         reputation_data = {}
         
@@ -42,26 +58,32 @@ class ReputationEngine:
             await self.log(f"Found Capterra: {reputation_data.get('capterra_rating')} stars")
 
         # TrustRadius Dork
-        tr_query = f'site:trustradius.com/products "{company_name}" reviews'
-        tr_results = await self.dork_engine.run_dork_search(tr_query, "")
+        tr_results = hits.get("trustradius")
         
         if tr_results:
             best = tr_results[0]
             reputation_data["trustradius_url"] = best.get('source_url')
+
+        # GetApp Dork
+        ga_results = hits.get("getapp")
+        if ga_results:
+             reputation_data["getapp_url"] = ga_results[0].get('source_url')
             
         return reputation_data
 
-    async def scrape_business_trust(self, company_name):
+    async def scrape_business_trust(self, company_name, hits=None):
         """
-        Scrapes BBB and Glassdoor for general business trust.
+        Scrapes BBB, Glassdoor and Indeed for general business trust.
+        hits: pre-fetched planner results (looked up here if not given).
         """
         await self.log(f"Checking Business Trust Signals for '{company_name}'...")
+        if hits is None:
+            hits = await self.planner.lookup(company_name, TRUST_TARGETS)
         
         trust_data = {}
         
         # BBB Dork
-        bbb_query = f'site:bbb.org/us "{company_name}"'
-        bbb_results = await self.dork_engine.run_dork_search(bbb_query, "")
+        bbb_results = hits.get("bbb")
         
         if bbb_results:
             best = bbb_results[0]
@@ -75,8 +97,7 @@ class ReputationEngine:
             await self.log(f"Found BBB Rating: {trust_data.get('bbb_rating')}")
 
         # Glassdoor Dork (Employee sentiment = Trust signal)
-        gd_query = f'site:glassdoor.com/Reviews "{company_name}"'
-        gd_results = await self.dork_engine.run_dork_search(gd_query, "")
+        gd_results = hits.get("glassdoor")
         
         if gd_results:
             best = gd_results[0]
@@ -89,14 +110,9 @@ class ReputationEngine:
             })
 
         # Indeed Dork
-        ind_results = await self.dork_engine.run_dork_search(f'site:indeed.com/cmp "{company_name}" reviews', "")
+        ind_results = hits.get("indeed")
         if ind_results:
              trust_data["indeed_url"] = ind_results[0].get('source_url')
-
-        # GetApp Dork
-        ga_results = await self.dork_engine.run_dork_search(f'site:getapp.com/software "{company_name}" reviews', "")
-        if ga_results:
-             trust_data["getapp_url"] = ga_results[0].get('source_url')
             
         return trust_data
 
@@ -107,11 +123,14 @@ class ReputationEngine:
         company_name = query.replace("reviews", "").replace("rating", "").strip()
         await self.log(f"Starting Reputation Audit for: {company_name}")
         
+        # One planned sweep covers every platform (2 combined SERP calls instead of 6)
+        hits = await self.planner.lookup(company_name, {**SOFTWARE_TARGETS, **TRUST_TARGETS})
+        
         # 1. Software/SaaS Ratings
-        software_rep = await self.scrape_software_reviews(company_name)
+        software_rep = await self.scrape_software_reviews(company_name, hits)
         
         # 2. General Trust Ratings
-        trust_rep = await self.scrape_business_trust(company_name)
+        trust_rep = await self.scrape_business_trust(company_name, hits)
         
         combined = {**software_rep, **trust_rep}
         combined['layer'] = "Layer 2: Trust & Reputation"
@@ -1,4 +1,4 @@
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 
 class TwitterEngine(BaseDorkEngine):
     def __init__(self, page):
@@ -6,7 +6,7 @@ class TwitterEngine(BaseDorkEngine):
 
     async def scrape(self, query):
         # Twitter Dork: site:twitter.com "query" -site:twitter.com/hashtag
-        return await self.run_dork_search(query, "twitter.com")
+        return await self.run_dork_search(query, "twitter.com", target=LIST_TARGET)
 
 class InstagramEngine(BaseDorkEngine):
     def __init__(self, page):
@@ -14,4 +14,4 @@ class InstagramEngine(BaseDorkEngine):
 
     async def scrape(self, query):
         # Instagram Dork: site:instagram.com "query"
-        return await self.run_dork_search(query, "instagram.com")
+        return await self.run_dork_search(query, "instagram.com", target=LIST_TARGET)
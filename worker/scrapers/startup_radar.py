@@ -1,4 +1,4 @@
-from scrapers.base_dork_engine import BaseDorkEngine
+from scrapers.base_dork_engine import BaseDorkEngine, LIST_TARGET
 from utils.humanizer import Humanizer
 
 class CrunchbaseEngine(BaseDorkEngine):
@@ -6,14 +6,14 @@ class CrunchbaseEngine(BaseDorkEngine):
         super().__init__(page, "crunchbase")
 
     async def scrape(self, query):
-        return await self.run_dork_search(query, "crunchbase.com/organization")
+        return await self.run_dork_search(query, "crunchbase.com/organization", target=LIST_TARGET)
 
 class ProductHuntEngine(BaseDorkEngine):
     def __init__(self, page):
         super().__init__(page, "producthunt")
 
     async def scrape(self, query):
-        return await self.run_dork_search(query, "producthunt.com/posts")
+        return await self.run_dork_search(query, "producthunt.com/posts", target=LIST_TARGET)
 
 class RedditEngine(BaseDorkEngine):
     def __init__(self, page):
@@ -21,7 +21,7 @@ class RedditEngine(BaseDorkEngine):
 
     async def scrape(self, query):
         # Focus on subreddits or user discussions
-        return await self.run_dork_search(query, "reddit.com/r")
+        return await self.run_dork_search(query, "reddit.com/r", target=LIST_TARGET)
 
 class YCombinatorEngine:
     """
@@ -42,4 +42,4 @@ class YCombinatorEngine:
         
         # Strategy: site:ycombinator.com/companies "query"
         engine = BaseDorkEngine(self.page, "ycombinator")
-        return await engine.run_dork_search(query, "ycombinator.com/companies")
+        return await engine.run_dork_search(query, "ycombinator.com/companies", target=LIST_TARGET)
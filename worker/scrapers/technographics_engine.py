@@ -1,7 +1,7 @@
 import asyncio
-import aiohttp
 import os
 from scrapers.base_dork_engine import BaseDorkEngine
+from utils.http_client import http_client
 
 class TechnographicsEngine:
     """
@@ -29,20 +29,19 @@ class TechnographicsEngine:
         
         if api_key and ip:
             url = f"https://api.shodan.io/shodan/host/{ip}?key={api_key}"
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.get(url, timeout=10) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            return {
-                                "source": "Shodan (API)",
-                                "ports": data.get('ports', []),
-                                "os": data.get('os', 'Unknown'),
-                                "tags": data.get('tags', []),
-                                "is_live_data": True
-                            }
-                except Exception as e:
-                    await self.log(f"Shodan API Error: {e}")
+            try:
+                resp = await http_client.get(url, timeout=10)
+                if resp.status == 200:
+                    data = resp.json()
+                    return {
+                        "source": "Shodan (API)",
+                        "ports": data.get('ports', []),
+                        "os": data.get('os', 'Unknown'),
+                        "tags": data.get('tags', []),
+                        "is_live_data": True
+                    }
+            except Exception as e:
+                await self.log(f"Shodan API Error: {e}")
 
         # Fallback: Dorking
         query = f'site:shodan.io/host "{target}"'
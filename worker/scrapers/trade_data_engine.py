@@ -1,8 +1,8 @@
 import asyncio
 import json
 import os
-import aiohttp
 from datetime import datetime
+from utils.http_client import http_client
 
 class TradeDataEngine:
     """
@@ -45,38 +45,37 @@ class TradeDataEngine:
         if self.census_key:
             params["key"] = self.census_key
             
-        async with aiohttp.ClientSession() as session:
-            try:
-                await self.log(f"   -> Connecting to Census API: {url}...")
-                async with session.get(url, params=params, timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        # Census returns [headers, row1, row2...]
-                        if len(data) > 1:
-                            headers = data[0]
-                            row = data[1]
-                            val_idx = headers.index("GEN_VAL_MO")
-                            desc_idx = headers.index("I_COMMODITY_LD")
+        try:
+            await self.log(f"   -> Connecting to Census API: {url}...")
+            resp = await http_client.get(url, params=params, timeout=10)
+            if resp.status == 200:
+                data = resp.json()
+                # Census returns [headers, row1, row2...]
+                if len(data) > 1:
+                    headers = data[0]
+                    row = data[1]
+                    val_idx = headers.index("GEN_VAL_MO")
+                    desc_idx = headers.index("I_COMMODITY_LD")
                             
-                            value = float(row[val_idx]) if row[val_idx] else 0
+                    value = float(row[val_idx]) if row[val_idx] else 0
                             
-                            await self.log(f"   -> Census Success: ${value:,.2f} trade volume detected.")
+                    await self.log(f"   -> Census Success: ${value:,.2f} trade volume detected.")
                             
-                            return [{
-                                "source": "USA Trade Online (Census)",
-                                "commodity": row[desc_idx],
-                                "trade_flow": "Import",
-                                "value_usd": value,
-                                "period": f"{year}-12",
-                                "partner_country": "Global",
-                                "is_live_data": True
-                            }]
-                        else:
-                            await self.log("   -> Census API returned empty data.")
-                    else:
-                        await self.log(f"   -> Census API Error: {resp.status} - {await resp.text()}")
-            except Exception as e:
-                await self.log(f"   -> Census Connection Failed: {e}")
+                    return [{
+                        "source": "USA Trade Online (Census)",
+                        "commodity": row[desc_idx],
+                        "trade_flow": "Import",
+                        "value_usd": value,
+                        "period": f"{year}-12",
+                        "partner_country": "Global",
+                        "is_live_data": True
+                    }]
+                else:
+                    await self.log("   -> Census API returned empty data.")
+            else:
+                await self.log(f"   -> Census API Error: {resp.status} - {resp.text}")
+        except Exception as e:
+            await self.log(f"   -> Census Connection Failed: {e}")
                 
         return []
 
@@ -99,27 +98,26 @@ class TradeDataEngine:
             "cmdCode": "TOKEN_TOTAL" # Total Trade
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                await self.log(f"   -> Connecting to UN Comtrade: {url}...")
-                async with session.get(url, params=params, ssl=False, timeout=10) as resp:
-                    if resp.status == 200:
-                        raw = await resp.json()
-                        data = raw.get('data', [])
-                        if data:
-                            rec = data[0]
-                            val = rec.get('primaryValue', 0)
-                            await self.log(f"   -> UN Comtrade Success: ${val:,.2f} global trade detected.")
-                            return [{
-                                "source": "UN Comtrade (Public)",
-                                "reporter": rec.get('reporterDesc'),
-                                "partner": rec.get('partnerDesc'),
-                                "trade_value": val,
-                                "year": rec.get('period'),
-                                "is_live_data": True
-                            }]
-            except Exception as e:
-                await self.log(f"   -> UN Comtrade Connection Failed: {e}")
+        try:
+            await self.log(f"   -> Connecting to UN Comtrade: {url}...")
+            resp = await http_client.get(url, params=params, ssl=False, timeout=10)
+            if resp.status == 200:
+                raw = resp.json()
+                data = raw.get('data', [])
+                if data:
+                    rec = data[0]
+                    val = rec.get('primaryValue', 0)
+                    await self.log(f"   -> UN Comtrade Success: ${val:,.2f} global trade detected.")
+                    return [{
+                        "source": "UN Comtrade (Public)",
+                        "reporter": rec.get('reporterDesc'),
+                        "partner": rec.get('partnerDesc'),
+                        "trade_value": val,
+                        "year": rec.get('period'),
+                        "is_live_data": True
+                    }]
+        except Exception as e:
+            await self.log(f"   -> UN Comtrade Connection Failed: {e}")
                 
         return []
 
@@ -1,13 +1,62 @@
 import re
 import asyncio
 import os
+import hashlib
+import html as html_lib
+import time
 import urllib.parse
+from contextlib import asynccontextmanager
 from utils.humanizer import Humanizer
+from utils.http_client import http_client
+from utils.page_pool import lease_page
+from utils.contact_extractor import extract_contacts, summarize
+from utils.site_fingerprints import site_fingerprints, conditional_headers
+from utils.serp_parser import fetch_serp
+from utils.time_budget import get_budget
+
+# Tier 1 (plain HTTP): look like a browser, give up fast
+HTTP_TIMEOUT = 10
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+# Less visible text than this in the static HTML = rendered client-side
+MIN_STATIC_TEXT = 200
+# Bot walls served with a 200 (Cloudflare, PerimeterX, Sucuri...)
+BLOCK_MARKERS = ("cf_chl_opt", "challenge-platform", "<title>just a moment", "<title>attention required",
+                 "px-captcha", "sucuri website firewall", "<title>access denied")
+# Site crawl: pages worth fetching besides the homepage, best first
+CRAWL_KEYWORDS = (
+    ("contact", "kontakt", "contacto", "get-in-touch", "get in touch"),
+    ("impressum", "imprint", "legal-notice", "mentions-legales"),
+    ("team", "leadership", "management", "people", "staff", "our-story", "founder"),
+    ("about",),
+)
+MAX_CRAWL_PAGES = 5
+CRAWL_PER_DOMAIN = 2
+CRAWL_DELAY = 0.25
+MAX_SITEMAP_BYTES = 500_000
+# Result fields that belong to one visit, not to the site (never stored with its fingerprints)
+VOLATILE_FIELDS = ("fetch_tier", "verified_industry", "relevance_reason", "error")
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".zip", ".doc", ".docx", ".xml", ".mp4")
+# SPA shells: static HTML may be missing the contact block even when it has text
+JS_APP_MARKERS = ('id="root"', 'id="app"', 'id="__next"', "__next_data__", "ng-version", "data-reactroot", "window.__nuxt__")
+
+TAG_RE = re.compile(r"<[^>]+>")
+INVISIBLE_RE = re.compile(r"<(script|style|noscript|template|svg)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+WHITESPACE_RE = re.compile(r"\s+")
+ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.I)
+META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.I)
+ANCHOR_RE = re.compile(r"<a\b([^>]*)>(.*?)</a\s*>", re.S | re.I)
+SITEMAP_LOC_RE = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.S | re.I)
 
 class WebsiteEngine:
     def __init__(self, page):
         self.page = page
         self.platform = "generic_website"
+        self.fingerprints = {}  # url -> fingerprint of the pages fetched over HTTP
         
     async def find_company_website(self, company_name, use_proxy=False):
         """
@@ -45,28 +94,9 @@ class WebsiteEngine:
             await self.page.goto(url, wait_until="domcontentloaded", timeout=20000)
             await Humanizer.random_sleep(1, 2)
             
-            # Check for Basic HTML (Blocking)
-            content = await self.page.content()
-            is_basic_html = "ZINbbc" in content
-            
-            links = []
-            if is_basic_html:
-                # Legacy Mobile/Basic HTML
-                items = await self.page.query_selector_all("div.ZINbbc > div:first-child > a")
-                links = items
-            else:
-                # Modern Desktop
-                links = await self.page.query_selector_all("div.g a")
-
-            for link in links:
-                href = await link.get_attribute("href")
-                if not href: continue
-                
-                # Clean Google redirect
-                if "/url?q=" in href:
-                    href = href.split("/url?q=")[1].split("&")[0]
-                    href = urllib.parse.unquote(href)
-                
+            # Desktop and Basic HTML (blocking) layouts, parsed from one page.content()
+            for result in await fetch_serp(self.page, "google"):
+                href = result.url
                 if self._is_valid_company_url(href):
                     print(f"[{self.platform}] 🎯 Google Found URL: {href}")
                     return href
@@ -88,9 +118,8 @@ class WebsiteEngine:
             await self.page.goto(url, wait_until="domcontentloaded", timeout=20000)
             await Humanizer.random_sleep(1, 2)
             
-            links = await self.page.query_selector_all("li.b_algo h2 a")
-            for link in links:
-                href = await link.get_attribute("href")
+            for result in await fetch_serp(self.page, "bing"):
+                href = result.url
                 if self._is_valid_company_url(href):
                     print(f"[{self.platform}] 🎯 Bing Found URL: {href}")
                     return href
@@ -112,9 +141,8 @@ class WebsiteEngine:
             await self.page.goto(url, wait_until="domcontentloaded", timeout=20000)
             await Humanizer.random_sleep(1, 2)
             
-            links = await self.page.query_selector_all("a[data-testid='result-title-a']")
-            for link in links:
-                href = await link.get_attribute("href")
+            for result in await fetch_serp(self.page, "ddg"):
+                href = result.url
                 if self._is_valid_company_url(href):
                     print(f"[{self.platform}] 🎯 DDG Found URL: {href}")
                     return href
@@ -160,6 +188,13 @@ class WebsiteEngine:
         """
         Visits a company website and attempts to extract contact info (Emails, Phones, Socials).
         Also runs 'The Bouncer' verification if keywords are provided.
+
+        Tier 1 fetches the homepage plus its contact/about/team pages over plain
+        HTTP; the browser is only used when that comes back blocked or JS-rendered.
+        A site crawled before is revalidated with conditional GETs first, and its
+        stored extraction is returned when nothing changed.
+        `fetch_tier` in the result records which tier produced it
+        ('not_modified' | 'http' | 'browser').
         """
         print(f"[{self.platform}] 🌐 Visiting Target Headquarters: {url}")
         
@@ -171,140 +206,331 @@ class WebsiteEngine:
             "verified_industry": None,
             "relevance_reason": "Not Checked",
             "meta_description": "",
-            "logo_url": None
+            "logo_url": None,
+            "fetch_tier": None
         }
 
         try:
-            # 1. Visit Homepage
-            # Optimize: Block heavy resources for stability
-            async def handle_route(route):
-                try:
-                    if route.request.resource_type in ["image", "media", "font", "stylesheet"]:
-                        await route.abort()
-                    else:
-                        await route.continue_()
-                except:
-                    pass # Request likely finished or page closed
-
-            await self.page.route("**/*", handle_route)
+            # 0. Unchanged since the last crawl: reuse it without parsing anything
+            # (the Bouncer needs the page text, so keyword checks always fetch)
+            stored = None if target_keywords and negative_keywords else await self.revalidate(url)
+            if stored:
+                results.update(stored)
+                results.update({"fetch_tier": "not_modified", "unchanged": True})
+                return [results]
 
-            try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            except Exception as nav_err:
-                if "crash" in str(nav_err).lower():
-                    print(f"[{self.platform}] ⚠️ Page crashed on {url}. Skipping.")
+            # 1. Plain HTTP (static sites: most small businesses)
+            pages, fallback_reason = await self._fetch_http(url)
+            if pages:
+                results["fetch_tier"] = "http"
+                await self._extract(results, url, pages, target_keywords, negative_keywords)
+                if results["emails"] or results["phones"] or not self._looks_js_app(pages[0][0]):
+                    print(f"[{self.platform}] ⚡ Served over HTTP ({len(pages)} page(s))")
+                    site_fingerprints.save(url, self.fingerprints, {k: v for k, v in results.items() if k not in VOLATILE_FIELDS})
                     return [results]
-                raise nav_err
-                
-            await Humanizer.random_sleep(1, 2)
-            
-            content = await self.page.content()
-            text = await self.page.inner_text("body")
-            
-            # Extract Logo / Favicon
-            try:
-                # 1. Look for Favicon/Icon
-                icon_handle = await self.page.query_selector("link[rel*='icon']")
-                if icon_handle:
-                    results["logo_url"] = await icon_handle.get_attribute("href")
-                
-                # 2. Look for OG Image (often the logo or brand image)
-                if not results["logo_url"]:
-                    og_handle = await self.page.query_selector("meta[property='og:image']")
-                    if og_handle:
-                        results["logo_url"] = await og_handle.get_attribute("content")
-
-                # 3. Clearbit Fallback (The Industry Standard)
-                if not results["logo_url"] or results["logo_url"].startswith('/'):
-                    domain = urllib.parse.urlparse(url).netloc
-                    results["logo_url"] = f"https://logo.clearbit.com/{domain}"
-            except: pass
+                fallback_reason = "JS app without contacts in static HTML"
 
-            # 2. Industry Verification (The Bouncer)
-            if target_keywords and negative_keywords:
-                is_relevant, reason = await self.verify_industry(
-                    text + " " + results["meta_description"], 
-                    target_keywords, 
-                    negative_keywords
-                )
-                results["verified_industry"] = is_relevant
-                results["relevance_reason"] = reason
-                print(f"[{self.platform}] 🛡️ Bouncer Verdict: {'✅ Allowed' if is_relevant else '⛔ Denied'} ({reason})")
-
-            # Extract physical address (for Location)
-            try:
-                # Look for address-like patterns (US/Intl)
-                # 1. Standard US: City, ST Zip
-                addr_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s+[A-Z]{2}\s+\d{5})', text)
-                
-                # 2. Relaxed: City, State (if no zip found)
-                if not addr_match:
-                    addr_match = re.search(r'([A-Z][a-z]+,\s+(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY))', text)
-                
-                if addr_match:
-                    results["location"] = addr_match.group(0)
-            except: pass
-
-            # 4. Look for "Contact" / "About" links for deeper scraping
-            # We scrape current page (Home) + potentially Contact page
-            pages_to_scrape = [text] # Start with homepage text
-            
-            contact_link = await self.page.query_selector("a[href*='contact']") or \
-                           await self.page.query_selector("a:has-text('Contact')")
-            
-            if contact_link:
-                try:
-                    c_href = await contact_link.get_attribute("href")
-                    print(f"[{self.platform}] 🔗 Navigating to Contact Page: {c_href}")
-                    await contact_link.click()
-                    await self.page.wait_for_load_state("domcontentloaded", timeout=15000)
-                    await Humanizer.random_sleep(1, 2)
-                    pages_to_scrape.append(await self.page.inner_text("body"))
-                except: pass
-
-            # 4. Extract Data from all visited pages
-            full_text = " ".join(pages_to_scrape)
-            
-            # Method 1: Regex on Text
-            emails = set(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", full_text))
-            
-            # Method 2: DOM Scan for mailto: links (Robust)
-            try:
-                mailto_links = await self.page.query_selector_all("a[href^='mailto:']")
-                for link in mailto_links:
-                    href = await link.get_attribute("href")
-                    if href:
-                        clean_email = href.replace("mailto:", "").split("?")[0].strip()
-                        if "@" in clean_email:
-                            emails.add(clean_email)
-            except Exception as e:
-                print(f"[{self.platform}] ⚠️ Mailto scan error: {e}")
-
-            results["emails"] = [e for e in emails if not e.endswith(('.png', '.jpg', '.svg', '.gif', '.webp'))]
-            
-            # Phones (US/Intl formats)
-            phones = set(re.findall(r"(\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}", full_text))
-            results["phones"] = list(phones)
-            
-            # Socials
-            social_patterns = {
-                "linkedin": r"linkedin\.com/company/[\w-]+",
-                "facebook": r"facebook\.com/[\w\.]+",
-                "twitter": r"(twitter\.com|x\.com)/[\w]+",
-                "instagram": r"instagram\.com/[\w\.]+",
-                "youtube": r"youtube\.com/(channel|c|user)/[\w]+"
-            }
-            
-            for platform, pattern in social_patterns.items():
-                matches = re.search(pattern, content) # Check HTML content for links
-                if matches:
-                    results["socials"][platform] = "https://" + matches.group(0)
-
-            print(f"[{self.platform}] ✅ Extracted: {len(results['emails'])} emails, {len(results['phones'])} phones, {len(results['socials'])} socials.")
-            
+            # 2. Browser (JS-rendered or blocked)
+            print(f"[{self.platform}] 🖥️ Browser fallback: {fallback_reason}")
+            results["http_fallback_reason"] = fallback_reason
+            async with lease_page(self.page) as page:
+                pages = await self._fetch_browser(page, url)
+            if pages is None:
+                return [results]
+            results["fetch_tier"] = "browser"
+            await self._extract(results, url, pages, target_keywords, negative_keywords)
             return [results]
 
         except Exception as e:
             print(f"[{self.platform}] ❌ Website Visit Error: {e}")
             results["error"] = str(e)
             return [results]
+
+    async def _fetch_http(self, url):
+        """
+        Homepage + a bounded crawl of its contact-bearing pages over plain HTTP.
+
+        Candidates (contact, impressum, team, leadership, about...) come from
+        the homepage links and sitemap.xml, which is fetched alongside the
+        homepage. They're fetched concurrently, within the per-domain limits.
+
+        Returns ([(html, text), ...], None) when the static HTML is usable,
+        otherwise (None, reason) so the caller escalates to the browser.
+        """
+        self.fingerprints = {}
+        home, sitemap_urls = await asyncio.gather(self._get(url), self._sitemap_urls(url))
+        if isinstance(home, Exception):
+            return None, f"HTTP error: {type(home).__name__}"
+
+        if not home.ok:
+            return None, f"HTTP {home.status}"
+        content_type = home.headers.get("Content-Type", "")
+        if content_type and "html" not in content_type.lower():
+            return None, f"not HTML ({content_type})"
+
+        html = home.text
+        lowered = html[:20000].lower()
+        if any(marker in lowered for marker in BLOCK_MARKERS):
+            return None, "bot challenge"
+        text = _html_to_text(html)
+        if len(text) < MIN_STATIC_TEXT:
+            return None, f"JS-rendered ({len(text)} chars of static text)"
+
+        pages = [(html, text)]
+        self.fingerprints[url] = _fingerprint(home)
+        targets = _crawl_targets(html, home.url, sitemap_urls)
+        budget = get_budget()
+        if targets and budget.remaining() < 2 * HTTP_TIMEOUT:
+            budget.note_skip("site_crawl_pages", len(targets) - 1)
+            targets = targets[:1]
+        if targets:
+            print(f"[{self.platform}] 🔗 Crawling {len(targets)} page(s): {', '.join(urllib.parse.urlparse(t).path for t in targets)}")
+            for target, response in zip(targets, await asyncio.gather(*(self._get(t) for t in targets))):
+                if isinstance(response, Exception) or not response.ok:
+                    continue  # The other pages are still worth extracting
+                if "html" in response.headers.get("Content-Type", "html").lower():
+                    pages.append((response.text, _html_to_text(response.text)))
+                    self.fingerprints[target] = _fingerprint(response)
+        return pages, None
+
+    async def revalidate(self, url):
+        """
+        The stored extraction of `url` if none of its crawled pages changed, else None.
+        One conditional GET per page: 304 or an identical content hash counts as unchanged.
+        """
+        record = site_fingerprints.get(url)
+        if not record or not record.get("extracted") or not record.get("pages"):
+            return None
+
+        page_urls = list(record["pages"])
+        responses = await asyncio.gather(*(self._get(u, conditional_headers(record["pages"][u])) for u in page_urls))
+        for page_url, response in zip(page_urls, responses):
+            if isinstance(response, Exception):
+                return None  # Can't tell; the full crawl will sort it out
+            if response.status == 304:
+                continue
+            if response.ok and _content_hash(response.text) == record["pages"][page_url].get("hash"):
+                continue
+            print(f"[{self.platform}] ♻️ Site changed ({urllib.parse.urlparse(page_url).path or '/'}: HTTP {response.status}), re-crawling")
+            site_fingerprints.invalidate(url)
+            return None
+
+        print(f"[{self.platform}] 💤 Site unchanged since last crawl ({len(page_urls)} page(s) revalidated)")
+        site_fingerprints.mark_unchanged(url)
+        return dict(record["extracted"])
+
+    async def _get(self, url, headers=None):
+        """Polite GET: returns the response, or the exception instead of raising."""
+        try:
+            async with domain_gate.slot(urllib.parse.urlparse(url).netloc):
+                return await http_client.get(url, headers={**HTTP_HEADERS, **(headers or {})}, timeout=HTTP_TIMEOUT, retries=0)
+        except Exception as e:
+            return e
+
+    async def _sitemap_urls(self, url):
+        """Page URLs listed in /sitemap.xml (following one nested sitemap of an index)."""
+        parts = urllib.parse.urlparse(url)
+        sitemap = f"{parts.scheme}://{parts.netloc}/sitemap.xml"
+        for _ in range(2):
+            response = await self._get(sitemap)
+            if isinstance(response, Exception) or not response.ok:
+                return []
+            locs = [html_lib.unescape(loc.strip()) for loc in SITEMAP_LOC_RE.findall(response.text[:MAX_SITEMAP_BYTES])]
+            if "<sitemapindex" not in response.text[:2000].lower():
+                return locs
+            # Index: the pages sitemap is the one that lists contact/about pages
+            nested = [loc for loc in locs if "page" in loc.lower()] or locs
+            if not nested:
+                return []
+            sitemap = nested[0]
+        return []
+
+    async def _fetch_browser(self, page, url):
+        """Homepage + Contact page in the browser. Returns [(html, text), ...] or None if the page crashed."""
+        # Optimize: Block heavy resources for stability
+        async def handle_route(route):
+            try:
+                if route.request.resource_type in ["image", "media", "font", "stylesheet"]:
+                    await route.abort()
+                else:
+                    await route.continue_()
+            except:
+                pass # Request likely finished or page closed
+
+        await page.route("**/*", handle_route)
+
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
+        except Exception as nav_err:
+            if "crash" in str(nav_err).lower():
+                print(f"[{self.platform}] ⚠️ Page crashed on {url}. Skipping.")
+                return None
+            raise nav_err
+            
+        await Humanizer.random_sleep(1, 2)
+        
+        pages = [(await page.content(), await page.inner_text("body"))]
+
+        # Look for "Contact" links for deeper scraping
+        contact_link = await page.query_selector("a[href*='contact']") or \
+                       await page.query_selector("a:has-text('Contact')")
+        
+        if contact_link:
+            try:
+                c_href = await contact_link.get_attribute("href")
+                print(f"[{self.platform}] 🔗 Navigating to Contact Page: {c_href}")
+                await contact_link.click()
+                await page.wait_for_load_state("domcontentloaded", timeout=15000)
+                await Humanizer.random_sleep(1, 2)
+                pages.append((await page.content(), await page.inner_text("body")))
+            except: pass
+        return pages
+
+    async def _extract(self, results, url, pages, target_keywords, negative_keywords):
+        """
+        Fills `results` from fetched pages, the same way for both tiers.
+        pages: [(html, visible_text), ...], homepage first.
+        """
+        home_html, home_text = pages[0]
+
+        # Extract Logo / Favicon + meta description
+        try:
+            for tag in LINK_TAG_RE.findall(home_html):
+                attrs = _tag_attrs(tag)
+                if "icon" in attrs.get("rel", "").lower() and attrs.get("href"):
+                    results["logo_url"] = attrs["href"]
+                    break
+
+            for tag in META_TAG_RE.findall(home_html):
+                attrs = _tag_attrs(tag)
+                if not results["logo_url"] and attrs.get("property") == "og:image" and attrs.get("content"):
+                    results["logo_url"] = attrs["content"]
+                if not results["meta_description"] and attrs.get("name", "").lower() == "description":
+                    results["meta_description"] = html_lib.unescape(attrs.get("content", "")).strip()
+
+            # Clearbit Fallback (The Industry Standard)
+            if not results["logo_url"] or results["logo_url"].startswith('/'):
+                domain = urllib.parse.urlparse(url).netloc
+                results["logo_url"] = f"https://logo.clearbit.com/{domain}"
+        except: pass
+
+        # Industry Verification (The Bouncer)
+        if target_keywords and negative_keywords:
+            is_relevant, reason = await self.verify_industry(
+                home_text + " " + results["meta_description"], 
+                target_keywords, 
+                negative_keywords
+            )
+            results["verified_industry"] = is_relevant
+            results["relevance_reason"] = reason
+            print(f"[{self.platform}] 🛡️ Bouncer Verdict: {'✅ Allowed' if is_relevant else '⛔ Denied'} ({reason})")
+
+        # Emails, phones, socials, address: one compiled pass per page
+        entities = []
+        site_domain = urllib.parse.urlparse(url).netloc
+        for html, _ in pages:
+            entities.extend(extract_contacts(html, site_domain))
+        found = summarize(entities)
+        results["emails"] = found["emails"]
+        results["phones"] = found["phones"]
+        results["socials"] = found["socials"]
+        results["contact_confidence"] = {e.value: e.confidence for e in reversed(entities) if e.kind == "email"}
+        if found["address"]:
+            results["location"] = found["address"]
+
+        print(f"[{self.platform}] ✅ Extracted: {len(results['emails'])} emails, {len(results['phones'])} phones, {len(results['socials'])} socials.")
+
+    def _looks_js_app(self, html):
+        lowered = html[:50000].lower()
+        return any(marker in lowered for marker in JS_APP_MARKERS)
+
+
+def _html_to_text(html):
+    """Visible text of a static page (roughly what inner_text('body') gives)."""
+    html = INVISIBLE_RE.sub(" ", html)
+    text = html_lib.unescape(TAG_RE.sub(" ", html))
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _content_hash(html):
+    """Hash of a page minus scripts/styles/comments (where per-request nonces and tokens live)."""
+    return hashlib.sha256(INVISIBLE_RE.sub("", html).encode("utf-8", "replace")).hexdigest()
+
+
+def _fingerprint(response):
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "hash": _content_hash(response.text)
+    }
+
+
+def _tag_attrs(tag):
+    attrs = {}
+    for name, dq, sq, bare in ATTR_RE.findall(tag):
+        attrs[name.lower()] = dq or sq or bare
+    return attrs
+
+
+def _crawl_targets(html, base_url, sitemap_urls):
+    """
+    Same-site pages likely to list contacts, best first, at most MAX_CRAWL_PAGES.
+    Homepage links are matched on URL or anchor text; sitemap entries on URL.
+    """
+    base_host = urllib.parse.urlparse(base_url).netloc
+    home = base_url.split("#")[0].rstrip("/")
+    candidates = [(_tag_attrs(attrs_str).get("href", "").strip(), TAG_RE.sub("", label)) for attrs_str, label in ANCHOR_RE.findall(html)]
+    candidates += [(loc, "") for loc in sitemap_urls]
+
+    ranked = {}
+    for href, label in candidates:
+        if not href or href.startswith(("mailto:", "tel:", "javascript:", "#")):
+            continue
+        target = urllib.parse.urljoin(base_url, html_lib.unescape(href)).split("#")[0]
+        parsed = urllib.parse.urlparse(target)
+        if parsed.netloc != base_host or target.rstrip("/") == home or parsed.path.lower().endswith(SKIP_EXTENSIONS):
+            continue
+        haystack = f"{parsed.path} {label}".lower()
+        rank = next((i for i, words in enumerate(CRAWL_KEYWORDS) if any(w in haystack for w in words)), None)
+        if rank is None:
+            continue
+        key = target.rstrip("/")
+        # Shallow paths first: /contact beats /blog/2019/contact-our-team
+        score = (rank, parsed.path.count("/"))
+        if key not in ranked or score < ranked[key][0]:
+            ranked[key] = (score, target)
+    return [target for _, target in sorted(ranked.values())[:MAX_CRAWL_PAGES]]
+
+
+class DomainGate:
+    """
+    Per-domain politeness for site crawls: at most CRAWL_PER_DOMAIN requests in
+    flight to one host and CRAWL_DELAY seconds between their starts. Idle hosts
+    are forgotten.
+    """
+
+    def __init__(self):
+        self._hosts = {}  # host -> [semaphore, next_start, users]
+
+    @asynccontextmanager
+    async def slot(self, host):
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = [asyncio.Semaphore(CRAWL_PER_DOMAIN), 0.0, 0]
+        entry[2] += 1
+        try:
+            async with entry[0]:
+                now = time.monotonic()
+                start = max(now, entry[1])
+                entry[1] = start + CRAWL_DELAY  # Reserve before sleeping so waiters queue up behind us
+                if start > now:
+                    await asyncio.sleep(start - now)
+                yield
+        finally:
+            entry[2] -= 1
+            if not entry[2]:
+                self._hosts.pop(host, None)
+
+
+# Singleton instance
+domain_gate = DomainGate()
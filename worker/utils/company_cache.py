@@ -0,0 +1,255 @@
+"""
+CLARITY PEARL - COMPANY ENRICHMENT CACHE
+Per-company, per-layer enrichment results shared across jobs and orgs.
+
+Entries are keyed by normalized domain ("d:acme.com"). Different companies
+share names ("Joe's Pizza" in two cities), so the normalized-name hash from
+DeduplicationService.normalize_company ("n:<md5>") only carries which website
+a company had: leads without a domain get website_discovery from it and
+nothing else, and no other layer is ever written under it. Once such a lead's
+website is discovered, the entry follows it and merges that domain's record.
+Each layer has its own TTL: fresh layers are copied onto the lead, stale or missing ones
+are recomputed. Concurrent leads of the same company share one run per layer.
+Saves merge layer by layer (newest fetched_at wins), never replacing a row.
+
+Storage: in-process LRU in front of Supabase `company_enrichment_cache`.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from utils.deduplication_service import DeduplicationService
+from utils.single_flight import SingleFlight
+
+DAY = 86400
+# How long each layer's result stays trustworthy. Layers not listed are never cached.
+LAYER_TTLS = {
+    "website_discovery": 60 * DAY,
+    "contacts": 21 * DAY,
+    "xray": 21 * DAY,
+    "reputation": 30 * DAY,
+    "capital": 30 * DAY,
+    "tech_stack": 45 * DAY,
+    "hiring": 7 * DAY,
+    "patents": 90 * DAY,
+    "trade": 30 * DAY,
+    "events": 14 * DAY,
+    "gov": 30 * DAY,
+    "academic": 90 * DAY,
+}
+# Layers computed only from the company's own website: still valid while it hasn't changed
+WEBSITE_LAYERS = ("contacts", "tech_stack")
+# Layers shared under the name alias (safe to hand a namesake: it only points at a website)
+ALIAS_LAYERS = ("website_discovery",)
+# In-process entries kept (Render free tier: keep it small)
+MEMORY_ENTRIES = 2000
+
+
+def normalize_domain(website: Optional[str]) -> Optional[str]:
+    """'https://www.Acme.com/about' -> 'acme.com'. None for Maps/Google links."""
+    if not website or "google" in str(website).lower():
+        return None
+    raw = website if "://" in website else f"https://{website}"
+    host = (urlsplit(raw).hostname or "").lower()
+    host = re.sub(r'^www\d?\.', '', host)
+    return host or None
+
+
+class CompanyCacheEntry:
+    """
+    The cached layers for one lead's company, loaded once per lead.
+    """
+
+    def __init__(self, cache: "CompanyCache", lead: Dict, layers: Dict[str, Dict], loaded_key: Optional[str] = None):
+        self.cache = cache
+        self.lead = lead
+        self.layers = layers  # layer -> {"fields": {...}, "fetched_at": epoch}
+        self.loaded_key = loaded_key
+        self.dirty = False
+
+    @property
+    def key(self) -> str:
+        return self.cache.keys_for(self.lead)[0]
+
+    def get_fresh(self, layer: str) -> Optional[Dict]:
+        ttl = LAYER_TTLS.get(layer)
+        record = self.layers.get(layer)
+        if not ttl or not record:
+            return None
+        if time.time() - record.get("fetched_at", 0) > ttl:
+            return None
+        return record.get("fields", {})
+
+    def stale(self, layer: str) -> bool:
+        """Cached, but past its TTL."""
+        ttl = LAYER_TTLS.get(layer)
+        record = self.layers.get(layer)
+        return bool(ttl and record) and time.time() - record.get("fetched_at", 0) > ttl
+
+    def renew(self, layer: str):
+        """Restart a stale layer's TTL without recomputing it (its source didn't change)."""
+        record = self.layers.get(layer)
+        if record:
+            record["fetched_at"] = time.time()
+            self.dirty = True
+
+    def follow_website(self) -> bool:
+        """
+        The lead got a website after the entry was opened (website_discovery):
+        merge in what's cached for that domain. True if it was loaded now.
+        """
+        domain = normalize_domain(self.lead.get('website'))
+        key = f"d:{domain}" if domain else None
+        if not key or key == self.loaded_key:
+            return False
+        self.loaded_key = key
+        self.layers = _merge_layers(self.cache.load(key), self.layers)
+        return True
+
+    def store(self, layer: str, fields: Dict):
+        if layer not in LAYER_TTLS:
+            return
+        self.layers[layer] = {"fields": fields, "fetched_at": time.time()}
+        self.dirty = True
+
+    async def run_once(self, layer: str, produce):
+        """
+        Run a layer at most once at a time per company (intra-job dedup).
+        produce() runs the layer on this lead and returns the fields it filled.
+        """
+        key = self.key
+        if layer not in LAYER_TTLS or (key.startswith("n:") and layer not in ALIAS_LAYERS):
+            return await produce()  # Namesakes without a domain aren't the same company
+        return await self.cache.inflight.do((key, layer), produce)
+
+    def flush(self):
+        if self.dirty:
+            self.cache.save(self.lead, self.layers)
+            self.dirty = False
+
+
+class CompanyCache:
+    """
+    Company-keyed, per-layer TTL cache. Use the module singleton `company_cache`.
+    """
+
+    def __init__(self, supabase=None):
+        self.supabase = supabase
+        self.memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self.inflight = SingleFlight("company-layers")
+        self._normalizer = DeduplicationService(None)
+        self.hits = 0
+        self.misses = 0
+
+    def keys_for(self, lead: Dict) -> List[str]:
+        """The lead's record key: its domain, or the name alias while it has none."""
+        domain = normalize_domain(lead.get('website'))
+        if domain:
+            return [f"d:{domain}"]
+        name_key = self._name_key(lead)
+        return [name_key] if name_key else []
+
+    def _name_key(self, lead: Dict) -> Optional[str]:
+        name = (lead.get('name') or lead.get('company') or "").strip()
+        return f"n:{self._normalizer.normalize_company(name)}" if name else None
+
+    def seen_domain(self, name: str) -> Optional[str]:
+        """Domain an earlier lead with the same normalized company name had, if any."""
+        key = f"n:{self._normalizer.normalize_company(name)}"
+        layers = self.memory.get(key) or {}
+        domain = normalize_domain(((layers.get("website_discovery") or {}).get("fields") or {}).get("website"))
+        if domain or not self.supabase:
+            return domain
+        try:
+            res = self.supabase.table('company_enrichment_cache').select('domain').eq('company_key', key).limit(1).execute()
+            return (res.data[0].get('domain') if res.data else None) or None
+        except Exception as e:
+            print(f"⚠️ Company cache domain lookup failed: {e}")
+            return None
+
+    def load(self, key: str) -> Dict[str, Dict]:
+        """One record's layers (memory first, then Supabase); {} if unknown."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        if not self.supabase:
+            return {}
+        try:
+            res = self.supabase.table('company_enrichment_cache').select('company_key, layers').eq('company_key', key).limit(1).execute()
+        except Exception as e:
+            print(f"⚠️ Company cache lookup failed: {e}")
+            return {}
+        layers = (res.data[0].get('layers') if res.data else None) or {}
+        if layers:
+            self._remember(key, layers)
+        return layers
+
+    async def open(self, lead: Dict) -> CompanyCacheEntry:
+        """Load everything known about the lead's company (memory first, then Supabase)."""
+        keys = self.keys_for(lead)
+        key = keys[0] if keys else None
+        layers = self.load(key) if key else {}
+        if key and key.startswith("n:"):
+            # A namesake's record: only which website it had applies to this lead
+            layers = {layer: record for layer, record in layers.items() if layer in ALIAS_LAYERS}
+
+        merged = {layer: dict(record) for layer, record in layers.items()}
+        if merged:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return CompanyCacheEntry(self, lead, merged, loaded_key=key)
+
+    def save(self, lead: Dict, layers: Dict[str, Dict]):
+        """
+        Merge the company's layers into its domain record (the name alias gets
+        website_discovery only). Layers this lead didn't load or run are kept.
+        """
+        domain = normalize_domain(lead.get('website'))
+        records: Dict[str, Dict] = {}
+        if domain:
+            records[f"d:{domain}"] = layers
+        name_key = self._name_key(lead)
+        alias = {layer: record for layer, record in layers.items() if layer in ALIAS_LAYERS}
+        if name_key and alias:
+            records[name_key] = alias
+        for key, record in records.items():
+            self._remember(key, _merge_layers(self.memory.get(key) or {}, record))
+        if not self.supabase:
+            return
+        for key, record in records.items():
+            try:
+                self.supabase.rpc('fn_merge_company_layers', {
+                    'p_company_key': key,
+                    'p_domain': domain,
+                    'p_company_name': lead.get('name'),
+                    'p_layers': record
+                }).execute()
+            except Exception as e:
+                print(f"⚠️ Company cache save failed: {e}")
+
+    def _remember(self, key: str, layers: Dict):
+        self.memory[key] = layers
+        self.memory.move_to_end(key)
+        while len(self.memory) > MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.memory),
+                "coalescing": self.inflight.get_stats()}
+
+
+def _merge_layers(base: Dict[str, Dict], layers: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Layer-by-layer union, newest fetched_at wins (fn_merge_company_layers does the same in SQL)."""
+    merged = dict(base)
+    for layer, record in layers.items():
+        if record.get("fetched_at", 0) >= merged.get(layer, {}).get("fetched_at", 0):
+            merged[layer] = dict(record)
+    return merged
+
+
+# Singleton instance
+company_cache = CompanyCache()
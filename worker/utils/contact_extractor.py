@@ -0,0 +1,203 @@
+"""
+CLARITY PEARL - CONTACT EXTRACTOR
+One compiled scanner for emails, phones, social profiles and US addresses.
+
+Every branch lives in one alternation, so a document (raw HTML or plain text)
+is walked once with `finditer` instead of once per entity type. Each match
+comes back with its offsets and a confidence:
+
+- high:   explicit links (mailto:, tel:) and emails on the site's own domain
+- medium: plain-text emails / formatted phone numbers / profile URLs
+- low:    mailboxes nobody answers (noreply@...)
+
+Known false positives (image filenames like logo@2x.png, placeholder domains,
+tracking mailboxes, numbers labelled as fax lines) are dropped before they're
+returned.
+"""
+
+import html as html_lib
+import re
+import urllib.parse
+from typing import Dict, List, Optional
+
+US_STATES = "AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY"
+
+# Social profile hosts -> platform (x.com is Twitter)
+SOCIAL_PATHS = {
+    "linkedin": ("linkedin", r"company/[\w.-]+"),
+    "facebook": ("facebook", r"[\w.-]+"),
+    "twitter": ("twitter", r"[\w.-]+"),
+    "x": ("twitter", r"[\w.-]+"),
+    "instagram": ("instagram", r"[\w.-]+"),
+    "youtube": ("youtube", r"(?:channel|c|user)/[\w.-]+"),
+}
+_PHONE_REST = r"\d\d\)?[\s.-]\d{3}[\s.-]\d{4}(?!\d)"
+
+# Every branch starts with a literal character, so the regex engine skips
+# straight between candidate characters ('@', ',', digits...) instead of
+# trying every branch at every offset. Each hit is an anchor; the entity
+# around it is finished with the small patterns below.
+SCANNER = re.compile("|".join(
+    [
+        r"@", r"%40", r"&\#(?:0*64|x0*40);",                               # email '@' (plain, URL- or entity-encoded)
+        r":(?<=tel:)[+\d][\d\s().-]{6,20}\d",                               # tel: link
+        r",\s+(?:" + US_STATES + r")(?:\s+\d{5})?\b",                       # ", ST 12345" (city found leftwards)
+        r"\+\d{1,2}[\s.-]?\(?\d" + _PHONE_REST,                             # +1 512-555-0142
+        r"\(\d" + _PHONE_REST,                                              # (512) 555-0142
+    ]
+    # 512-555-0142: one branch per leading digit keeps the literal-prefix skip
+    + [digit + _PHONE_REST.replace(r"\)?", "", 1) for digit in "0123456789"]
+    + [rf"\.com/(?<=\W{host}\.com/){path}" for host, (_, path) in SOCIAL_PATHS.items()]
+))
+
+# Finishing patterns around an anchor
+EMAIL_LOCAL_REVERSED = re.compile(r"[a-zA-Z0-9._%+-]{1,64}")
+EMAIL_DOMAIN = re.compile(r"[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+CITY_REVERSED = re.compile(r"[a-z]+[A-Z](?:\s+[a-z]+[A-Z])*")
+
+# Path segments that are share/intent widgets, not a company's profile
+SOCIAL_NOISE = {"sharer", "sharer.php", "share", "intent", "plugins", "tr", "dialog", "home", "login", "watch"}
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".svg", ".gif", ".webp", ".avif", ".ico")
+PLACEHOLDER_DOMAINS = ("example.com", "example.org", "domain.com", "email.com", "test.com", "yourdomain.com",
+                       "yoursite.com", "company.com", "sentry.io", "wixpress.com", "sentry-next.wixpress.com")
+NOREPLY_PREFIXES = ("noreply", "no-reply", "donotreply", "do-not-reply", "mailer-daemon")
+
+CONFIDENCE_RANK = {"low": 1, "medium": 2, "high": 3}
+
+# Looser phone form (separators optional) for short listing lines with no markup around them
+LISTING_PHONE = re.compile(r"(?:\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+
+# "Fax: 512.555.0198" / "Telefax: +49 ..." right before a plain-text number
+FAX_LABEL = re.compile(r"fax\s*[:.#-]?\s*$", re.I)
+
+NON_DIGIT = re.compile(r"\D")
+RETINA_ASSET = re.compile(r"\d+x")
+
+
+class ContactEntity:
+    """One extracted contact: kind is 'email' | 'phone' | 'social' | 'address'."""
+
+    __slots__ = ("kind", "value", "start", "end", "confidence", "platform")
+
+    def __init__(self, kind: str, value: str, start: int, end: int, confidence: str, platform: Optional[str] = None):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.confidence = confidence
+        self.platform = platform
+
+    def __repr__(self):
+        return f"ContactEntity({self.kind}={self.value!r} @{self.start} {self.confidence})"
+
+
+def extract_contacts(document: str, site_domain: Optional[str] = None) -> List[ContactEntity]:
+    """
+    All contact entities in `document`, in document order (duplicates included).
+
+    Args:
+        document: Raw HTML or plain text
+        site_domain: The company's own domain ('acme.com'); emails on it rank high
+    """
+    site_domain = (site_domain or "").lower().removeprefix("www.")
+    entities = []
+    for match in SCANNER.finditer(document):
+        anchor = match.group()
+        start, end = match.span()
+        first = anchor[0]
+
+        if first in "@%&":
+            local = EMAIL_LOCAL_REVERSED.match(document[max(0, start - 64):start][::-1])
+            domain = EMAIL_DOMAIN.match(document, end)
+            if not local or not domain:
+                continue
+            start -= local.end()
+            email = _clean_email(document[start:domain.end()])
+            if email:
+                from_link = document[max(0, start - 7):start].lower() == "mailto:"
+                entities.append(ContactEntity("email", email, start, domain.end(), _email_confidence(email, from_link, site_domain)))
+        elif first == ":":
+            raw = anchor[1:]
+            if 10 <= len(NON_DIGIT.sub("", raw)) <= 15:
+                entities.append(ContactEntity("phone", raw.strip(), start + 1, end, "high"))
+        elif first == ",":
+            city = CITY_REVERSED.match(document[max(0, start - 60):start][::-1])
+            if city:
+                start -= city.end()
+                if start == 0 or not document[start - 1].isalpha():
+                    entities.append(ContactEntity("address", document[start:end], start, end, "medium"))
+        elif first == ".":
+            host = next(h for h in SOCIAL_PATHS if document.endswith(h, 0, start))
+            platform = SOCIAL_PATHS[host][0]
+            handle = anchor.rstrip(".").split("/")[-1].lower()
+            if handle not in SOCIAL_NOISE:
+                start -= len(host)
+                entities.append(ContactEntity("social", "https://" + document[start:end].rstrip("."), start, end, "medium", platform))
+        else:
+            # Phone numbers glued to other digits/words are IDs, not phones
+            if start and (document[start - 1].isalnum() or document[start - 1] in "/_"):
+                continue
+            if FAX_LABEL.search(document, max(0, start - 12), start):
+                continue
+            if 10 <= len(NON_DIGIT.sub("", anchor)) <= 15:
+                entities.append(ContactEntity("phone", anchor.strip(), start, end, "medium"))
+    return entities
+
+
+def summarize(entities: List[ContactEntity]) -> Dict:
+    """
+    Deduplicated view for lead fields: emails / phones (best confidence first),
+    the first profile per social platform, the first address.
+    """
+    best: Dict[tuple, ContactEntity] = {}
+    for entity in entities:
+        if entity.kind == "phone":
+            key = (entity.kind, NON_DIGIT.sub("", entity.value)[-10:])  # +15125550142 == (512) 555-0142
+        else:
+            key = (entity.kind, entity.value.lower())
+        current = best.get(key)
+        if current is None or CONFIDENCE_RANK[entity.confidence] > CONFIDENCE_RANK[current.confidence]:
+            best[key] = entity
+
+    def ranked(kind):
+        found = [e for e in best.values() if e.kind == kind]
+        found.sort(key=lambda e: (-CONFIDENCE_RANK[e.confidence], e.start))
+        return found
+
+    socials = {}
+    for entity in sorted((e for e in best.values() if e.kind == "social"), key=lambda e: e.start):
+        socials.setdefault(entity.platform, entity.value)
+    addresses = ranked("address")
+    # A full "City, ST 12345" beats a bare "City, ST"
+    addresses.sort(key=lambda e: not e.value[-1].isdigit())
+    return {
+        "emails": [e.value for e in ranked("email")],
+        "phones": [e.value for e in ranked("phone")],
+        "socials": socials,
+        "address": addresses[0].value if addresses else None,
+    }
+
+
+def _clean_email(raw: str) -> Optional[str]:
+    email = urllib.parse.unquote(html_lib.unescape(raw)).strip().strip(".").lower()
+    if "@" not in email or email.endswith(IMAGE_SUFFIXES):
+        return None
+    local, _, domain = email.rpartition("@")
+    if not local or "." not in domain:
+        return None
+    if any(domain == d or domain.endswith("." + d) for d in PLACEHOLDER_DOMAINS):
+        return None
+    # Retina asset names that slipped past the suffix check (icon@2x.min.js)
+    if RETINA_ASSET.fullmatch(domain.split(".")[0]):
+        return None
+    return email
+
+
+def _email_confidence(email: str, from_link: bool, site_domain: str) -> str:
+    if email.startswith(NOREPLY_PREFIXES):
+        return "low"
+    domain = email.rpartition("@")[2]
+    if from_link or (site_domain and (domain == site_domain or domain.endswith("." + site_domain))):
+        return "high"
+    return "medium"
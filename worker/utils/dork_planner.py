@@ -0,0 +1,116 @@
+"""
+CLARITY PEARL - DORK QUERY PLANNER
+Merges per-site profile dorks for one company into combined SERP calls.
+
+Instead of one `site:x "Company"` query per platform, targets are grouped into
+`(site:a OR site:b OR site:c) "Company"` queries and each result is routed back
+to the target whose domain/path it belongs to. A target is re-queried on its
+own only when its group's page came back full (it may have been crowded out)
+or the combined query failed.
+"""
+
+import asyncio
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# Sites per combined query (Google caps queries at 32 words)
+GROUP_SIZE = 4
+# A combined page this full may hide targets below the fold
+SATURATION = 10
+
+
+class DorkPlanner:
+    """
+    Batched site lookups on top of a BaseDorkEngine.
+    """
+
+    def __init__(self, dork_engine, group_size: int = GROUP_SIZE):
+        self.dork_engine = dork_engine
+        self.group_size = group_size
+        self.combined_calls = 0
+        self.single_calls = 0
+
+    async def lookup(self, company_name: str, targets: Dict[str, Tuple[str, str]]) -> Dict[str, List[Dict]]:
+        """
+        Find each target's results for a company with as few SERP calls as possible.
+
+        Args:
+            company_name: Company to look up (quoted in the query)
+            targets: key -> (site filter e.g. 'capterra.com/p', extra terms used for single queries)
+
+        Returns:
+            key -> list of results on that site (best first, possibly empty)
+        """
+        keys = list(targets)
+        groups = [keys[i:i + self.group_size] for i in range(0, len(keys), self.group_size)]
+        routed = await asyncio.gather(*[self._run_group(company_name, g, targets) for g in groups])
+
+        hits: Dict[str, List[Dict]] = {}
+        for group_hits in routed:
+            hits.update(group_hits)
+        return hits
+
+    async def _run_group(self, company_name, group, targets):
+        if len(group) == 1:
+            key = group[0]
+            return {key: await self._run_single(company_name, key, targets[key])}
+
+        sites = " OR ".join(f"site:{targets[key][0]}" for key in group)
+        query = f'({sites}) "{company_name}"'
+        self.combined_calls += 1
+        try:
+            results = await self.dork_engine.run_dork_search(query, "")
+            failed = False
+        except Exception as e:
+            print(f"   [DorkPlanner] Combined query failed ({e}). Falling back to single queries.")
+            results, failed = [], True
+
+        hits = {key: [] for key in group}
+        real = 0
+        for res in results or []:
+            url = res.get('source_url') or res.get('link') or ""
+            key = self._route(url, group, targets)
+            if key:
+                hits[key].append(res)
+                real += 1
+            elif res.get('verified', True):
+                real += 1
+
+        missing = [key for key in group if not hits[key]]
+        if missing and (failed or real >= SATURATION):
+            singles = await asyncio.gather(*[self._run_single(company_name, key, targets[key]) for key in missing])
+            for key, res in zip(missing, singles):
+                hits[key] = res
+        return hits
+
+    async def _run_single(self, company_name, key, target):
+        site, terms = target
+        self.single_calls += 1
+        query = f'site:{site} "{company_name}" {terms}'.strip()
+        try:
+            results = await self.dork_engine.run_dork_search(query, "")
+        except Exception as e:
+            print(f"   [DorkPlanner] {key} query failed: {e}")
+            return []
+        return [res for res in results or [] if self._matches(res.get('source_url') or res.get('link') or "", site)]
+
+    def _route(self, url, group, targets):
+        for key in group:
+            if self._matches(url, targets[key][0]):
+                return key
+        return None
+
+    @staticmethod
+    def _matches(url: str, site: str) -> bool:
+        """True if url lives under a site filter like 'bbb.org/us' (subdomains included)."""
+        if not url:
+            return False
+        parts = urlsplit(url if "://" in url else f"https://{url}")
+        host = (parts.hostname or "").lower()
+        domain, _, path = site.lower().partition("/")
+        if host != domain and not host.endswith("." + domain):
+            return False
+        return not path or parts.path.lower().lstrip("/").startswith(path)
+
+    def get_stats(self) -> Dict:
+        return {"combined_calls": self.combined_calls, "single_calls": self.single_calls}
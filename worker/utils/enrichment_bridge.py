@@ -2,6 +2,16 @@ import asyncio
 import os
 # from scrapers.linkedin_engine import LinkedInEngine # Lazy-loaded in __init__
 from utils.email_verifier import email_verifier
+from utils.memory_governor import memory_governor
+from utils.layer_scheduler import Layer, LayerScheduler
+from utils.company_cache import company_cache, WEBSITE_LAYERS
+from utils.contact_extractor import extract_contacts, summarize
+from utils.website_resolver import website_resolver
+from utils.layer_stats import layer_stats
+from utils.time_budget import get_budget
+
+# Below this much job budget, leads are no longer started (they're delivered as-is)
+MIN_LEAD_SECONDS = 20
 
 class EnrichmentBridge:
     """
@@ -99,14 +109,18 @@ class EnrichmentBridge:
             
         return lead
 
-    async def enrich_business_leads(self, leads, target_industry_keywords=None, negative_keywords=None):
+    async def enrich_business_leads(self, leads, target_industry_keywords=None, negative_keywords=None, goal=None):
         """
         SOVEREIGN INTELLIGENCE: 13-Layer Deep Enrichment
-        Activates ALL layers to transform basic leads into premium data assets
+        Activates ALL layers to transform basic leads into premium data assets.
+        Leads are enriched K at a time on a pool of pages from the same browser
+        context (K from ENRICHMENT_CONCURRENCY, capped by the memory governor)
+        and yielded in completion order. With an EnrichmentGoal (the job's
+        target fields), each lead stops as soon as the goal is met.
+
+        When the job budget runs out, in-flight work is cancelled and every
+        lead not yet yielded is yielded as-is (partially enriched at best).
         """
-        from scrapers.website_engine import WebsiteEngine
-        website_engine = WebsiteEngine(self.page)
-        
         print(f"🌉 Bridge: Enriching {len(leads)} leads with 13-Layer Sovereignty...")
         
         # Default Keywords if none provided
@@ -115,314 +129,426 @@ class EnrichmentBridge:
         if not negative_keywords:
             negative_keywords = ["trucking", "logistics", "shipping", "freight", "loan", "lending", "insurance", "real estate", "cleaning"]
 
+        if not leads:
+            return
+
+        requested = max(1, int(os.getenv("ENRICHMENT_CONCURRENCY", "3")))
+        concurrency = min(memory_governor.max_concurrency(requested), len(leads))
+        if concurrency > 1:
+            print(f"🌉 Bridge: Page pool of {concurrency} (memory: {memory_governor.get_status()})")
+
+        pending = asyncio.Queue()
         for lead in leads:
-            # Check for cancellation signal (if possible, though bridge doesn't have job_id here)
-            # We'll rely on the controller to stop iterating
-            
-            company_name = lead.get('name', '').strip()
+            pending.put_nowait(lead)
+        finished = asyncio.Queue()
+        extra_pages = []
+        budget = get_budget()
+        returned = set()  # ids of leads the workers are done with
 
-            
-            # PHASE 16 HARDENING: Ignore junk leads without names
-            if not company_name:
-                print(f"🌉 Bridge: Skipping lead with empty name")
-                continue
-
-            # --- THE BOUNCER (Name Filter) ---
-            low_name = company_name.lower()
-            if any(neg in low_name for neg in negative_keywords):
-                print(f"🌉 Bouncer: Flagging '{company_name}' as IRRELEVANT")
-                lead['status'] = 'IRRELEVANT'
-                enriched_leads.append(lead)
-                continue
-
-            # ========== LAYER 1: DISCOVERY (Preserve existing data) ==========
-            # Phone, Address, Category already collected from Google Maps
-            # CRITICAL: Don't overwrite, just ensure fields exist
-            if not lead.get('phone') and lead.get('phones'):
-                lead['phone'] = lead['phones'][0] if isinstance(lead['phones'], list) else lead['phones']
-            
-            # --- WEBSITE DISCOVERY ---
-            if not lead.get('website') or "google" in str(lead.get('website')).lower():
-                found_url = await website_engine.find_company_website(company_name)
-                if found_url:
-                    lead['website'] = found_url
-
-            # --- WEBSITE CONTACT EXTRACTION (emails, phones, socials) ---
-            if lead.get('website'):
-                print(f"   ⛏️ Layer 1: Mining contacts from {lead['website']}...")
+        async def worker(slot):
+            page = self.page
+            if slot:
+                if memory_governor.under_pressure():
+                    return
                 try:
-                    scrape_results = await website_engine.scrape(lead['website'])
-                    if scrape_results:
-                        site_data = scrape_results[0]
-                        # Merge extracted data
-                        if site_data.get('emails'):
-                            lead['emails'] = list(set(lead.get('emails', []) + site_data['emails']))
-                            if not lead.get('email') and lead['emails']:
-                                lead['email'] = lead['emails'][0]
-                        
-                        if site_data.get('phones'):
-                            lead['phones'] = list(set(lead.get('phones', []) + site_data['phones']))
-                            if not lead.get('phone') and lead['phones']:
-                                lead['phone'] = lead['phones'][0]
-                                
-                        if site_data.get('socials'):
-                            current_socials = lead.get('socials', {})
-                            current_socials.update(site_data['socials'])
-                            lead['socials'] = current_socials
+                    page = await self.page.context.new_page()
+                    extra_pages.append(page)
                 except Exception as e:
-                    print(f"   ⚠️ Website mining error: {e}")
-
-            # ========== EMAIL PATTERN GENERATION (High-Yield Fallback) ==========
-            # If we have a website but NO email, generate standard patterns
-            if lead.get('website') and not lead.get('email'):
+                    print(f"   ⚠️ Bridge: Could not open pool page {slot}: {e}")
+                    return
+            while True:
                 try:
-                    import urllib.parse
-                    domain = urllib.parse.urlparse(lead['website']).netloc.replace('www.', '')
-                    if domain:
-                        # Generate "educated guess" patterns
-                        patterns = [
-                            f"info@{domain}",
-                            f"contact@{domain}",
-                            f"hello@{domain}",
-                            f"support@{domain}"
-                        ]
-                        # Assign the first one as a high-probability contact
-                        lead['email'] = patterns[0]
-                        lead['email_source'] = "pattern_generated"
-                        lead['email_confidence'] = "Medium"
-                        print(f"   📧 Generated email pattern: {lead['email']}")
-                except: pass
-
-            # ========== LAYER 2: REPUTATION (Clutch, G2, Trustpilot) ==========
-            print(f"   ⭐ Layer 2: Checking reputation for {company_name}...")
-            try:
-                from scrapers.reputation_engine import ReputationEngine
-                rep_engine = ReputationEngine(self.page)
-                rep_data = await rep_engine.scrape(company_name)
-                if rep_data and len(rep_data) > 0:
-                    lead['clutch_rating'] = rep_data[0].get('clutch_rating')
-                    lead['g2_rating'] = rep_data[0].get('g2_rating')
-                    lead['trustpilot_rating'] = rep_data[0].get('trustpilot_rating')
-                    lead['review_count'] = rep_data[0].get('review_count')
-                    lead['reputation_score'] = rep_data[0].get('reputation_score')
-                    print(f"   ✅ Layer 2: Found reputation data")
-            except Exception as e:
-                print(f"   ⚠️ Layer 2 skip: {e}")
-
-            # ========== LAYER 3: CAPITAL (SEC EDGAR, Crunchbase) ==========
-            if self.layer_config.get(3, False):
-                print(f"   💰 Layer 3: Checking funding for {company_name}...")
+                    lead = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if budget.remaining() < MIN_LEAD_SECONDS:
+                    # Not worth starting: hand it back untouched below
+                    await pending.put(lead)
+                    return
                 try:
-                    from scrapers.capital_growth_engine import CapitalGrowthEngine
-                    capital_engine = CapitalGrowthEngine(self.page)
-                    capital_data = await capital_engine.scrape(company_name)
-                    if capital_data and len(capital_data) > 0:
-                        lead['funding_stage'] = capital_data[0].get('funding_stage')
-                        lead['total_funding'] = capital_data[0].get('total_funding')
-                        lead['last_funding_date'] = capital_data[0].get('last_funding_date')
-                        lead['investor_count'] = capital_data[0].get('investor_count')
-                        print(f"   ✅ Layer 3: Found funding data")
+                    result = await self._enrich_lead(lead, page, target_industry_keywords, negative_keywords, goal)
                 except Exception as e:
-                    print(f"   ⚠️ Layer 3 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 3: DISABLED (zero-cost mode)")
+                    print(f"   ⚠️ Bridge: Enrichment failed for {lead.get('name')}: {e}")
+                    result = lead
+                returned.add(id(lead))
+                await finished.put(result)
+                # Shed pool pages under memory pressure; slot 0 keeps draining the queue
+                if slot and memory_governor.under_pressure():
+                    print(f"   🧠 Bridge: Memory pressure, closing pool page {slot}")
+                    return
 
-            # ========== LAYER 4: TECHNOGRAPHICS (BuiltWith patterns) ==========
-            if self.layer_config.get(4, False) and lead.get('website'):
-                print(f"   🔧 Layer 4: Detecting tech stack...")
-                try:
-                    from scrapers.tech_stack_engine import TechStackEngine
-                    tech_engine = TechStackEngine(self.page)
-                    tech_data = await tech_engine.scrape(lead['website'])
-                    if tech_data and len(tech_data) > 0:
-                        lead['tech_stack'] = tech_data[0].get('technologies', [])
-                        lead['cms_platform'] = tech_data[0].get('cms')
-                        lead['ecommerce_platform'] = tech_data[0].get('ecommerce')
-                        print(f"   ✅ Layer 4: Detected {len(lead.get('tech_stack', []))} technologies")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 4 skip: {e}")
-            elif not self.layer_config.get(4, False):
-                print(f"   ⏭️ Layer 4: DISABLED (zero-cost mode)")
+        workers = [asyncio.create_task(worker(slot)) for slot in range(concurrency)]
+        all_workers = asyncio.gather(*workers, return_exceptions=True)
+        try:
+            for _ in range(len(leads)):
+                getter = asyncio.ensure_future(finished.get())
+                # Wake up on the next result, the deadline, or every worker having stopped early
+                await asyncio.wait({getter, all_workers}, timeout=budget.wait_timeout(),
+                                   return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                result = getter.result()
+                if result is not None:
+                    yield result
 
-            # ========== LAYER 5: INTENT SIGNALS (Job Boards) ==========
-            if self.layer_config.get(5, False):
-                print(f"   🎯 Layer 5: Checking hiring activity...")
+            # All done, deadline hit or no worker left: stop in-flight layers, deliver what we have
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            while not finished.empty():
+                result = finished.get_nowait()
+                if result is not None:
+                    yield result
+            leftovers = [lead for lead in leads if id(lead) not in returned and (lead.get('name') or '').strip()]
+            if leftovers:
+                print(f"   ⏳ Bridge: Budget exhausted, delivering {len(leftovers)} leads without full enrichment")
+                budget.note_skip("enrichment_leads", len(leftovers))
+            for lead in leftovers:
+                lead['enrichment_status'] = 'deadline'
+                yield lead
+        finally:
+            # Also runs when the consumer stops early (cancelled job)
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for page in extra_pages:
                 try:
-                    from scrapers.intent_signal_engine import IntentSignalEngine
-                    intent_engine = IntentSignalEngine(self.page)
-                    intent_data = await intent_engine.scrape(company_name)
-                    if intent_data and len(intent_data) > 0:
-                        lead['actively_hiring'] = intent_data[0].get('is_hiring')
-                        lead['open_positions'] = intent_data[0].get('job_count')
-                        lead['recent_job_titles'] = intent_data[0].get('job_titles', [])
-                        print(f"   ✅ Layer 5: Found {lead.get('open_positions', 0)} open positions")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 5 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 5: DISABLED (zero-cost mode)")
+                    await page.close()
+                except Exception:
+                    pass
+            layer_stats.flush()
 
-            # ========== LAYER 6: INNOVATION (USPTO, Google Patents) ==========
-            if self.layer_config.get(6, False):
-                print(f"   💡 Layer 6: Searching patents...")
-                try:
-                    from scrapers.patent_intelligence_engine import PatentIntelligenceEngine
-                    patent_engine = PatentIntelligenceEngine(self.page)
-                    patent_data = await patent_engine.scrape(company_name)
-                    if patent_data and len(patent_data) > 0:
-                        lead['patent_count'] = len(patent_data)
-                        lead['recent_patents'] = [p.get('title') for p in patent_data[:3] if p.get('title')]
-                        lead['innovation_score'] = min(len(patent_data) * 10, 100)
-                        print(f"   ✅ Layer 6: Found {lead['patent_count']} patents")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 6 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 6: DISABLED (USPTO API exhausted)")
+    async def _enrich_lead(self, lead, page, target_industry_keywords, negative_keywords, goal=None):
+        """
+        Runs the enabled layers for one lead on the given page (only the ones the goal needs, if any).
+        Returns the lead, or None if it should be dropped.
+        """
+        company_name = lead.get('name', '').strip()
+        
+        # PHASE 16 HARDENING: Ignore junk leads without names
+        if not company_name:
+            print(f"🌉 Bridge: Skipping lead with empty name")
+            return None
 
-            # ========== LAYER 8: TRADE DATA (USA Trade Online) ==========
-            if self.layer_config.get(8, False):
-                print(f"   🚢 Layer 8: Checking import/export...")
-                try:
-                    from scrapers.trade_data_engine import TradeDataEngine
-                    trade_engine = TradeDataEngine(self.page)
-                    trade_data = await trade_engine.scrape(company_name)
-                    if trade_data and len(trade_data) > 0:
-                        lead['imports_exports'] = True
-                        lead['trade_volume_usd'] = trade_data[0].get('trade_volume')
-                        lead['top_trade_partners'] = trade_data[0].get('partners', [])
-                        print(f"   ✅ Layer 8: Found trade data")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 8 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 8: DISABLED (Census API exhausted)")
+        # --- THE BOUNCER (Name Filter) ---
+        low_name = company_name.lower()
+        if any(neg in low_name for neg in negative_keywords):
+            print(f"🌉 Bouncer: Flagging '{company_name}' as IRRELEVANT")
+            lead['status'] = 'IRRELEVANT'
+            return lead
 
-            # ========== LAYER 9: EVENTS (Eventbrite, Meetup) ==========
-            if self.layer_config.get(9, False):
-                print(f"   📅 Layer 9: Finding event participation...")
-                try:
-                    from scrapers.events_networking_engine import EventsNetworkingEngine
-                    events_engine = EventsNetworkingEngine(self.page)
-                    events_data = await events_engine.scrape(company_name)
-                    if events_data and len(events_data) > 0:
-                        lead['event_participation_count'] = len(events_data)
-                        lead['recent_events'] = [e.get('event_name') for e in events_data[:3] if e.get('event_name')]
-                        print(f"   ✅ Layer 9: Found {len(events_data)} events")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 9 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 9: DISABLED (0% success rate)")
+        # ========== LAYER 1: DISCOVERY (Preserve existing data) ==========
+        # Phone, Address, Category already collected from Google Maps
+        # CRITICAL: Don't overwrite, just ensure fields exist
+        if not lead.get('phone') and lead.get('phones'):
+            lead['phone'] = lead['phones'][0] if isinstance(lead['phones'], list) else lead['phones']
 
-            # ========== LAYER 11: PUBLIC SECTOR (SAM.gov, USAspending) ==========
-            if self.layer_config.get(11, False):
-                print(f"   🏛️ Layer 11: Checking gov contracts...")
-                try:
-                    from scrapers.government_contracts_engine import GovernmentContractsEngine
-                    gov_engine = GovernmentContractsEngine(self.page)
-                    gov_data = await gov_engine.scrape(company_name)
-                    if gov_data and len(gov_data) > 0:
-                        lead['government_contractor'] = True
-                        lead['contract_value_total'] = gov_data[0].get('total_value')
-                        lead['contract_count'] = len(gov_data)
-                        print(f"   ✅ Layer 11: Found {len(gov_data)} gov contracts")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 11 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 11: DISABLED (SAM.gov broken)")
+        # Fresh layers from earlier jobs (any org) are reused; only stale/missing ones run
+        cache_entry = await company_cache.open(lead)
+        await self._renew_if_site_unchanged(lead, page, cache_entry)
 
-            # ========== LAYER 13: ACADEMIC (PubMed, arXiv) ==========
-            if self.layer_config.get(13, False):
-                print(f"   🔬 Layer 13: Searching research papers...")
-                try:
-                    from scrapers.academic_research_engine import AcademicResearchEngine
-                    academic_engine = AcademicResearchEngine(self.page)
-                    academic_data = await academic_engine.scrape(company_name)
-                    if academic_data and len(academic_data) > 0:
-                        lead['research_papers_count'] = len(academic_data)
-                        lead['recent_publications'] = [p.get('title') for p in academic_data[:3] if p.get('title')]
-                        print(f"   ✅ Layer 13: Found {len(academic_data)} publications")
-                except Exception as e:
-                    print(f"   ⚠️ Layer 13 skip: {e}")
-            else:
-                print(f"   ⏭️ Layer 13: DISABLED (arXiv noise)")
+        async def on_website():
+            # Website discovered this run: reuse (and revalidate) what's cached for its domain
+            if cache_entry.follow_website():
+                await self._renew_if_site_unchanged(lead, page, cache_entry)
 
-            # === UNIVERSAL X-RAY (HYDRA ENHANCED) ===
-            # Aggressive multi-platform dorking to find Decision Makers & Direct Emails
-            # Strategy: "{Company}" ("CEO" OR "Founder") ("email" OR "gmail.com" OR "contact") -site:job_board
-            
-            print(f"   🦴 Engaging Universal X-Ray for {company_name}...")
-            from utils.hydra_client import hydra_client
+        # Independent layers run concurrently; only contacts/patterns/tech wait on the website
+        await LayerScheduler(self._build_layers(), layer_stats).run(lead, page, cache_entry, goal, on_website)
+        cache_entry.flush()
+
+        # Calculate enrichment depth
+        layer_count = 0
+        if lead.get('phone') or lead.get('email'): layer_count += 1  # Layer 1
+        if lead.get('reputation_score'): layer_count += 1  # Layer 2
+        if lead.get('funding_stage'): layer_count += 1  # Layer 3
+        if lead.get('tech_stack'): layer_count += 1  # Layer 4
+        if lead.get('actively_hiring'): layer_count += 1  # Layer 5
+        if lead.get('patent_count'): layer_count += 1  # Layer 6
+        if lead.get('imports_exports'): layer_count += 1  # Layer 8
+        if lead.get('event_participation_count'): layer_count += 1  # Layer 9
+        if lead.get('government_contractor'): layer_count += 1  # Layer 11
+        if lead.get('research_papers_count'): layer_count += 1  # Layer 13
+        
+        lead['enrichment_layers_active'] = layer_count
+        lead['status'] = 'SOVEREIGN' if layer_count >= 6 else 'VERIFIED' if layer_count >= 3 else 'PARTIAL'
+        
+        print(f"   🎯 {company_name}: {layer_count}/13 layers activated - {lead['status']} ({sum(lead['layer_timings'].values()):.1f}s of layer time)")
+        return lead
+
+    def _build_layers(self):
+        """
+        The per-lead layer graph. Layers switched off in zero_cost.env are left out;
+        the optional ones are adaptive (the yield policy may pause them per lead).
+        """
+        cfg = self.layer_config
+        layers = [
+            Layer("website_discovery", self._layer_website_discovery, provides=("website", "website_source"), timeout=45),
+            Layer("contacts", self._layer_contacts, after=("website_discovery",), needs=("website",),
+                  provides=("email", "emails", "phone", "phones", "socials", "email_confidence"), timeout=45),
+            Layer("xray", self._layer_xray, provides=("decision_maker_name", "decision_maker_title", "decision_maker_email",
+                                                       "decision_maker_linkedin"), timeout=20),
+            # Decides the main email once both contacts and xray are done, whichever finished first
+            Layer("email_patterns", self._layer_email_patterns, after=("contacts", "xray"),
+                  provides=("email", "email_source", "email_confidence"), timeout=5),
+        ]
+        if cfg.get(2, False):
+            layers.append(Layer("reputation", self._layer_reputation, provides=("clutch_rating", "g2_rating", "trustpilot_rating", "review_count", "reputation_score"), timeout=60, adaptive=True))
+        if cfg.get(3, False):
+            layers.append(Layer("capital", self._layer_capital, provides=("funding_stage", "total_funding", "last_funding_date", "investor_count"), timeout=30, uses_page=True, adaptive=True))
+        if cfg.get(4, False):
+            layers.append(Layer("tech_stack", self._layer_tech_stack, after=("website_discovery",), needs=("website",),
+                                provides=("tech_stack", "cms_platform", "ecommerce_platform"), timeout=30, adaptive=True))
+        if cfg.get(5, False):
+            layers.append(Layer("hiring", self._layer_hiring, provides=("actively_hiring", "open_positions", "recent_job_titles"), timeout=30, adaptive=True))
+        if cfg.get(6, False):
+            layers.append(Layer("patents", self._layer_patents, provides=("patent_count", "recent_patents", "innovation_score"), timeout=30, uses_page=True, adaptive=True))
+        if cfg.get(8, False):
+            layers.append(Layer("trade", self._layer_trade, provides=("imports_exports", "trade_volume_usd", "top_trade_partners"), timeout=20, adaptive=True))
+        if cfg.get(9, False):
+            layers.append(Layer("events", self._layer_events, provides=("event_participation_count", "recent_events"), timeout=30, uses_page=True, adaptive=True))
+        if cfg.get(11, False):
+            layers.append(Layer("gov", self._layer_gov, provides=("government_contractor", "contract_value_total", "contract_count"), timeout=30, uses_page=True, adaptive=True))
+        if cfg.get(13, False):
+            layers.append(Layer("academic", self._layer_academic, provides=("research_papers_count", "recent_publications"), timeout=20, adaptive=True))
+        return layers
+
+    async def _renew_if_site_unchanged(self, lead, page, cache_entry):
+        """
+        Stale website-derived layers are kept (TTL restarted) when conditional GETs
+        show the company's site hasn't changed, so they aren't recomputed.
+        """
+        stale = [layer for layer in WEBSITE_LAYERS if cache_entry.stale(layer)]
+        if not stale or not lead.get('website'):
+            return
+        from scrapers.website_engine import WebsiteEngine
+        if await WebsiteEngine(page).revalidate(lead['website']):
+            for layer in stale:
+                cache_entry.renew(layer)
+            print(f"   💤 Site unchanged: reusing {', '.join(stale)}")
+
+    # --- LAYERS (each mutates the lead in place) ---
+
+    async def _layer_website_discovery(self, lead, page):
+        """Cheap tiers first (cache, seen domains, slug probes, Hydra); the browser crawl leases a page last."""
+        if not lead.get('website') or "google" in str(lead.get('website')).lower():
+            found_url, source = await website_resolver.resolve(lead['name'], page)
+            if found_url:
+                lead['website'] = found_url
+                lead['website_source'] = source
+
+    async def _layer_contacts(self, lead, page):
+        """Website contact extraction (emails, phones, socials). HTTP first; leases a browser page only as fallback."""
+        from scrapers.website_engine import WebsiteEngine
+        print(f"   ⛏️ Layer 1: Mining contacts from {lead['website']}...")
+        scrape_results = await WebsiteEngine(page).scrape(lead['website'])
+        if scrape_results:
+            site_data = scrape_results[0]
+            lead['contact_fetch_tier'] = site_data.get('fetch_tier')
+            # Merge extracted data
+            if site_data.get('emails'):
+                lead['emails'] = list(set(lead.get('emails', []) + site_data['emails']))
+                if not lead.get('email'):
+                    # Site emails come best-confidence first
+                    lead['email'] = site_data['emails'][0]
+                    lead['email_confidence'] = site_data.get('contact_confidence', {}).get(lead['email'], 'high')
             
-            # 1. The "Golden Query" - Attempts to get Name + Title + Email in one shot
-            # Uses Serper/Hydra to scan snippets from LinkedIn, Facebook, Instagram, or direct site matches
-            xray_query = f'"{company_name}" ("CEO" OR "Founder" OR "Owner" OR "Director") ("@gmail.com" OR "@yahoo.com" OR "email" OR "contact")'
+            if site_data.get('phones'):
+                lead['phones'] = list(set(lead.get('phones', []) + site_data['phones']))
+                if not lead.get('phone') and lead['phones']:
+                    lead['phone'] = lead['phones'][0]
+                    
+            if site_data.get('socials'):
+                current_socials = lead.get('socials', {})
+                current_socials.update(site_data['socials'])
+                lead['socials'] = current_socials
+
+    async def _layer_email_patterns(self, lead, page):
+        """High-yield fallback: NO email from the site -> X-Ray's direct contact, else standard patterns."""
+        if lead.get('email'):
+            return
+        if lead.get('decision_maker_email'):
+            # Search snippet, not the company's own site
+            lead['email'] = lead['decision_maker_email']
+            lead['email_source'] = "xray"
+            lead['email_confidence'] = "Medium"
+            return
+        if not lead.get('website'):
+            return
+        import urllib.parse
+        domain = urllib.parse.urlparse(lead['website']).netloc.replace('www.', '')
+        if domain:
+            # Generate "educated guess" patterns
+            patterns = [
+                f"info@{domain}",
+                f"contact@{domain}",
+                f"hello@{domain}",
+                f"support@{domain}"
+            ]
+            # Assign the first one as a high-probability contact
+            lead['email'] = patterns[0]
+            lead['email_source'] = "pattern_generated"
+            lead['email_confidence'] = "Medium"
+            print(f"   📧 Generated email pattern: {lead['email']}")
+
+    async def _layer_reputation(self, lead, page):
+        """LAYER 2: REPUTATION (Clutch, G2, Trustpilot)."""
+        company_name = lead['name'].strip()
+        print(f"   ⭐ Layer 2: Checking reputation for {company_name}...")
+        from scrapers.reputation_engine import ReputationEngine
+        rep_data = await ReputationEngine(page).scrape(company_name)
+        if rep_data and len(rep_data) > 0:
+            lead['clutch_rating'] = rep_data[0].get('clutch_rating')
+            lead['g2_rating'] = rep_data[0].get('g2_rating')
+            lead['trustpilot_rating'] = rep_data[0].get('trustpilot_rating')
+            lead['review_count'] = rep_data[0].get('review_count')
+            lead['reputation_score'] = rep_data[0].get('reputation_score')
+            print(f"   ✅ Layer 2: Found reputation data")
+
+    async def _layer_capital(self, lead, page):
+        """LAYER 3: CAPITAL (SEC EDGAR, Crunchbase)."""
+        company_name = lead['name'].strip()
+        print(f"   💰 Layer 3: Checking funding for {company_name}...")
+        from scrapers.capital_growth_engine import CapitalGrowthEngine
+        capital_data = await CapitalGrowthEngine(page).scrape(company_name)
+        if capital_data and len(capital_data) > 0:
+            lead['funding_stage'] = capital_data[0].get('funding_stage')
+            lead['total_funding'] = capital_data[0].get('total_funding')
+            lead['last_funding_date'] = capital_data[0].get('last_funding_date')
+            lead['investor_count'] = capital_data[0].get('investor_count')
+            print(f"   ✅ Layer 3: Found funding data")
+
+    async def _layer_tech_stack(self, lead, page):
+        """LAYER 4: TECHNOGRAPHICS (BuiltWith patterns)."""
+        print(f"   🔧 Layer 4: Detecting tech stack...")
+        from scrapers.tech_stack_engine import TechStackEngine
+        tech_data = await TechStackEngine(page).scrape(lead['website'])
+        if tech_data and len(tech_data) > 0:
+            lead['tech_stack'] = tech_data[0].get('technologies', [])
+            lead['cms_platform'] = tech_data[0].get('cms')
+            lead['ecommerce_platform'] = tech_data[0].get('ecommerce')
+            print(f"   ✅ Layer 4: Detected {len(lead.get('tech_stack', []))} technologies")
+
+    async def _layer_hiring(self, lead, page):
+        """LAYER 5: INTENT SIGNALS (Job Boards)."""
+        print(f"   🎯 Layer 5: Checking hiring activity...")
+        from scrapers.intent_signal_engine import IntentSignalEngine
+        intent_data = await IntentSignalEngine(page).scrape(lead['name'].strip())
+        if intent_data and len(intent_data) > 0:
+            lead['actively_hiring'] = intent_data[0].get('is_hiring')
+            lead['open_positions'] = intent_data[0].get('job_count')
+            lead['recent_job_titles'] = intent_data[0].get('job_titles', [])
+            print(f"   ✅ Layer 5: Found {lead.get('open_positions', 0)} open positions")
+
+    async def _layer_patents(self, lead, page):
+        """LAYER 6: INNOVATION (USPTO, Google Patents)."""
+        print(f"   💡 Layer 6: Searching patents...")
+        from scrapers.patent_intelligence_engine import PatentIntelligenceEngine
+        patent_data = await PatentIntelligenceEngine(page).scrape(lead['name'].strip())
+        if patent_data and len(patent_data) > 0:
+            lead['patent_count'] = len(patent_data)
+            lead['recent_patents'] = [p.get('title') for p in patent_data[:3] if p.get('title')]
+            lead['innovation_score'] = min(len(patent_data) * 10, 100)
+            print(f"   ✅ Layer 6: Found {lead['patent_count']} patents")
+
+    async def _layer_trade(self, lead, page):
+        """LAYER 8: TRADE DATA (USA Trade Online)."""
+        print(f"   🚢 Layer 8: Checking import/export...")
+        from scrapers.trade_data_engine import TradeDataEngine
+        trade_data = await TradeDataEngine(page).scrape(lead['name'].strip())
+        if trade_data and len(trade_data) > 0:
+            lead['imports_exports'] = True
+            lead['trade_volume_usd'] = trade_data[0].get('trade_volume')
+            lead['top_trade_partners'] = trade_data[0].get('partners', [])
+            print(f"   ✅ Layer 8: Found trade data")
+
+    async def _layer_events(self, lead, page):
+        """LAYER 9: EVENTS (Eventbrite, Meetup)."""
+        print(f"   📅 Layer 9: Finding event participation...")
+        from scrapers.events_networking_engine import EventsNetworkingEngine
+        events_data = await EventsNetworkingEngine(page).scrape(lead['name'].strip())
+        if events_data and len(events_data) > 0:
+            lead['event_participation_count'] = len(events_data)
+            lead['recent_events'] = [e.get('event_name') for e in events_data[:3] if e.get('event_name')]
+            print(f"   ✅ Layer 9: Found {len(events_data)} events")
+
+    async def _layer_gov(self, lead, page):
+        """LAYER 11: PUBLIC SECTOR (SAM.gov, USAspending)."""
+        print(f"   🏛️ Layer 11: Checking gov contracts...")
+        from scrapers.government_contracts_engine import GovernmentContractsEngine
+        gov_data = await GovernmentContractsEngine(page).scrape(lead['name'].strip())
+        if gov_data and len(gov_data) > 0:
+            lead['government_contractor'] = True
+            lead['contract_value_total'] = gov_data[0].get('total_value')
+            lead['contract_count'] = len(gov_data)
+            print(f"   ✅ Layer 11: Found {len(gov_data)} gov contracts")
+
+    async def _layer_academic(self, lead, page):
+        """LAYER 13: ACADEMIC (PubMed, arXiv)."""
+        print(f"   🔬 Layer 13: Searching research papers...")
+        from scrapers.academic_research_engine import AcademicResearchEngine
+        academic_data = await AcademicResearchEngine(page).scrape(lead['name'].strip())
+        if academic_data and len(academic_data) > 0:
+            lead['research_papers_count'] = len(academic_data)
+            lead['recent_publications'] = [p.get('title') for p in academic_data[:3] if p.get('title')]
+            print(f"   ✅ Layer 13: Found {len(academic_data)} publications")
+
+    async def _layer_xray(self, lead, page):
+        """
+        UNIVERSAL X-RAY: Hydra dork for Decision Makers & Direct Emails (API only, no page).
+        """
+        # === UNIVERSAL X-RAY (HYDRA ENHANCED) ===
+        # Aggressive multi-platform dorking to find Decision Makers & Direct Emails
+        # Strategy: "{Company}" ("CEO" OR "Founder") ("email" OR "gmail.com" OR "contact") -site:job_board
+        
+        company_name = lead['name'].strip()
+        print(f"   🦴 Engaging Universal X-Ray for {company_name}...")
+        from utils.hydra_client import hydra_client
+        
+        # 1. The "Golden Query" - Attempts to get Name + Title + Email in one shot
+        # Uses Serper/Hydra to scan snippets from LinkedIn, Facebook, Instagram, or direct site matches
+        xray_query = f'"{company_name}" ("CEO" OR "Founder" OR "Owner" OR "Director") ("@gmail.com" OR "@yahoo.com" OR "email" OR "contact")'
+        
+        try:
+            # We ask for more results (num=10) to scan more snippets
+            xray_results = await hydra_client.search(xray_query, type="search", num=10)
             
-            try:
-                # We ask for more results (num=10) to scan more snippets
-                xray_results = await hydra_client.search(xray_query, type="search", num=10)
-                
-                if xray_results:
-                    for res in xray_results:
-                        snippet = res.get('snippet', '').lower()
-                        title = res.get('name', '')
-                        link = res.get('source_url', '')
+            if xray_results:
+                for res in xray_results:
+                    snippet = res.get('snippet', '').lower()
+                    title = res.get('name', '')
+                    link = res.get('source_url', '')
+                    
+                    # Email Extraction (shared compiled extractor)
+                    found_emails = summarize(extract_contacts(snippet + " " + title))["emails"]
+                    
+                    # Detect Decision Maker Name
+                    # Look for patterns like "John Doe - CEO" or "Jane Doe (Founder)"
+                    possible_name = None
+                    if " - " in title:
+                        possible_name = title.split(" - ")[0]
+                    elif "|" in title:
+                        possible_name = title.split(" | ")[0]
                         
-                        # Email Extraction (Regex-lite)
-                        import re
-                        found_emails = re.findall(r'[\w.+-]+@[\w-]+\.[\w.-]+', snippet + " " + title)
-                        
-                        # Detect Decision Maker Name
-                        # Look for patterns like "John Doe - CEO" or "Jane Doe (Founder)"
-                        possible_name = None
-                        if " - " in title:
-                            possible_name = title.split(" - ")[0]
-                        elif "|" in title:
-                            possible_name = title.split(" | ")[0]
-                            
-                        # Validate Role
-                        roles = ["ceo", "founder", "owner", "director", "partner", "president"]
-                        has_role = any(r in title.lower() or r in snippet for r in roles)
-                        
-                        if has_role and (possible_name or found_emails):
-                             if possible_name and not lead.get('decision_maker_name'):
-                                 lead['decision_maker_name'] = possible_name
-                                 lead['decision_maker_title'] = "Decision Maker (X-Ray)" # Generic until parsed better
-                                 lead['decision_maker_linkedin'] = link if "linkedin" in link else lead.get('decision_maker_linkedin')
-                                 print(f"   💎 X-Ray Identity: {possible_name}")
-                                 
-                             if found_emails and not lead.get('decision_maker_email'):
-                                 # Filter out generic emails if possible, prioritize gmail/personal for DM
-                                 valid_email = found_emails[0]
-                                 # Basic cleanup
-                                 if valid_email.endswith('.'): valid_email = valid_email[:-1]
-                                 
-                                 lead['decision_maker_email'] = valid_email
-                                 lead['email'] = valid_email # Also set main email if missing
-                                 print(f"   📧 X-Ray Direct Contact: {valid_email}")
-
-                        if lead.get('decision_maker_email') and lead.get('decision_maker_name'):
-                            break # We got the jackpot
-
-            except Exception as e:
-                print(f"   ⚠️ Universal X-Ray error: {e}")
-
-            # Calculate enrichment depth
-            layer_count = 0
-            if lead.get('phone') or lead.get('email'): layer_count += 1  # Layer 1
-            if lead.get('reputation_score'): layer_count += 1  # Layer 2
-            if lead.get('funding_stage'): layer_count += 1  # Layer 3
-            if lead.get('tech_stack'): layer_count += 1  # Layer 4
-            if lead.get('actively_hiring'): layer_count += 1  # Layer 5
-            if lead.get('patent_count'): layer_count += 1  # Layer 6
-            if lead.get('imports_exports'): layer_count += 1  # Layer 8
-            if lead.get('event_participation_count'): layer_count += 1  # Layer 9
-            if lead.get('government_contractor'): layer_count += 1  # Layer 11
-            if lead.get('research_papers_count'): layer_count += 1  # Layer 13
-            
-            lead['enrichment_layers_active'] = layer_count
-            lead['status'] = 'SOVEREIGN' if layer_count >= 6 else 'VERIFIED' if layer_count >= 3 else 'PARTIAL'
-            
-            print(f"   🎯 {company_name}: {layer_count}/13 layers activated - {lead['status']}")
-            yield lead
-                
-        return
+                    # Validate Role
+                    roles = ["ceo", "founder", "owner", "director", "partner", "president"]
+                    has_role = any(r in title.lower() or r in snippet for r in roles)
+                    
+                    if has_role and (possible_name or found_emails):
+                         if possible_name and not lead.get('decision_maker_name'):
+                             lead['decision_maker_name'] = possible_name
+                             lead['decision_maker_title'] = "Decision Maker (X-Ray)" # Generic until parsed better
+                             lead['decision_maker_linkedin'] = link if "linkedin" in link else lead.get('decision_maker_linkedin')
+                             print(f"   💎 X-Ray Identity: {possible_name}")
+                             
+                         if found_emails and not lead.get('decision_maker_email'):
+                             # Filter out generic emails if possible, prioritize gmail/personal for DM
+                             valid_email = found_emails[0]
+                             lead['decision_maker_email'] = valid_email
+                             print(f"   📧 X-Ray Direct Contact: {valid_email}")
 
+                    if lead.get('decision_maker_email') and lead.get('decision_maker_name'):
+                        break # We got the jackpot
 
+        except Exception as e:
+            print(f"   ⚠️ Universal X-Ray error: {e}")
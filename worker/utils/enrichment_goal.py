@@ -0,0 +1,94 @@
+"""
+CLARITY PEARL - ENRICHMENT GOALS
+What a job actually needs from each lead, so the bridge can stop early.
+
+Jobs declare it in search_metadata:
+    {"target_fields": ["email", "phone"], "min_confidence": "high"}
+
+A lead meets the goal once every target field is present and the email-type
+fields reach the required confidence. Only layers that can fill a target field
+(plus the layers they depend on) run. Once the goal is met no further layer
+starts (including ones queued for the page); layers already running are not
+cancelled and finish within their own timeouts. Without target_fields every
+enabled layer runs.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from utils.company_cache import normalize_domain
+
+CONFIDENCE_RANK = {"low": 1, "medium": 2, "high": 3}
+DEFAULT_CONFIDENCE = "medium"
+
+# Shorthands accepted in target_fields
+FIELD_ALIASES = {
+    "contacts": ("email", "phone"),
+    "decision_maker": ("decision_maker_name", "decision_maker_email"),
+}
+
+
+def email_confidence(lead: Dict, field: str) -> str:
+    """How much to trust an email-type field, by where it came from."""
+    if field == "email":
+        if lead.get("email_confidence"):
+            return str(lead["email_confidence"]).lower()
+        if lead.get("email_source") == "pattern_generated":
+            return "medium"
+        # Scraped from the company's own site or the source listing
+        if lead.get("email") in (lead.get("emails") or []) or lead.get("email") != lead.get("decision_maker_email"):
+            return "high"
+    elif field == "decision_maker_email":
+        # X-Ray snippet backed by the company itself: listed on its site, or a mailbox on its domain
+        email = str(lead.get(field) or "").lower()
+        if email in (e.lower() for e in lead.get("emails") or []) or _on_company_domain(email, lead.get("website")):
+            return "high"
+    # Pulled from search snippets (X-Ray): plausible but unconfirmed
+    return "medium"
+
+
+def _on_company_domain(email: str, website: Optional[str]) -> bool:
+    host = normalize_domain(website)
+    if "@" not in email or not host:
+        return False
+    domain = email.rsplit("@", 1)[1]
+    return (domain == host or domain.endswith("." + host))
+
+
+class EnrichmentGoal:
+    """
+    Target fields plus the confidence email fields must reach.
+    """
+
+    def __init__(self, fields: Iterable[str], min_confidence: str = DEFAULT_CONFIDENCE):
+        expanded: List[str] = []
+        for field in fields:
+            for name in FIELD_ALIASES.get(field, (field,)):
+                if name not in expanded:
+                    expanded.append(name)
+        self.fields = tuple(expanded)
+        self.min_rank = CONFIDENCE_RANK.get(str(min_confidence).lower(), CONFIDENCE_RANK[DEFAULT_CONFIDENCE])
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict]) -> Optional["EnrichmentGoal"]:
+        """The job's goal, or None when it doesn't declare target fields."""
+        fields = (metadata or {}).get("target_fields")
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        if not fields:
+            return None
+        return cls(fields, (metadata or {}).get("min_confidence", DEFAULT_CONFIDENCE))
+
+    def missing(self, lead: Dict) -> List[str]:
+        missing = []
+        for field in self.fields:
+            if not lead.get(field):
+                missing.append(field)
+            elif field.endswith("email") and CONFIDENCE_RANK.get(email_confidence(lead, field), 0) < self.min_rank:
+                missing.append(field)
+        return missing
+
+    def satisfied(self, lead: Dict) -> bool:
+        return not self.missing(lead)
+
+    def __repr__(self):
+        return f"EnrichmentGoal({', '.join(self.fields)})"
@@ -0,0 +1,130 @@
+"""
+CLARITY PEARL - ADAPTIVE FEED SCROLLER
+Scroll a lazy-loading results feed (Google Maps) only while it keeps growing.
+
+After each scroll the listing count is polled; the next scroll follows as soon
+as new listings show up (plus a short human-like pause) instead of a fixed
+sleep. Scrolling stops when:
+
+- the feed shows its end-of-list marker
+- STALL_ROUNDS scrolls in a row load nothing new
+- the caller's target listing count is reached
+- the job's time budget runs low (what's loaded still gets extracted)
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+from utils.time_budget import get_budget
+
+MAX_SCROLLS = 30
+# Seconds to wait for a scroll to load more before counting it as a stall
+SETTLE_TIMEOUT = 3.0
+POLL_INTERVAL = 0.25
+STALL_ROUNDS = 2
+# Human-like pause after a productive scroll, bounded so it never dominates
+JITTER = (0.4, 1.2)
+# Seconds of budget kept back for extraction
+RESERVE = 10
+
+SCROLL_JS = """
+(feedSelector) => {
+    const feed = document.querySelector(feedSelector);
+    if (!feed) return false;
+    feed.scrollTop = feed.scrollHeight;
+    return true;
+}
+"""
+
+# Listing count and whether the feed says there's nothing more to load
+STATE_JS = """
+(feedSelector) => {
+    let count = document.querySelectorAll("div[role='article']").length;
+    if (!count) count = document.querySelectorAll("a[href*='/maps/place/']").length;
+    const feed = document.querySelector(feedSelector);
+    let tail = "";
+    if (feed) {
+        tail = Array.from(feed.children).slice(-3).map(c => c.innerText || "").join(" ");
+    }
+    return {count: count, ended: /end of the list|no more results/i.test(tail)};
+}
+"""
+
+
+async def scroll_feed(page, feed_selector: str, target: Optional[int] = None,
+                      max_scrolls: int = MAX_SCROLLS, label: str = "feed") -> int:
+    """
+    Scrolls `feed_selector` until it stops producing listings.
+
+    Args:
+        page: Playwright page showing the feed
+        feed_selector: The scrollable container (div[role='feed'] on Maps)
+        target: Stop once this many listings are loaded (None = until exhausted)
+        max_scrolls: Hard cap on scroll rounds
+        label: Log prefix
+
+    Returns:
+        Listings loaded when scrolling stopped
+    """
+    budget = get_budget()
+    state = await _state(page, feed_selector)
+    count = state["count"]
+    stalls = 0
+    scrolls = 0
+    started = time.monotonic()
+    reason = "scroll cap"
+
+    while scrolls < max_scrolls:
+        if state["ended"]:
+            reason = "end of list"
+            break
+        if target and count >= target:
+            reason = "target reached"
+            break
+        if budget.remaining() < RESERVE:
+            reason = "budget low"
+            budget.note_skip("maps_scrolls", max_scrolls - scrolls)
+            break
+
+        try:
+            scrolled = await page.evaluate(SCROLL_JS, feed_selector)
+        except Exception:
+            scrolled = False
+        if not scrolled:
+            try:
+                await page.mouse.wheel(0, 2000)
+            except Exception:
+                pass
+        scrolls += 1
+
+        # Wait for new listings instead of sleeping a fixed interval
+        deadline = time.monotonic() + SETTLE_TIMEOUT
+        previous = count
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            state = await _state(page, feed_selector)
+            if state["count"] > previous or state["ended"]:
+                break
+        count = max(count, state["count"])
+
+        if count > previous:
+            stalls = 0
+            await asyncio.sleep(random.uniform(*JITTER))
+        else:
+            stalls += 1
+            if stalls >= STALL_ROUNDS:
+                reason = "stopped growing"
+                break
+
+    print(f"[{label}] 📜 {count} listings after {scrolls} scrolls in {time.monotonic() - started:.1f}s ({reason}).")
+    return count
+
+
+async def _state(page, feed_selector: str) -> dict:
+    try:
+        state = await page.evaluate(STATE_JS, feed_selector)
+        return {"count": int(state.get("count") or 0), "ended": bool(state.get("ended"))}
+    except Exception:
+        return {"count": 0, "ended": False}
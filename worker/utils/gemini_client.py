@@ -1,10 +1,12 @@
 import os
 import json
 import base64
+import asyncio
 import requests
 from google import genai
 from datetime import datetime
 from dotenv import load_dotenv
+from .single_flight import SingleFlight
 
 load_dotenv()
 # Robust .env search for parent directories (helpful for worker subdirs)
@@ -54,6 +56,9 @@ class GeminiClient:
         self.health_map = {} 
         self.cooldown_period = 300 
 
+        # Identical prompts issued concurrently (parallel missions/leads) share one LLM call
+        self.inflight = SingleFlight("llm")
+
         
         # Correct Gemini model IDs (Updated for GenAI SDK compatibility)
         # Correct Gemini model IDs (Updated for GenAI SDK compatibility)
@@ -217,13 +222,22 @@ class GeminiClient:
         result = self._call_gemini(prompt)
         return result
 
+    async def _smart_call_async(self, prompt):
+        """
+        Non-blocking _smart_call. The blocking HTTP call runs in a worker thread
+        and concurrent identical prompts are coalesced into one request.
+        """
+        if not self.ai_available:
+            return None
+        return await self.inflight.do(prompt, lambda: asyncio.to_thread(self._smart_call, prompt))
+
     async def analyze_visuals(self, query, image_path):
         prompt = f"Analyze this screenshot for the query: {query}. Return ONLY a JSON object: {{\"truth_score\": int, \"verdict\": \"string\"}}"
         return self._call_gemini(prompt, image_path)
 
     async def verify_data(self, query, data_payload, search_context=""):
         prompt = f"Verify this data for query '{query}': {data_payload}. Context: {search_context}. Format: {{\"truth_score\": int, \"verdict\": \"string\", \"is_verified\": bool}}"
-        resp = self._smart_call(prompt)
+        resp = await self._smart_call_async(prompt)
         try:
             return json.loads(self._clean_json(resp))
         except: 
@@ -237,7 +251,7 @@ class GeminiClient:
 
     async def generate_outreach(self, lead_data, platform="email"):
         prompt = f"Draft elite outreach for {lead_data} on {platform}. Return ONLY message text."
-        return self._smart_call(prompt) or "Arbiter Offline"
+        return await self._smart_call_async(prompt) or "Arbiter Offline"
 
     async def dispatch_mission(self, user_prompt):
         """
@@ -264,7 +278,7 @@ class GeminiClient:
             "reasoning": "Brief explanation of why this synonym/variant was chosen"
         }}]
         """
-        resp = self._smart_call(prompt)
+        resp = await self._smart_call_async(prompt)
         try:
             return json.loads(self._clean_json(resp))
         except: 
@@ -284,7 +298,7 @@ class GeminiClient:
         Compatibility method for ArbiterAgent.
         Returns the text content directly.
         """
-        return self._smart_call(prompt) or ""
+        return await self._smart_call_async(prompt) or ""
 
     def _clean_json(self, text):
         if not text: return None
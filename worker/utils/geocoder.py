@@ -1,22 +1,29 @@
-import httpx
 import os
 import asyncio
 from typing import Optional, Tuple
+from utils.single_flight import SingleFlight
+from utils.http_client import http_client
 
 class Geocoder:
     def __init__(self, supabase=None):
         self.supabase = supabase
         self.base_url = "https://nominatim.openstreetmap.org/search"
         self.user_agent = "ClarityPearl/1.0 (B2B Sales Intelligence Platform)"
+        # Leads from the same city are saved concurrently: share one lookup
+        self.inflight = SingleFlight("geocoder")
+        self.boxes = {}  # place -> (south, west, north, east), per process
 
     async def get_coordinates(self, address_string: str) -> Optional[Tuple[float, float]]:
         """
         Converts an address string into Latitude and Longitude.
         Implements persistent caching via Supabase to minimize external API calls.
+        Concurrent lookups of the same address share one request.
         """
         if not address_string or address_string in ["Global / Remote", "Unknown", "n/a", "N/A"]:
             return None
+        return await self.inflight.do(address_string, lambda: self._lookup(address_string))
 
+    async def _lookup(self, address_string: str) -> Optional[Tuple[float, float]]:
         # 1. Check Cache
         if self.supabase:
             try:
@@ -35,28 +42,55 @@ class Geocoder:
             }
             headers = {"User-Agent": self.user_agent}
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                res = await client.get(self.base_url, params=params, headers=headers)
-                if res.status_code == 200:
-                    data = res.json()
-                    if data:
-                        lat, lng = float(data[0]['lat']), float(data[0]['lon'])
-                        
-                        # Save to Cache
-                        if self.supabase:
-                            try:
-                                self.supabase.table('geocoding_cache').upsert({
-                                    "address_string": address_string,
-                                    "lat": lat,
-                                    "lng": lng
-                                }).execute()
-                            except: pass
-                        
-                        return lat, lng
+            res = await http_client.get(self.base_url, params=params, headers=headers, timeout=10.0)
+            if res.status == 200:
+                data = res.json()
+                if data:
+                    lat, lng = float(data[0]['lat']), float(data[0]['lon'])
+                    
+                    # Save to Cache
+                    if self.supabase:
+                        try:
+                            self.supabase.table('geocoding_cache').upsert({
+                                "address_string": address_string,
+                                "lat": lat,
+                                "lng": lng
+                            }).execute()
+                        except: pass
+                    
+                    return lat, lng
         except Exception as e:
             print(f"⚠️ Geocoding failed for '{address_string}': {e}")
             
         return None
 
+    async def get_bounding_box(self, place: str) -> Optional[Tuple[float, float, float, float]]:
+        """
+        (south, west, north, east) of a city / region, for tiling map searches.
+        Cached per process; concurrent lookups share one request.
+        """
+        if not place:
+            return None
+        if place in self.boxes:
+            return self.boxes[place]
+        box = await self.inflight.do(("bbox", place), lambda: self._lookup_box(place))
+        if box:
+            self.boxes[place] = box
+        return box
+
+    async def _lookup_box(self, place: str) -> Optional[Tuple[float, float, float, float]]:
+        try:
+            params = {"q": place, "format": "json", "limit": 1}
+            res = await http_client.get(self.base_url, params=params, headers={"User-Agent": self.user_agent}, timeout=10.0)
+            if res.status == 200:
+                data = res.json()
+                if data and data[0].get('boundingbox'):
+                    # Nominatim order: [south, north, west, east]
+                    south, north, west, east = (float(v) for v in data[0]['boundingbox'])
+                    return south, west, north, east
+        except Exception as e:
+            print(f"⚠️ Bounding box lookup failed for '{place}': {e}")
+        return None
+
 # Singleton instance
 geocoder = Geocoder()
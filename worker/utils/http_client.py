@@ -0,0 +1,225 @@
+"""
+CLARITY PEARL - SHARED OUTBOUND HTTP LAYER
+One process-wide aiohttp session for every worker integration.
+
+Keep-alive connection pools per host, a DNS cache, transparent gzip/deflate
+(and brotli when installed), uniform timeouts and retries with jittered
+backoff for transient failures (idempotent methods only unless the caller
+asks). Per-host request counts and latency are kept
+for the worker heartbeat.
+
+aiohttp does not speak HTTP/2; connection reuse is what removes the
+per-request TCP/TLS handshake here.
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Uniform defaults (seconds)
+DEFAULT_TIMEOUT = 10
+CONNECT_TIMEOUT = 5
+DEFAULT_RETRIES = 2
+BACKOFF_BASE = 0.5
+# Statuses worth a second attempt. 429 is deliberately absent: for the search
+# providers it means the quota is gone, and retrying only burns latency.
+RETRY_STATUSES = {500, 502, 503, 504}
+# Methods safe to resend; others (POST, PATCH) only retry when the caller asks
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Pool sizing (Render free tier: keep it small)
+POOL_LIMIT = 64
+POOL_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+# Hosts with their own metrics; company sites come and go, so the least-used
+# host beyond this is folded into OTHER_HOSTS (bounds memory and the heartbeat row)
+MAX_TRACKED_HOSTS = 32
+OTHER_HOSTS = "other"
+
+
+class HttpResponse:
+    """Fully-read response, safe to use after the connection went back to the pool."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, url: str, encoding: str = "utf-8"):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+        self._encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self._encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.statuses: Dict[int, int] = {}
+
+    def absorb(self, other: "HostMetrics"):
+        self.requests += other.requests
+        self.errors += other.errors
+        self.retries += other.retries
+        self.total_latency += other.total_latency
+        self.max_latency = max(self.max_latency, other.max_latency)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_latency_s": round(self.total_latency / self.requests, 3) if self.requests else 0,
+            "max_latency_s": round(self.max_latency, 3),
+            "statuses": {str(k): v for k, v in self.statuses.items()}
+        }
+
+
+class HttpClient:
+    """
+    Shared outbound HTTP client. Use the module singleton `http_client`.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES):
+        self.timeout = timeout
+        self.retries = retries
+        self.user_agent = "ClarityPearl/1.0 (B2B Sales Intelligence Platform)"
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+        self.metrics: Dict[str, HostMetrics] = {}
+        try:
+            import brotli  # noqa: F401
+            self.accept_encoding = "gzip, deflate, br"
+        except ImportError:
+            self.accept_encoding = "gzip, deflate"
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # Sessions are bound to their event loop (scripts may call asyncio.run repeatedly)
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_LIMIT,
+                limit_per_host=POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=CONNECT_TIMEOUT),
+                headers={"Accept-Encoding": self.accept_encoding, "User-Agent": self.user_agent}
+            )
+            self._loop = loop
+        return self._session
+
+    async def request(self, method: str, url: str, *, params: Optional[Dict] = None,
+                      headers: Optional[Dict] = None, json_body: Any = None, data: Any = None,
+                      timeout: Optional[float] = None, retries: Optional[int] = None,
+                      ssl: Optional[bool] = None) -> HttpResponse:
+        """
+        Send a request through the shared pool.
+
+        Args:
+            method: HTTP verb
+            url: Absolute URL
+            params / headers / json_body / data: As in aiohttp
+            timeout: Total seconds for this request (default DEFAULT_TIMEOUT)
+            retries: Extra attempts on connection errors, timeouts and 5xx
+                (default: DEFAULT_RETRIES for idempotent methods, 0 otherwise)
+            ssl: False to skip certificate verification for this request
+
+        Returns:
+            HttpResponse (any status). Raises the last error if every attempt failed to connect.
+        """
+        session = await self._get_session()
+        host = urlsplit(url).hostname or "unknown"
+        stats = self._host_metrics(host)
+        if retries is None:
+            # A timed-out POST may still have been processed (and billed) upstream
+            retries = self.retries if method.upper() in IDEMPOTENT_METHODS else 0
+        kwargs = {"params": params, "headers": headers, "json": json_body, "data": data}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout, connect=min(CONNECT_TIMEOUT, timeout))
+        if ssl is False:
+            kwargs["ssl"] = False
+
+        for attempt in range(retries + 1):
+            if attempt:
+                stats.retries += 1
+                # Exponential backoff with full jitter
+                await asyncio.sleep(random.uniform(0, BACKOFF_BASE * (2 ** (attempt - 1))))
+            start = time.monotonic()
+            stats.requests += 1
+            try:
+                async with session.request(method, url, **kwargs) as resp:
+                    body = await resp.read()
+                    response = HttpResponse(resp.status, dict(resp.headers), body, str(resp.url), resp.charset)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._observe(stats, time.monotonic() - start, None)
+                if attempt == retries:
+                    raise
+                print(f"   [HTTP] {host} {type(e).__name__}, retrying ({attempt + 1}/{retries})...")
+                continue
+
+            self._observe(stats, time.monotonic() - start, response.status)
+            if response.status in RETRY_STATUSES and attempt < retries:
+                continue
+            return response
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    def _host_metrics(self, host: str) -> HostMetrics:
+        stats = self.metrics.get(host)
+        if stats is None:
+            tracked = [h for h in self.metrics if h != OTHER_HOSTS]
+            if len(tracked) >= MAX_TRACKED_HOSTS:
+                quietest = min(tracked, key=lambda h: self.metrics[h].requests)
+                self.metrics.setdefault(OTHER_HOSTS, HostMetrics()).absorb(self.metrics.pop(quietest))
+            stats = self.metrics[host] = HostMetrics()
+        return stats
+
+    def _observe(self, stats: HostMetrics, latency: float, status: Optional[int]):
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+        if status is None:
+            stats.errors += 1
+        else:
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status >= 500:
+                stats.errors += 1
+
+    def get_metrics(self) -> Dict:
+        """Per-host request/latency metrics for the heartbeat (busiest hosts, the rest under "other")."""
+        return {host: stats.to_dict() for host, stats in self.metrics.items()}
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Singleton instance
+http_client = HttpClient()
@@ -1,15 +1,50 @@
 import os
-import aiohttp
 import asyncio
 import json
 import random
+import time
 from urllib.parse import quote
+from utils.quota_ledger import quota_ledger
+from utils.provider_router import ProviderRouter
+from utils.single_flight import SingleFlight
+from utils.http_client import http_client
+
+# Provider pagination: (param, base, unit). unit 'page' = page number, 'offset' = result index.
+# Google serves 10 organic results per page, so deep queries walk pages of PAGE_SIZE.
+PAGINATION = {
+    "serper": ("page", 1, "page"),
+    "searchapi": ("page", 1, "page"),
+    "scrapingdog": ("page", 0, "page"),
+    "serpapi": ("start", 0, "offset"),
+    "hasdata": ("start", 0, "offset"),
+    "zenserp": ("start", 0, "offset"),
+    "serpstack": ("page", 1, "page"),
+    "google_cse": ("start", 1, "offset"),  # CSE caps at start+num <= 100
+}
+PAGE_SIZE = 10
+MAX_DEEP_PAGES = 5
+
+
+class ResultPage(list):
+    """One page of parsed results; `last` is set when the provider reports nothing after it."""
+    last = False
+
+
+def _end_of_listing(results, has_next, total=None, page=0, num=PAGE_SIZE):
+    """Tag parsed results with the provider's own end signal (no next page, or total already reached)."""
+    results = ResultPage(results)
+    try:
+        reached = total is not None and int(str(total).replace(",", "")) <= (page + 1) * num
+    except ValueError:
+        reached = False
+    results.last = not has_next or reached
+    return results
 
 class HydraClient:
     """
     The Hydra Protocol Client.
     Manages a pool of free-tier search APIs and falls back to open-source scraping.
-    Prioritizes: Serper > SearchAPI > HasData > ... > Fallback
+    Provider order adapts to observed latency, yield and quota (Serper first until measured).
     """
     def __init__(self):
         # SEARCH PROVIDERS (Speed Layer)
@@ -33,125 +68,211 @@ class HydraClient:
             "tomtom": os.getenv("TOMTOM_API_KEY"),
         }
 
-        # Usage tracking (simple in-memory for this session)
-        self.usage = {k: 0 for k in self.api_keys.keys()}
-        
-        # Free Tier Limits (Approximate daily/monthly safe limits)
-        self.limits = {
-            "serper": 2500, # 2500 total free
-            "searchapi": 100, # 100 total free
-            "hasdata": 100, # 100 credits
-            "scrapingdog": 1000, # 1000 requests
-            "serpapi": 100, # Approx limit (actually 250/mo, conservative)
-            "scraperapi": 1000, # 1000 free credits usually
-            "zenserp": 50,
-            "serpstack": 100,
-            "google_cse": 100
-        }
+        # Usage tracking: shared, persistent ledger (Supabase counters + local leases)
+        self.quota = quota_ledger
+
+        # Provider catalogue in static preference order: (name, label, supported types).
+        # The router reorders these per query from observed latency/yield.
+        self.providers = [
+            ("serper", "Serper.dev", ("search", "maps", "news")),
+            ("searchapi", "SearchAPI.io", ("search", "maps", "news")),
+            ("scrapingdog", "ScrapingDog", ("search",)),
+            ("serpapi", "SerpApi", ("search", "maps", "news")),
+            ("scraperapi", "ScraperAPI", ("search",)),
+            ("hasdata", "HasData", ("search",)),
+            ("zenserp", "Zenserp", ("search", "maps", "news")),
+            ("serpstack", "Serpstack", ("search", "maps", "news")),
+            ("google_cse", "Google CSE", ("search", "maps", "news")),
+        ]
+        self.provider_labels = {name: label for name, label, _ in self.providers}
+        self.router = ProviderRouter(quota=self.quota)
+        # Concurrent identical searches (omega sweeps, parallel missions) share one call
+        self.inflight = SingleFlight("hydra")
 
     async def search(self, query, type="search", num=10):
         """
-         Unified search method that tries providers in order of preference.
+         Unified search method. Providers are tried best-first according to the
+         adaptive router (latency, success rate, yield and remaining quota).
+         Identical concurrent calls are coalesced into a single provider request.
          type: 'search', 'maps', 'news'
         """
-        # 1. Serper.dev (Fastest, Largest Free Tier)
-        if self._can_use("serper"):
-            print(f"   🐍 Hydra: Engaging Serper.dev for '{query}'...")
-            res = await self._query_serper(query, type, num)
-            if res: return res
-
-        # 2. SearchAPI.io
-        if self._can_use("searchapi"):
-            print(f"   🐍 Hydra: Engaging SearchAPI.io for '{query}'...")
-            res = await self._query_searchapi(query, type, num)
+        key = (" ".join(query.split()).lower(), type, num)
+        res = await self.inflight.do(key, lambda: self._search_uncoalesced(query, type, num))
+        # Each waiter gets its own copies so callers can annotate results freely
+        return [dict(r) if isinstance(r, dict) else r for r in res] if res else res
+
+    async def _search_uncoalesced(self, query, type="search", num=10):
+        query_type = self.router.classify(query, type)
+        for provider in self.router.rank(self._candidates(type), query_type):
+            if not self._can_use(provider): continue
+
+            print(f"   🐍 Hydra: Engaging {self.provider_labels[provider]} for '{query}'...")
+            start = time.monotonic()
+            res = await self._dispatch(provider, query, type, num)
+            self._settle(provider, res)
+            self.router.record(provider, query_type, time.monotonic() - start, res)
             if res: return res
 
-        # 3. ScrapingDog
-        if self._can_use("scrapingdog") and type == "search":
-             print(f"   🐍 Hydra: Engaging ScrapingDog for '{query}'...")
-             res = await self._query_scrapingdog(query, num)
-             if res: return res
-
-        # 4. SerpApi (Reliable but low volume)
-        if self._can_use("serpapi"):
-            print(f"   🐍 Hydra: Engaging SerpApi for '{query}'...")
-            res = await self._query_serpapi(query, type, num)
-            if res: return res
-             
-        # 5. ScraperAPI (If available, good volume)
-        if self._can_use("scraperapi") and type == "search":
-             print(f"   🐍 Hydra: Engaging ScraperAPI for '{query}'...")
-             res = await self._query_scraperapi(query, num)
-             if res: return res
-
-        # 6. HasData (Web Scraping API)
-        if self._can_use("hasdata") and type == "search":
-            print(f"   🐍 Hydra: Engaging HasData for '{query}'...")
-            res = await self._query_hasdata(query, num)
-            if res: return res
-
-        # 7. Zenserp
-        if self._can_use("zenserp"):
-             print(f"   🐍 Hydra: Engaging Zenserp for '{query}'...")
-             res = await self._query_zenserp(query, num)
-             if res: return res
-
-        # 8. Serpstack
-        if self._can_use("serpstack"):
-             print(f"   🐍 Hydra: Engaging Serpstack for '{query}'...")
-             res = await self._query_serpstack(query, num)
-             if res: return res
+        print("   ⚠️ Hydra: All fast APIs exhausted or failed. Returning None (Controller will fallback to browser).")
+        return None
 
-        # 9. Google CSE (Highly reliable, 100/day free)
-        if self._can_use("google_cse") and self.api_keys.get("google_cx"):
-             print(f"   🐍 Hydra: Engaging Google CSE for '{query}'...")
-             res = await self._query_google_cse(query, num)
-             if res: return res
+    async def search_deep(self, query, type="search", target=30):
+        """
+         Multi-page search for long lists. Pages are fetched from one provider
+         (concurrently, each page reserving its own quota) and de-duplicated
+         across pages until `target` unique results or the listing ends: an
+         empty page, a page with nothing new, or the provider reporting no
+         next page. Short pages are not an end; Google often serves 7-9 hits.
+         Identical concurrent calls are coalesced like search().
+        """
+        key = ("deep", " ".join(query.split()).lower(), type, target)
+        res = await self.inflight.do(key, lambda: self._search_deep_uncoalesced(query, type, target))
+        return [dict(r) if isinstance(r, dict) else r for r in res] if res else res
+
+    async def _search_deep_uncoalesced(self, query, type, target):
+        query_type = self.router.classify(query, type)
+        results, seen = [], set()
+
+        for provider in self.router.rank(self._candidates(type), query_type):
+            # Page 0 on its own: it tells us whether there is anything to paginate
+            first = await self._fetch_page(provider, query, type, query_type, 0)
+            if first is None: continue
+            self._merge_unique(first, results, seen)
+
+            page, exhausted = 1, not first or getattr(first, "last", False) or provider not in PAGINATION
+            while not exhausted and len(results) < target and page < MAX_DEEP_PAGES:
+                wanted = min(-(-(target - len(results)) // PAGE_SIZE), MAX_DEEP_PAGES - page)
+                if provider == "google_cse":
+                    wanted = min(wanted, 10 - page)  # CSE never serves past result 100
+                if wanted <= 0: break
+                batches = await asyncio.gather(*[
+                    self._fetch_page(provider, query, type, query_type, p)
+                    for p in range(page, page + wanted)
+                ])
+                page += wanted
+                added = 0
+                for batch in batches:
+                    if not batch or getattr(batch, "last", False):
+                        exhausted = True
+                    added += self._merge_unique(batch or [], results, seen)
+                if added == 0:
+                    exhausted = True  # Provider is repeating itself
+
+            if results:
+                print(f"   🐍 Hydra: Deep search collected {len(results)} unique results via {self.provider_labels[provider]} ({page} page(s)).")
+                return results[:target]
+
+        print("   ⚠️ Hydra: Deep search found nothing on the API layer.")
+        return None
 
-        print("   ⚠️ Hydra: All fast APIs exhausted or failed. Returning None (Controller will fallback to browser).")
+    async def _fetch_page(self, provider, query, type, query_type, page):
+        """One quota-reserved, router-recorded page request. None if skipped or failed."""
+        if not self._can_use(provider): return None
+        start = time.monotonic()
+        res = await self._dispatch(provider, query, type, PAGE_SIZE, page)
+        self._settle(provider, res)
+        self.router.record(provider, query_type, time.monotonic() - start, res)
+        return res
+
+    @staticmethod
+    def _merge_unique(batch, results, seen):
+        added = 0
+        for item in batch:
+            key = item.get("source_url") or item.get("link") or (item.get("name"), item.get("address"))
+            if not key or key in seen: continue
+            seen.add(key)
+            results.append(item)
+            added += 1
+        return added
+
+    def _candidates(self, type):
+        """Providers with a key that support the requested search type, in static order."""
+        candidates = [
+            name for name, label, types in self.providers
+            if type in types and self.api_keys.get(name)
+        ]
+        if self.api_keys.get("google_cse") and not self.api_keys.get("google_cx"):
+            candidates = [c for c in candidates if c != "google_cse"]
+        return candidates
+
+    def _page_params(self, provider, page, num):
+        """Pagination params for a provider (empty for the first page or unsupported providers)."""
+        spec = PAGINATION.get(provider)
+        if not spec or page <= 0: return {}
+        param, base, unit = spec
+        return {param: base + (page if unit == "page" else page * num)}
+
+    async def _dispatch(self, provider, query, type, num, page=0):
+        """Route to the provider implementation (signatures differ per provider)."""
+        if provider == "serper": return await self._query_serper(query, type, num, page)
+        if provider == "searchapi": return await self._query_searchapi(query, type, num, page)
+        if provider == "scrapingdog": return await self._query_scrapingdog(query, num, page)
+        if provider == "serpapi": return await self._query_serpapi(query, type, num, page)
+        if provider == "scraperapi": return await self._query_scraperapi(query, num) if page == 0 else None
+        if provider == "hasdata": return await self._query_hasdata(query, num, page)
+        if provider == "zenserp": return await self._query_zenserp(query, num, page)
+        if provider == "serpstack": return await self._query_serpstack(query, num, page)
+        if provider == "google_cse": return await self._query_google_cse(query, num, page)
         return None
 
+    def get_provider_stats(self):
+        """
+        Routing telemetry for dashboards: per-provider stats (latency, success,
+        yield) under "providers", duplicate-query coalescing under "coalescing".
+        """
+        return {
+            "providers": self.router.export_stats(),
+            "coalescing": self.inflight.get_stats()
+        }
+
     def _can_use(self, provider):
-        """Check if provider has key and is under limit"""
+        """
+        Check if provider has a key and reserve one call from the shared quota.
+        Every True must be followed by _settle() once the request finishes.
+        """
         key = self.api_keys.get(provider)
         if not key or key.strip() == "": return False
-        
-        # Ensure provider exists in usage/limits to prevent KeyError
-        if provider not in self.usage or provider not in self.limits:
-             return False
+        return self.quota.try_acquire(provider)
+
+    def _settle(self, provider, res):
+        """Refund the reserved call if the request never got a billable response."""
+        if res is None:
+            self.quota.refund(provider)
 
-        if self.usage[provider] >= self.limits[provider]: 
-            # print(f"   [Limit] {provider} exhausted.")
-            return False
-        return True
+    def _check_quota_error(self, provider, status):
+        """402/429 means the provider's own quota is gone: stop spending latency on it."""
+        if status in (402, 429):
+            print(f"   [{provider}] Quota exhausted upstream ({status}).")
+            self.quota.mark_exhausted(provider)
 
     # --- PROVIDER IMPLEMENTATIONS ---
 
-    async def _query_serper(self, query, type, num):
+    async def _query_serper(self, query, type, num, page=0):
         url = "https://google.serper.dev/search"
         if type == "maps": url = "https://google.serper.dev/places"
         if type == "news": url = "https://google.serper.dev/news"
 
-        payload = json.dumps({"q": query, "num": num})
+        payload = json.dumps({"q": query, "num": num, **self._page_params("serper", page, num)})
         headers = {
             'X-API-KEY': self.api_keys["serper"],
             'Content-Type': 'application/json'
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, data=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["serper"] += 1
-                        return self._parse_serper(data, type)
-                    else:
-                        print(f"   [Serper] Error {response.status}: {await response.text()}")
+            # No transport retries on paid calls: a retried timeout can bill twice while the
+            # ledger records one spend. Failing over to the next provider is the retry.
+            response = await http_client.post(url, headers=headers, data=payload, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return self._parse_serper(data, type)
+            else:
+                print(f"   [Serper] Error {response.status}: {response.text}")
+                self._check_quota_error("serper", response.status)
         except Exception as e:
             print(f"   [Serper] Exception: {e}")
         return None
 
-    async def _query_searchapi(self, query, type, num):
+    async def _query_searchapi(self, query, type, num, page=0):
         # SearchAPI usually just supports general search well
         engine = "google"
         if type == "maps": engine = "google_maps"
@@ -161,50 +282,32 @@ class HydraClient:
             "engine": engine,
             "q": query,
             "api_key": self.api_keys["searchapi"],
-            "num": num
+            "num": num,
+            **self._page_params("searchapi", page, num)
         }
         
         try:
-             async with aiohttp.ClientSession() as session:
-                async with session.get("https://www.searchapi.io/api/v1/search", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["searchapi"] += 1
-                        return self._parse_searchapi(data, type)
+            response = await http_client.get("https://www.searchapi.io/api/v1/search", params=params, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return _end_of_listing(self._parse_searchapi(data, type), (data.get("pagination") or {}).get("next"))
         except Exception as e:
              print(f"   [SearchAPI] Exception: {e}")
         return None
 
-    async def _query_scrapingdog(self, query, num):
-        try:
-            params = {
-                "api_key": self.api_keys["scrapingdog"],
-                "url": f"https://www.google.com/search?q={quote(query)}&num={num}",
-                "dynamic": "false"
-            }
-            async with aiohttp.ClientSession() as session:
-                 async with session.get("https://api.scrapingdog.com/scrape", params=params) as response:
-                     # ScrapingDog returns raw HTML usually, but we need parsing. 
-                     # Actually, for SERP they likely have a specific endpoint or we rely on their HTML output.
-                     # For now, let's assume we skip if it implies complex parsing in this client.
-                     # Wait, ScrapingDog has a Google Search API endpoint specifically:
-                     # https://api.scrapingdog.com/google?api_key=...&query=...
-                     pass
-        except: pass
-        
-        # Revised for ScrapingDog Google Search API
+    async def _query_scrapingdog(self, query, num, page=0):
+        # ScrapingDog Google Search API
         try:
              params = {
                  "api_key": self.api_keys["scrapingdog"],
                  "query": query,
-                 "results": num
+                 "results": num,
+                 **self._page_params("scrapingdog", page, num)
              }
-             async with aiohttp.ClientSession() as session:
-                  async with session.get("https://api.scrapingdog.com/google", params=params) as response:
-                      if response.status == 200:
-                          data = await response.json()
-                          self.usage["scrapingdog"] += 1
-                          return self._parse_scrapingdog(data)
+             response = await http_client.get("https://api.scrapingdog.com/google", params=params, retries=0)
+             if response.status == 200:
+                 data = response.json()
+                 return self._parse_scrapingdog(data)
         except Exception as e:
              print(f"   [ScrapingDog] Exception: {e}")
         return None
@@ -219,37 +322,34 @@ class HydraClient:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["scraperapi"] += 1
-                        return self._parse_scraperapi(data)
-                    else:
-                        print(f"   [ScraperAPI] Error {response.status}: {await response.text()}")
+            response = await http_client.get(url, params=params, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return self._parse_scraperapi(data)
+            else:
+                print(f"   [ScraperAPI] Error {response.status}: {response.text}")
+                self._check_quota_error("scraperapi", response.status)
         except Exception as e:
             print(f"   [ScraperAPI] Exception: {e}")
         return None
         
-    async def _query_hasdata(self, query, num):
+    async def _query_hasdata(self, query, num, page=0):
         # HasData Google Search API
         url = "https://api.hasdata.com/scrape/google-search/serp"
         headers = {"x-api-key": self.api_keys["hasdata"], "Content-Type": "application/json"}
-        payload = json.dumps({"q": query, "num": num})
+        payload = json.dumps({"q": query, "num": num, **self._page_params("hasdata", page, num)})
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, data=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["hasdata"] += 1
-                        return self._parse_hasdata(data)
+            response = await http_client.post(url, headers=headers, data=payload, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return self._parse_hasdata(data)
         except Exception as e:
             print(f"   [HasData] Exception: {e}")
         return None
 
 
-    async def _query_serpapi(self, query, type, num):
+    async def _query_serpapi(self, query, type, num, page=0):
         # SerpApi implementation
         engine = "google"
         if type == "maps": engine = "google_maps"
@@ -259,21 +359,25 @@ class HydraClient:
             "engine": engine,
             "q": query,
             "api_key": self.api_keys["serpapi"],
-            "num": num
+            "num": num,
+            **self._page_params("serpapi", page, num)
         }
         if type == "maps":
              # Maps specific params
              params["type"] = "search"
         
         try:
-             async with aiohttp.ClientSession() as session:
-                async with session.get("https://serpapi.com/search", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["serpapi"] += 1
-                        return self._parse_serpapi(data, type)
-                    else:
-                        print(f"   [SerpApi] Error {response.status}: {await response.text()}")
+            response = await http_client.get("https://serpapi.com/search", params=params, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return _end_of_listing(
+                    self._parse_serpapi(data, type),
+                    (data.get("serpapi_pagination") or {}).get("next"),
+                    (data.get("search_information") or {}).get("total_results"), page, num
+                )
+            else:
+                print(f"   [SerpApi] Error {response.status}: {response.text}")
+                self._check_quota_error("serpapi", response.status)
         except Exception as e:
              print(f"   [SerpApi] Exception: {e}")
         return None
@@ -384,44 +488,43 @@ class HydraClient:
             })
         return results
 
-    async def _query_zenserp(self, query, num):
-        params = {'apikey': self.api_keys["zenserp"], 'q': query, 'num': num}
+    async def _query_zenserp(self, query, num, page=0):
+        params = {'apikey': self.api_keys["zenserp"], 'q': query, 'num': num, **self._page_params("zenserp", page, num)}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://app.zenserp.com/api/v2/search", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["zenserp"] += 1
-                        return self._parse_zenserp(data)
+            response = await http_client.get("https://app.zenserp.com/api/v2/search", params=params, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return self._parse_zenserp(data)
         except Exception as e: print(f"   [Zenserp] Exception: {e}")
         return None
 
-    async def _query_serpstack(self, query, num):
-        params = {'access_key': self.api_keys["serpstack"], 'query': query, 'num': num}
+    async def _query_serpstack(self, query, num, page=0):
+        params = {'access_key': self.api_keys["serpstack"], 'query': query, 'num': num, **self._page_params("serpstack", page, num)}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("http://api.serpstack.com/search", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["serpstack"] += 1
-                        return self._parse_serpstack(data)
+            response = await http_client.get("http://api.serpstack.com/search", params=params, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return self._parse_serpstack(data)
         except Exception as e: print(f"   [Serpstack] Exception: {e}")
         return None
 
-    async def _query_google_cse(self, query, num):
+    async def _query_google_cse(self, query, num, page=0):
         params = {
             'key': self.api_keys["google_cse"],
             'cx': self.api_keys["google_cx"],
             'q': query,
-            'num': num
+            'num': min(num, 10),
+            **self._page_params("google_cse", page, min(num, 10))
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://www.googleapis.com/customsearch/v1", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.usage["google_cse"] += 1
-                        return self._parse_google_cse(data)
+            response = await http_client.get("https://www.googleapis.com/customsearch/v1", params=params, retries=0)
+            if response.status == 200:
+                data = response.json()
+                return _end_of_listing(
+                    self._parse_google_cse(data),
+                    (data.get("queries") or {}).get("nextPage"),
+                    (data.get("searchInformation") or {}).get("totalResults"), page, min(num, 10)
+                )
         except Exception as e: print(f"   [GoogleCSE] Exception: {e}")
         return None
 
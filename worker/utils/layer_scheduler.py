@@ -0,0 +1,216 @@
+"""
+CLARITY PEARL - LAYER SCHEDULER
+Runs the per-lead enrichment layers as a small dependency graph.
+
+Each layer declares the layers it must wait for (`after`), the lead fields it
+needs (`needs`) and the fields it fills (`provides`). Independent layers run
+concurrently; layers that drive the browser page take the page lock so two of
+them never navigate the same tab at once. Every layer has its own timeout, and
+its timing and outcome are recorded on the lead.
+
+With a company cache entry, fresh cached layers are applied instead of run,
+and completed layers are written back. When a layer fills in the lead's
+website, on_website runs before any layer waiting on it starts (the bridge
+loads that domain's cached layers there). With a stats recorder, every real run
+is measured and adaptive layers only run when the yield policy allows it.
+
+With an EnrichmentGoal, only layers that can fill a target field (and the
+layers they wait on) are scheduled, best yield-per-second first, and a layer
+that hasn't started by the time the goal is met is dropped.
+
+Layer timeouts are capped by the active job budget; once it runs out, layers
+that haven't started are dropped and logged as skipped.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Sequence
+
+from utils.page_pool import get_page_lock
+from utils.quota_ledger import credit_meter
+from utils.time_budget import get_budget
+
+class Layer:
+    """
+    One enrichment step.
+
+    Args:
+        name: Stable key used in timings/stats
+        run: async fn(lead, page) that mutates the lead
+        after: Layer names that must finish first
+        needs: Lead fields that must be present to run (otherwise skipped)
+        provides: Lead fields this layer may fill
+        timeout: Seconds before the layer is abandoned
+        uses_page: True if the layer navigates the browser page itself
+        adaptive: True if the yield policy may pause the layer
+    """
+
+    def __init__(self, name: str, run: Callable[[Dict, object], Awaitable[None]],
+                 after: Sequence[str] = (), needs: Sequence[str] = (), provides: Sequence[str] = (),
+                 timeout: float = 30, uses_page: bool = False, adaptive: bool = False):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        self.needs = tuple(needs)
+        self.provides = tuple(provides)
+        self.timeout = timeout
+        self.uses_page = uses_page
+        self.adaptive = adaptive
+
+
+class LayerScheduler:
+    """
+    Executes a set of layers for one lead.
+    """
+
+    def __init__(self, layers: List[Layer], stats=None):
+        self.layers = {layer.name: layer for layer in layers}
+        self.stats = stats  # Optional LayerStats
+
+    def plan(self, goal=None) -> List[Layer]:
+        """Layers to run, in start order."""
+        layers = list(self.layers.values())
+        if goal is not None:
+            wanted = {layer.name for layer in layers if set(layer.provides) & set(goal.fields)}
+            frontier = list(wanted)
+            while frontier:
+                for dep in self.layers[frontier.pop()].after:
+                    if dep in self.layers and dep not in wanted:
+                        wanted.add(dep)
+                        frontier.append(dep)
+            layers = [layer for layer in layers if layer.name in wanted]
+
+        if self.stats:
+            # Start order decides who gets the page lock first; unmeasured layers keep declared order
+            layers.sort(key=lambda layer: -(self.stats.yield_per_second(layer.name) or 0))
+        return layers
+
+    async def run(self, lead: Dict, page, cache_entry=None, goal=None, on_website=None) -> Dict[str, str]:
+        """
+        Run every layer once its dependencies settle.
+
+        Args:
+            lead: Lead to enrich in place
+            page: Playwright page for page-driving layers
+            cache_entry: Optional CompanyCacheEntry for cross-job reuse
+            goal: Optional EnrichmentGoal; stop starting layers once it is met
+            on_website: Optional async fn() run once a layer providing 'website' has set it
+
+        Returns:
+            layer name -> 'ok' | 'cached' | 'skipped' | 'paused' | 'satisfied' | 'deadline' | 'timeout' | 'error'
+        """
+        if goal is not None and goal.satisfied(lead):
+            lead.setdefault('layer_timings', {})
+            lead['layer_status'] = {}
+            return {}
+
+        planned = self.plan(goal)
+        done = {layer.name: asyncio.Event() for layer in planned}
+        status: Dict[str, str] = {}
+        timings = lead.setdefault('layer_timings', {})
+        page_lock = get_page_lock(page)
+        budget = get_budget()
+
+        async def execute(layer: Layer):
+            try:
+                for dep in layer.after:
+                    if dep in done:
+                        await done[dep].wait()
+
+                if any(not lead.get(field) for field in layer.needs):
+                    status[layer.name] = 'skipped'
+                    return
+
+                if goal is not None and goal.satisfied(lead):
+                    status[layer.name] = 'satisfied'
+                    return
+
+                if cache_entry is not None:
+                    fields = cache_entry.get_fresh(layer.name)
+                    if fields is not None:
+                        self._apply(lead, fields)
+                        status[layer.name] = 'cached'
+                        return
+
+                if layer.adaptive and self.stats and not self.stats.should_run(layer.name):
+                    status[layer.name] = 'paused'
+                    return
+
+                if budget.expired():
+                    status[layer.name] = 'deadline'
+                    budget.note_skip(f"layer.{layer.name}")
+                    return
+
+                await self._timed(layer, lead, page, page_lock, status, timings, cache_entry, goal, budget.cap(layer.timeout))
+            finally:
+                if on_website is not None and "website" in layer.provides and lead.get("website"):
+                    try:
+                        await on_website()
+                    except Exception as e:
+                        print(f"   ⚠️ Website hook after '{layer.name}' failed: {e}")
+                done[layer.name].set()
+
+        await asyncio.gather(*[execute(layer) for layer in planned])
+        lead['layer_status'] = status
+        return status
+
+    async def _timed(self, layer: Layer, lead: Dict, page, page_lock, status: Dict, timings: Dict,
+                     cache_entry=None, goal=None, timeout=None):
+        start = time.monotonic()
+        timeout = layer.timeout if timeout is None else timeout
+
+        async def produce():
+            if layer.uses_page:
+                async with page_lock:
+                    # The goal may have been met while this layer queued for the page
+                    if goal is not None and goal.satisfied(lead):
+                        return None
+                    return await measured()
+            return await measured()
+
+        async def measured():
+            missing = [f for f in layer.provides if not lead.get(f)]
+            meter = [0]
+            credit_meter.set(meter)
+            started = time.monotonic()
+            outcome = 'error'
+            try:
+                await asyncio.wait_for(layer.run(lead, page), timeout=timeout)
+                outcome = 'ok'
+            except asyncio.TimeoutError:
+                # Cut short by the job deadline rather than its own timeout: not the layer's fault
+                outcome = 'timeout' if timeout >= layer.timeout else None
+                raise
+            except asyncio.CancelledError:
+                outcome = None  # Job stopped: says nothing about the layer
+                raise
+            finally:
+                if self.stats and outcome:
+                    filled = sum(1 for f in missing if lead.get(f))
+                    self.stats.record(layer.name, outcome, time.monotonic() - started, filled, meter[0])
+            return {f: lead[f] for f in layer.provides if lead.get(f) not in (None, "", [], {})}
+
+        try:
+            if cache_entry is not None:
+                # Leads of the same company share one run; the others copy its fields
+                fields = await cache_entry.run_once(layer.name, produce)
+                if fields is not None:
+                    self._apply(lead, fields)
+                    cache_entry.store(layer.name, fields)
+            else:
+                fields = await produce()
+            status[layer.name] = 'ok' if fields is not None else 'satisfied'
+        except asyncio.TimeoutError:
+            status[layer.name] = 'timeout'
+            print(f"   ⏱️ Layer '{layer.name}' timed out after {timeout:.0f}s")
+        except Exception as e:
+            status[layer.name] = 'error'
+            print(f"   ⚠️ Layer '{layer.name}' skip: {e}")
+        timings[layer.name] = round(time.monotonic() - start, 2)
+
+    @staticmethod
+    def _apply(lead: Dict, fields: Dict):
+        """Fill fields the lead doesn't already have (never overwrite fresher data)."""
+        for field, value in fields.items():
+            if not lead.get(field):
+                lead[field] = value
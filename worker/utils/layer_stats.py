@@ -0,0 +1,223 @@
+"""
+CLARITY PEARL - LAYER YIELD STATS & POLICY
+Measured yield and cost per enrichment layer, and the policy that acts on it.
+
+Every real layer run (cache hits and skips don't count) records whether it
+filled a field the lead was missing, how long it took and how many search
+credits it spent. Totals are pushed to Supabase `enrichment_layer_stats`
+(atomic increments shared by all workers); a rolling window of recent runs is
+kept in memory for decisions:
+
+- active:   worth running on every lead
+- sampled:  low yield per run or per second, run on SAMPLE_RATE of leads
+- disabled: next to no yield, skipped except for a re-probe every REPROBE_SECONDS
+
+ENABLE_LAYER_*=false still switches a layer off outright (paid APIs, etc.);
+the policy only manages layers that are allowed to run.
+"""
+
+import random
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Recent runs considered per layer
+WINDOW = 40
+# Runs needed before the policy trusts the window (until then: active)
+MIN_ATTEMPTS = 8
+# Hit rate below which a layer is only sampled / fully disabled
+SAMPLE_BELOW = 0.25
+DISABLE_BELOW = 0.05
+# Hits per cost-second below which a layer is sampled even with a decent hit rate
+MIN_HITS_PER_SECOND = 0.01
+# One search credit weighs like this many seconds of layer time
+CREDIT_SECONDS = 5
+# Share of leads a sampled layer still runs on
+SAMPLE_RATE = 0.2
+# How often a disabled layer gets one probe run
+REPROBE_SECONDS = 6 * 3600
+# Buffered runs before counters are pushed to Supabase
+FLUSH_EVERY = 25
+
+COUNTERS = ("attempts", "hits", "fields_filled", "seconds", "credits", "timeouts", "errors")
+
+
+class LayerRecord:
+    def __init__(self):
+        self.window = deque(maxlen=WINDOW)  # (hit, seconds, credits)
+        self.totals = {name: 0 for name in COUNTERS}
+        self.pending = {name: 0 for name in COUNTERS}
+        self.last_run = 0.0
+        self.probing = False
+
+
+class LayerStats:
+    """
+    Per-layer attempts / hit rate / latency / credits plus the enablement policy.
+    Use the module singleton `layer_stats`.
+    """
+
+    def __init__(self, supabase=None):
+        self.supabase = supabase
+        self.layers: Dict[str, LayerRecord] = {}
+        self._unflushed = 0
+        self._loaded = False
+
+    def _record_for(self, layer: str) -> LayerRecord:
+        if not self._loaded:
+            self.load()
+        return self.layers.setdefault(layer, LayerRecord())
+
+    # --- RECORDING ---
+
+    def record(self, layer: str, outcome: str, seconds: float, fields_filled: int, credits: int):
+        """
+        Record one real run of a layer.
+
+        Args:
+            layer: Layer name
+            outcome: 'ok' | 'timeout' | 'error'
+            seconds: Wall time of the run
+            fields_filled: Fields the run filled that the lead was missing
+            credits: Search credits spent during the run
+        """
+        rec = self._record_for(layer)
+        hit = outcome == 'ok' and fields_filled > 0
+        if rec.probing:
+            rec.probing = False
+            if hit:
+                # The layer came back: forget the bad window and let it prove itself again
+                rec.window.clear()
+                print(f"   📈 Layer '{layer}' re-probe hit, re-enabling")
+        rec.window.append((hit, seconds, credits))
+        rec.last_run = time.time()
+
+        delta = {
+            "attempts": 1,
+            "hits": int(hit),
+            "fields_filled": fields_filled,
+            "seconds": seconds,
+            "credits": credits,
+            "timeouts": int(outcome == 'timeout'),
+            "errors": int(outcome == 'error')
+        }
+        for name, value in delta.items():
+            rec.totals[name] += value
+            rec.pending[name] += value
+
+        self._unflushed += 1
+        if self._unflushed >= FLUSH_EVERY:
+            self.flush()
+
+    # --- POLICY ---
+
+    def hit_rate(self, layer: str) -> Optional[float]:
+        rec = self.layers.get(layer)
+        if not rec or not rec.window:
+            return None
+        return sum(1 for hit, _, _ in rec.window if hit) / len(rec.window)
+
+    def yield_per_second(self, layer: str) -> Optional[float]:
+        """Hits per cost-second over the window (credits priced at CREDIT_SECONDS), None if unmeasured."""
+        rec = self.layers.get(layer)
+        if not rec or not rec.window:
+            return None
+        hits = sum(1 for hit, _, _ in rec.window if hit)
+        cost = sum(seconds + CREDIT_SECONDS * credits for _, seconds, credits in rec.window)
+        return hits / max(cost, 0.1)
+
+    def state(self, layer: str) -> str:
+        """'active' | 'sampled' | 'disabled' from the recent window."""
+        rec = self._record_for(layer)
+        if len(rec.window) < MIN_ATTEMPTS:
+            return 'active'  # Still learning
+
+        rate = self.hit_rate(layer)
+        if rate < DISABLE_BELOW:
+            return 'disabled'
+        if rate < SAMPLE_BELOW or self.yield_per_second(layer) < MIN_HITS_PER_SECOND:
+            return 'sampled'
+        return 'active'
+
+    def should_run(self, layer: str) -> bool:
+        """Decide whether this lead gets the layer."""
+        state = self.state(layer)
+        if state == 'active':
+            return True
+        if state == 'sampled':
+            return random.random() < SAMPLE_RATE
+
+        rec = self.layers[layer]
+        if time.time() - rec.last_run >= REPROBE_SECONDS:
+            # Claim the probe now so concurrent leads don't all take it
+            rec.last_run = time.time()
+            rec.probing = True
+            return True
+        return False
+
+    # --- PERSISTENCE ---
+
+    def load(self):
+        """Seed windows from the shared totals so a restart doesn't re-learn from scratch."""
+        self._loaded = True
+        if not self.supabase:
+            return
+        try:
+            res = self.supabase.table('enrichment_layer_stats').select('*').execute()
+        except Exception as e:
+            print(f"⚠️ Layer stats load failed: {e}")
+            return
+
+        for row in res.data or []:
+            attempts = int(row.get('attempts') or 0)
+            if not attempts:
+                continue
+            rec = self.layers.setdefault(row['layer'], LayerRecord())
+            runs = min(attempts, WINDOW)
+            hits = round(runs * (row.get('hits') or 0) / attempts)
+            seconds = float(row.get('seconds') or 0) / attempts
+            credits = round((row.get('credits') or 0) / attempts)
+            rec.window.extend([(True, seconds, credits)] * hits + [(False, seconds, credits)] * (runs - hits))
+
+    def flush(self):
+        """Push buffered counter increments to Supabase."""
+        self._unflushed = 0
+        if not self.supabase:
+            return
+        for layer, rec in self.layers.items():
+            if not rec.pending["attempts"]:
+                continue
+            try:
+                self.supabase.rpc('fn_record_layer_stats', {
+                    'p_layer': layer,
+                    'p_attempts': rec.pending["attempts"],
+                    'p_hits': rec.pending["hits"],
+                    'p_fields_filled': rec.pending["fields_filled"],
+                    'p_seconds': round(rec.pending["seconds"], 2),
+                    'p_credits': rec.pending["credits"],
+                    'p_timeouts': rec.pending["timeouts"],
+                    'p_errors': rec.pending["errors"],
+                    'p_state': self.state(layer)
+                }).execute()
+                rec.pending = {name: 0 for name in COUNTERS}
+            except Exception as e:
+                print(f"⚠️ Layer stats flush failed for {layer}: {e}")
+
+    # --- REPORTING ---
+
+    def get_stats(self) -> Dict:
+        stats = {}
+        for layer, rec in self.layers.items():
+            runs = len(rec.window)
+            stats[layer] = {
+                "state": self.state(layer),
+                "hit_rate": round(self.hit_rate(layer) or 0, 2),
+                "avg_seconds": round(sum(s for _, s, _ in rec.window) / runs, 2) if runs else 0,
+                "avg_credits": round(sum(c for _, _, c in rec.window) / runs, 2) if runs else 0,
+                "attempts": rec.totals["attempts"]
+            }
+        return stats
+
+
+# Singleton instance
+layer_stats = LayerStats()
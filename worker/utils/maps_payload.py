@@ -0,0 +1,203 @@
+"""
+CLARITY PEARL - GOOGLE MAPS PAYLOAD DECODER
+Structured places from the JSON Google Maps loads its results with.
+
+Maps fetches listings from `/search?tbm=map` (and embeds the first page in
+`window.APP_INITIALIZATION_STATE`) as XSSI-guarded, deeply nested arrays.
+There are no keys, only positions, so places are recognised by shape: an
+array with the name at [11] and [null, null, lat, lng] at [9]. Everything else
+is read with bounds-checked lookups; a field Google moves comes back empty
+instead of breaking the decode.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+XSSI_PREFIX = ")]}'"
+INIT_STATE_RE = re.compile(r"window\.APP_INITIALIZATION_STATE\s*=\s*(\[.*?\]);window\.APP_", re.S)
+# Nesting deeper than this is never a results payload
+MAX_DEPTH = 40
+
+
+def is_results_response(url: str) -> bool:
+    """Responses worth decoding: result pages (XHR) and the initial search document."""
+    return "tbm=map" in url or "/maps/search/" in url or "/maps/preview/place" in url
+
+
+def decode_places(body: str) -> List[Dict]:
+    """All places in a Maps response body (XHR JSON or the search page HTML), in payload order."""
+    places = []
+    seen = set()
+    for root in _payloads(body):
+        for node in _walk(root):
+            place = _place(node)
+            if place and place["_key"] not in seen:
+                seen.add(place.pop("_key"))
+                places.append(place)
+    return places
+
+
+def _payloads(body: str):
+    """JSON roots in a body; strings that are themselves XSSI-guarded JSON are unwrapped too."""
+    body = body.strip()
+    if body.startswith("<") or "APP_INITIALIZATION_STATE" in body[:200000]:
+        match = INIT_STATE_RE.search(body)
+        if not match:
+            return
+        candidates = [match.group(1)]
+    else:
+        candidates = [body]
+
+    while candidates:
+        text = candidates.pop()
+        text = text.strip()
+        if text.startswith(XSSI_PREFIX):
+            text = text[len(XSSI_PREFIX):]
+        if text.endswith('/*""*/'):
+            text = text[:-6]
+        try:
+            root = json.loads(text)
+        except ValueError:
+            continue
+        yield root
+        # Nested payloads: {"d": ")]}'\n[...]"} wrappers and init-state strings
+        for node in _walk(root, strings=True):
+            if isinstance(node, str) and node.startswith(XSSI_PREFIX):
+                candidates.append(node)
+
+
+def _walk(root, strings: bool = False):
+    """Every list (or string, if asked) in the tree, depth-first without recursion."""
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, list):
+            if not strings:
+                yield node
+            if depth < MAX_DEPTH:
+                stack.extend((child, depth + 1) for child in reversed(node) if isinstance(child, (list, dict, str)))
+        elif isinstance(node, dict):
+            if depth < MAX_DEPTH:
+                stack.extend((child, depth + 1) for child in node.values() if isinstance(child, (list, dict, str)))
+        elif strings:
+            yield node
+
+
+def _at(node: Any, *path) -> Any:
+    for index in path:
+        if not isinstance(node, list) or not -len(node) <= index < len(node):
+            return None
+        node = node[index]
+    return node
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _place(node: list) -> Optional[Dict]:
+    name = _text(_at(node, 11))
+    lat, lng = _at(node, 9, 2), _at(node, 9, 3)
+    if not name or not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+        return None
+
+    address = _text(_at(node, 39)) or _text(_at(node, 18))
+    if not address:
+        parts = _at(node, 2)
+        if isinstance(parts, list) and all(isinstance(p, str) for p in parts):
+            address = ", ".join(parts) or None
+
+    rating = _at(node, 4, 7)
+    reviews = _at(node, 4, 8)
+    website = _text(_at(node, 7, 0))
+    phone = _text(_at(node, 178, 0, 0)) or _text(_at(node, 178, 0, 3))
+    categories = [c for c in (_at(node, 13) or []) if isinstance(c, str)]
+    place_id = _text(_at(node, 78))
+    cid = _text(_at(node, 10))
+
+    if place_id:
+        source_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+    else:
+        source_url = "https://www.google.com/maps/search/" + re.sub(r"\s+", "+", name)
+    rating_text = f"{rating}({reviews})" if isinstance(rating, (int, float)) and isinstance(reviews, int) else (str(rating) if rating else "N/A")
+
+    return {
+        "_key": place_id or cid or f"{name.lower()}|{lat:.5f}|{lng:.5f}",
+        "name": name,
+        "rating": rating_text,
+        "reviews_count": reviews if isinstance(reviews, int) else 0,
+        "address": address or "Unknown",
+        "phone": phone or "N/A",
+        "website": website,
+        "category": categories[0] if categories else None,
+        "categories": categories,
+        "place_id": place_id,
+        "geo_lat": lat,
+        "geo_lng": lng,
+        "source_url": source_url,
+        "verified": True,
+        "capture": "network",
+        "snippet": f"{name} ({rating_text}) - {address or 'Unknown'}"
+    }
+
+
+class ResponseCapture:
+    """
+    Collects places from a page's Maps responses while attached.
+
+        capture = ResponseCapture()
+        capture.attach(page)
+        ... navigate / scroll ...
+        places = await capture.places()
+        capture.detach()
+    """
+
+    def __init__(self):
+        self.page = None
+        self.pending = set()
+        self.found: Dict[str, Dict] = {}
+        self.responses = 0
+
+    def attach(self, page):
+        self.page = page
+        page.on("response", self._on_response)
+
+    def detach(self):
+        if self.page is None:
+            return
+        try:
+            self.page.remove_listener("response", self._on_response)
+        except Exception:
+            pass
+        for task in list(self.pending):
+            task.cancel()
+        self.pending.clear()
+        self.page = None
+
+    async def places(self, timeout: float = 3.0) -> List[Dict]:
+        """Places decoded so far, after letting in-flight bodies finish (bounded by timeout)."""
+        if self.pending:
+            await asyncio.wait(list(self.pending), timeout=timeout)
+        return list(self.found.values())
+
+    def _on_response(self, response):
+        try:
+            if response.status != 200 or not is_results_response(response.url):
+                return
+        except Exception:
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _read(self, response):
+        try:
+            body = await response.text()
+        except Exception:
+            return  # Navigated away / body evicted
+        self.responses += 1
+        for place in decode_places(body):
+            key = place["place_id"] or f"{place['name'].lower()}|{place['geo_lat']:.5f}|{place['geo_lng']:.5f}"
+            self.found.setdefault(key, place)
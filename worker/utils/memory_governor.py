@@ -0,0 +1,134 @@
+"""
+CLARITY PEARL - MEMORY GOVERNOR
+Keeps concurrency inside the container's RAM budget (Render free tier: 512MB).
+
+Usage is read from the cgroup when available (it covers Chromium's child
+processes too), otherwise from the RSS of this process tree in /proc.
+Callers ask how many extra units (browser pages, etc.) they may run.
+"""
+
+import os
+from typing import Dict, Optional
+
+# Container budget, overridable per deployment
+DEFAULT_LIMIT_MB = int(os.getenv("MEMORY_LIMIT_MB", "512"))
+# Rough resident cost of one extra Chromium page doing enrichment
+PAGE_COST_MB = int(os.getenv("PAGE_COST_MB", "80"))
+# Kept free for the Python side, parsing spikes and the GC
+RESERVE_MB = 96
+# Fraction of the limit above which we stop adding work
+PRESSURE_RATIO = 0.85
+
+_CGROUP_USAGE = ("/sys/fs/cgroup/memory.current", "/sys/fs/cgroup/memory/memory.usage_in_bytes")
+_CGROUP_LIMIT = ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes")
+
+
+class MemoryGovernor:
+    """
+    Turns current memory usage into a concurrency allowance.
+    """
+
+    def __init__(self, limit_mb: Optional[int] = None):
+        self.limit_mb = limit_mb or self._cgroup_limit_mb() or DEFAULT_LIMIT_MB
+
+    # --- MEASUREMENT ---
+
+    def _read_int(self, path: str) -> Optional[int]:
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+            return int(raw) if raw.isdigit() else None
+        except Exception:
+            return None
+
+    def _cgroup_limit_mb(self) -> Optional[int]:
+        for path in _CGROUP_LIMIT:
+            value = self._read_int(path)
+            # Unlimited cgroups report "max" or a huge sentinel
+            if value and value < (1 << 50):
+                return min(value // (1024 * 1024), DEFAULT_LIMIT_MB)
+        return None
+
+    def _process_tree_rss_mb(self) -> Optional[float]:
+        """RSS of this process plus descendants (Chromium), from /proc."""
+        try:
+            parents: Dict[int, int] = {}
+            for entry in os.listdir("/proc"):
+                if not entry.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        # Field 4 is the ppid; the command name may contain spaces, so split after ')'
+                        parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                except Exception:
+                    continue
+
+            tree, frontier = {os.getpid()}, [os.getpid()]
+            while frontier:
+                parent = frontier.pop()
+                for pid, ppid in parents.items():
+                    if ppid == parent and pid not in tree:
+                        tree.add(pid)
+                        frontier.append(pid)
+
+            total_kb = 0
+            for pid in tree:
+                try:
+                    with open(f"/proc/{pid}/status") as f:
+                        for line in f:
+                            if line.startswith("VmRSS:"):
+                                total_kb += int(line.split()[1])
+                                break
+                except Exception:
+                    continue
+            return total_kb / 1024
+        except Exception:
+            return None
+
+    def used_mb(self) -> Optional[float]:
+        for path in _CGROUP_USAGE:
+            value = self._read_int(path)
+            if value:
+                return value / (1024 * 1024)
+        return self._process_tree_rss_mb()
+
+    # --- POLICY ---
+
+    def headroom_mb(self) -> Optional[float]:
+        used = self.used_mb()
+        if used is None:
+            return None
+        return self.limit_mb - RESERVE_MB - used
+
+    def max_concurrency(self, requested: int, unit_cost_mb: int = PAGE_COST_MB) -> int:
+        """
+        How many concurrent units (including the one already running) fit right now.
+
+        Args:
+            requested: Desired concurrency
+            unit_cost_mb: Estimated memory per additional unit
+
+        Returns:
+            Between 1 and requested
+        """
+        headroom = self.headroom_mb()
+        if headroom is None:
+            # Can't measure: stay conservative
+            return max(1, min(requested, 2))
+        return max(1, min(requested, 1 + int(headroom // unit_cost_mb)))
+
+    def under_pressure(self) -> bool:
+        used = self.used_mb()
+        return used is not None and used >= self.limit_mb * PRESSURE_RATIO
+
+    def get_status(self) -> Dict:
+        used = self.used_mb()
+        return {
+            "limit_mb": self.limit_mb,
+            "used_mb": round(used, 1) if used is not None else None,
+            "under_pressure": self.under_pressure()
+        }
+
+
+# Singleton instance
+memory_governor = MemoryGovernor()
@@ -1,5 +1,6 @@
 import re
 import asyncio
+from utils.contact_extractor import extract_contacts, summarize
 
 class OfflineContactDiscovery:
     """
@@ -19,17 +20,8 @@ class OfflineContactDiscovery:
             # Get page content
             content = await self.page.content()
             
-            # Email regex pattern
-            email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            
-            # Find all emails
-            emails = re.findall(email_pattern, content.lower())
-            
-            # Filter out common false positives
-            exclude_patterns = ['example.com', 'domain.com', 'email.com', 'test.com', 'jpg', 'png', 'svg']
-            filtered = [e for e in emails if not any(ex in e for ex in exclude_patterns)]
-            
-            return list(set(filtered))  # Deduplicate
+            # One pass; image names / placeholder domains are filtered by the extractor
+            return summarize(extract_contacts(content))["emails"]
         except:
             return []
     
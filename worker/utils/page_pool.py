@@ -0,0 +1,82 @@
+"""
+CLARITY PEARL - PAGE LOCKS & PAGE LEASING
+Safe browser access for code that fans out over one Playwright page.
+
+Every page has one lock; whoever navigates it holds the lock. When a fan-out
+(omega sweep, unified_* enrichers, parallel layers) needs the browser while
+the shared page is busy, it leases a dedicated page from the same context
+instead of queueing behind the lock. Leases are capped per context and by the
+memory governor; past the cap, callers fall back to waiting for the shared page.
+"""
+
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager
+
+from utils.memory_governor import memory_governor
+
+# Extra pages one browser context may lend out at once
+MAX_LEASED_PAGES = int(os.getenv("MAX_LEASED_PAGES", "3"))
+
+_page_locks = weakref.WeakKeyDictionary()
+_leased = weakref.WeakKeyDictionary()  # context -> pages currently lent out
+
+
+def get_page_lock(page) -> asyncio.Lock:
+    """One lock per Playwright page, shared by everything that navigates it."""
+    lock = _page_locks.get(page)
+    if lock is None:
+        lock = asyncio.Lock()
+        _page_locks[page] = lock
+    return lock
+
+
+@asynccontextmanager
+async def lease_page(page):
+    """
+    A page that is safe to navigate for the duration of the block.
+
+    Yields the shared page itself (under its lock) when it's free, a freshly
+    opened page from the same context when it's busy and the caps allow,
+    otherwise the shared page once its lock frees up.
+    """
+    lock = get_page_lock(page)
+    if not lock.locked():
+        async with lock:
+            yield page
+        return
+
+    extra = await _open_extra(page)
+    if extra is None:
+        async with lock:
+            yield page
+        return
+
+    try:
+        async with get_page_lock(extra):
+            yield extra
+    finally:
+        _leased[page.context] = _leased.get(page.context, 0) - 1
+        try:
+            await extra.close()
+        except Exception:
+            pass
+
+
+async def _open_extra(page):
+    try:
+        context = page.context
+    except Exception:
+        return None
+    if _leased.get(context, 0) >= MAX_LEASED_PAGES or memory_governor.under_pressure():
+        return None
+    # Reserve the slot before awaiting so concurrent callers respect the cap
+    _leased[context] = _leased.get(context, 0) + 1
+    try:
+        return await context.new_page()
+    except Exception as e:
+        _leased[context] -= 1
+        print(f"   ⚠️ Page pool: could not open a leased page: {e}")
+        return None
+
@@ -0,0 +1,133 @@
+"""
+CLARITY PEARL - ADAPTIVE PROVIDER ROUTER
+Bandit-style ordering of the Hydra search providers.
+
+Each provider is scored per query type on rolling latency, success rate,
+result yield and remaining quota. Unmeasured providers start from a modest
+prior (ties broken by the static preference order) and an upper-confidence
+bonus keeps occasionally re-checking the ones that fell behind.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional
+
+# Weight of the newest observation in the rolling averages
+EWMA_ALPHA = 0.2
+# Exploration strength of the UCB bonus
+EXPLORATION = 0.35
+# Results we consider a "full" page when normalising yield
+TARGET_YIELD = 10
+# Optimistic-but-modest value assumed for a provider we haven't measured yet
+PRIOR_VALUE = 0.2
+
+
+class ProviderStats:
+    """Rolling performance of one provider for one query type."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.empty = 0
+        self.avg_latency = 0.0
+        self.avg_results = 0.0
+        self.last_used = None
+
+    def record(self, latency: float, result_count: Optional[int]):
+        ok = result_count is not None
+        self.attempts += 1
+        if ok:
+            self.successes += 1
+            if result_count == 0:
+                self.empty += 1
+        count = result_count or 0
+        if self.attempts == 1:
+            self.avg_latency = latency
+            self.avg_results = count
+        else:
+            self.avg_latency += EWMA_ALPHA * (latency - self.avg_latency)
+            self.avg_results += EWMA_ALPHA * (count - self.avg_results)
+        self.last_used = time.time()
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing so a single failure doesn't bury a provider
+        return (self.successes + 1) / (self.attempts + 2)
+
+    def value(self) -> float:
+        """Expected useful results per second, normalised to roughly 0..1."""
+        yield_score = min(1.0, self.avg_results / TARGET_YIELD)
+        return self.success_rate * yield_score / (1.0 + self.avg_latency)
+
+    def to_dict(self) -> Dict:
+        return {
+            "attempts": self.attempts,
+            "success_rate": round(self.success_rate, 3),
+            "empty_rate": round(self.empty / self.attempts, 3) if self.attempts else 0,
+            "avg_latency_s": round(self.avg_latency, 3),
+            "avg_results": round(self.avg_results, 2),
+            "score": round(self.value(), 4),
+            "last_used": self.last_used
+        }
+
+
+class ProviderRouter:
+    """
+    Picks the provider order for each query from observed behaviour.
+    """
+
+    def __init__(self, quota=None):
+        self.quota = quota
+        self.stats: Dict[str, Dict[str, ProviderStats]] = {}
+
+    @staticmethod
+    def classify(query: str, type: str = "search") -> str:
+        """Query type used to bucket stats: 'maps', 'news', 'dork' or 'search'."""
+        if type != "search":
+            return type
+        return "dork" if "site:" in query else "search"
+
+    def _get(self, provider: str, query_type: str) -> ProviderStats:
+        return self.stats.setdefault(query_type, {}).setdefault(provider, ProviderStats())
+
+    def _quota_weight(self, provider: str) -> float:
+        if not self.quota:
+            return 1.0
+        # Keep scarce budgets for when the roomy ones are struggling
+        return 0.25 + 0.75 * self.quota.remaining_fraction(provider)
+
+    def rank(self, providers: List[str], query_type: str) -> List[str]:
+        """
+        Order candidate providers for a query type, best first.
+
+        Args:
+            providers: Candidates in static preference order (used as tie-break)
+            query_type: Bucket from classify()
+
+        Returns:
+            The same providers, reordered
+        """
+        bucket = self.stats.get(query_type, {})
+        total = sum(s.attempts for s in bucket.values()) or 1
+
+        def score(item):
+            index, provider = item
+            stats = bucket.get(provider)
+            attempts = stats.attempts if stats else 0
+            value = stats.value() if attempts else PRIOR_VALUE
+            bonus = EXPLORATION * math.sqrt(math.log(total + 1) / max(attempts, 1))
+            return ((value + bonus) * self._quota_weight(provider), -index)
+
+        ranked = sorted(enumerate(providers), key=score, reverse=True)
+        return [provider for _, provider in ranked]
+
+    def record(self, provider: str, query_type: str, latency: float, results: Optional[list]):
+        """Feed back one attempt. results=None means the request failed."""
+        self._get(provider, query_type).record(latency, None if results is None else len(results))
+
+    def export_stats(self) -> Dict:
+        """Per-provider, per-query-type stats for dashboards."""
+        return {
+            query_type: {provider: stats.to_dict() for provider, stats in bucket.items()}
+            for query_type, bucket in self.stats.items()
+        }
@@ -0,0 +1,261 @@
+"""
+CLARITY PEARL - PROVIDER QUOTA LEDGER
+Shared, persistent free-tier accounting for the Hydra search providers.
+
+Counters live in Supabase (`provider_quota_usage`) and are incremented atomically
+through `fn_lease_provider_quota`. Each worker leases a small block of calls at a
+time and spends it locally, so the hot path never waits on a DB round trip.
+Without Supabase the ledger falls back to a local JSON state file so restarts
+still don't re-spend the budget.
+"""
+
+import json
+import os
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Real free-tier windows per provider: (period, limit).
+# period is 'day' (resets 00:00 UTC), 'month' (resets on the 1st) or 'total' (one-off credits).
+PROVIDER_QUOTAS: Dict[str, List[Tuple[str, int]]] = {
+    "serper": [("total", 2500)],       # 2500 one-off free credits
+    "searchapi": [("total", 100)],     # 100 one-off free requests
+    "hasdata": [("total", 100)],       # 100 one-off credits
+    "scrapingdog": [("total", 1000)],  # 1000 one-off requests
+    "serpapi": [("month", 250)],       # 250 / month
+    "scraperapi": [("month", 1000)],   # 1000 / month
+    "zenserp": [("month", 50)],        # 50 / month
+    "serpstack": [("month", 100)],     # 100 / month
+    "google_cse": [("day", 100)],      # 100 / day
+}
+
+# Largest block of calls a single worker may hold without touching the DB
+MAX_LEASE = 25
+
+# Per-task spend counter: set a one-item list to attribute calls to the work that made them
+credit_meter: ContextVar[Optional[List[int]]] = ContextVar("credit_meter", default=None)
+
+
+class QuotaLedger:
+    """
+    Tracks provider spend across restarts and replicas using leased allowances.
+    """
+
+    def __init__(self, supabase=None, state_file: str = 'provider_quota_state.json'):
+        self.supabase = supabase
+        self.state_file = state_file
+        self.quotas = PROVIDER_QUOTAS
+
+        # Local leased allowance: provider -> remaining calls, bound to the period keys it was leased for
+        self._allowance: Dict[str, int] = {}
+        self._lease_keys: Dict[str, Tuple[str, ...]] = {}
+        # Providers known to be exhausted for the current period keys
+        self._exhausted: Dict[str, Tuple[str, ...]] = {}
+        # Calls actually spent by this process (for status reporting)
+        self._spent: Dict[str, int] = {}
+
+    # --- PERIODS ---
+
+    def _period_key(self, period: str, now: Optional[datetime] = None) -> str:
+        now = now or datetime.now(timezone.utc)
+        if period == "day":
+            return now.strftime("%Y-%m-%d")
+        if period == "month":
+            return now.strftime("%Y-%m")
+        return "all"
+
+    def _current_keys(self, provider: str) -> Tuple[str, ...]:
+        return tuple(self._period_key(period) for period, _ in self.quotas.get(provider, []))
+
+    def _lease_size(self, provider: str) -> int:
+        smallest = min(limit for _, limit in self.quotas[provider])
+        return max(1, min(MAX_LEASE, smallest // 20))
+
+    # --- HOT PATH ---
+
+    def try_acquire(self, provider: str) -> bool:
+        """
+        Reserve one call for a provider.
+
+        Args:
+            provider: Provider name (e.g. 'serper')
+
+        Returns:
+            True if the call fits in the shared quota, False if exhausted
+        """
+        if provider not in self.quotas:
+            return False
+
+        keys = self._current_keys(provider)
+        if self._lease_keys.get(provider) != keys:
+            # Period rolled over (or first use): any old allowance belongs to a dead window
+            self._allowance[provider] = 0
+            self._spent[provider] = 0
+            self._lease_keys[provider] = keys
+
+        if self._exhausted.get(provider) == keys:
+            return False
+
+        if self._allowance.get(provider, 0) <= 0:
+            granted = self._lease(provider, keys)
+            if granted <= 0:
+                self._exhausted[provider] = keys
+                print(f"   [Quota] {provider} exhausted for {'/'.join(keys)}.")
+                return False
+            self._allowance[provider] = granted
+
+        self._allowance[provider] -= 1
+        self._spent[provider] = self._spent.get(provider, 0) + 1
+        meter = credit_meter.get()
+        if meter is not None:
+            meter[0] += 1
+        return True
+
+    def refund(self, provider: str):
+        """Return a reserved call that was never charged (request failed before billing)."""
+        if self._lease_keys.get(provider) == self._current_keys(provider):
+            self._allowance[provider] = self._allowance.get(provider, 0) + 1
+            self._spent[provider] = max(0, self._spent.get(provider, 0) - 1)
+            meter = credit_meter.get()
+            if meter is not None:
+                meter[0] = max(0, meter[0] - 1)
+
+    def mark_exhausted(self, provider: str):
+        """Provider reported a quota error: stop using it until its window rolls over."""
+        if provider in self.quotas:
+            self._exhausted[provider] = self._current_keys(provider)
+            self._allowance[provider] = 0
+
+    def remaining_fraction(self, provider: str) -> float:
+        """Rough share of quota left, from local knowledge only (no DB call)."""
+        if provider not in self.quotas:
+            return 0.0
+        if self._exhausted.get(provider) == self._current_keys(provider):
+            return 0.0
+        smallest = min(limit for _, limit in self.quotas[provider])
+        spent = self._spent.get(provider, 0)
+        return max(0.0, 1.0 - spent / smallest) if smallest else 0.0
+
+    # --- LEASING ---
+
+    def _lease(self, provider: str, keys: Tuple[str, ...]) -> int:
+        """Atomically claim a block of calls in every window of the provider."""
+        amount = self._lease_size(provider)
+        granted = amount
+        for (period, limit), key in zip(self.quotas[provider], keys):
+            window_grant = self._lease_window(provider, period, key, min(amount, granted), limit)
+            granted = min(granted, window_grant)
+            if granted <= 0:
+                break
+        return granted
+
+    def _lease_window(self, provider: str, period: str, key: str, amount: int, limit: int) -> int:
+        if self.supabase:
+            try:
+                res = self.supabase.rpc('fn_lease_provider_quota', {
+                    'p_provider': provider,
+                    'p_period': period,
+                    'p_period_key': key,
+                    'p_amount': amount,
+                    'p_limit': limit
+                }).execute()
+                return int(res.data or 0)
+            except Exception as e:
+                print(f"⚠️ Quota lease failed for {provider} (falling back to local ledger): {e}")
+
+        state = self._load_state()
+        slot = f"{provider}|{period}|{key}"
+        used = state.get(slot, 0)
+        granted = max(0, min(amount, limit - used))
+        if granted:
+            state[slot] = used + granted
+            self._save_state(state)
+        return granted
+
+    def release_unused(self):
+        """Give unspent leased calls back to the shared pool (call on worker shutdown)."""
+        for provider, remaining in list(self._allowance.items()):
+            keys = self._lease_keys.get(provider)
+            if remaining <= 0 or keys != self._current_keys(provider):
+                continue
+            for (period, _), key in zip(self.quotas[provider], keys):
+                if self.supabase:
+                    try:
+                        self.supabase.rpc('fn_release_provider_quota', {
+                            'p_provider': provider,
+                            'p_period': period,
+                            'p_period_key': key,
+                            'p_amount': remaining
+                        }).execute()
+                        continue
+                    except Exception as e:
+                        print(f"⚠️ Quota release failed for {provider}: {e}")
+                state = self._load_state()
+                slot = f"{provider}|{period}|{key}"
+                state[slot] = max(0, state.get(slot, 0) - remaining)
+                self._save_state(state)
+            self._allowance[provider] = 0
+
+    # --- LOCAL STATE (No Supabase) ---
+
+    def _load_state(self) -> Dict[str, int]:
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️ Failed to load quota state: {e}")
+        return {}
+
+    def _save_state(self, state: Dict[str, int]):
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump(state, f)
+        except Exception as e:
+            print(f"⚠️ Failed to save quota state: {e}")
+
+    # --- REPORTING ---
+
+    def get_status(self) -> Dict:
+        """
+        Current quota usage for every provider and window.
+
+        Returns:
+            Dict keyed by provider with per-window used/limit/remaining plus local lease info
+        """
+        rows = {}
+        if self.supabase:
+            try:
+                res = self.supabase.table('provider_quota_usage').select('provider, period, period_key, used').execute()
+                for row in res.data or []:
+                    rows[f"{row['provider']}|{row['period']}|{row['period_key']}"] = row.get('used', 0)
+            except Exception as e:
+                print(f"⚠️ Failed to read quota usage: {e}")
+        else:
+            rows = self._load_state()
+
+        status = {}
+        for provider, windows in self.quotas.items():
+            keys = self._current_keys(provider)
+            window_status = []
+            for (period, limit), key in zip(windows, keys):
+                used = rows.get(f"{provider}|{period}|{key}", 0)
+                window_status.append({
+                    'period': period,
+                    'period_key': key,
+                    'used': used,
+                    'limit': limit,
+                    'remaining': max(0, limit - used),
+                    'usage_percent': round(used / limit * 100, 1) if limit else 0
+                })
+            status[provider] = {
+                'windows': window_status,
+                'local_allowance': self._allowance.get(provider, 0) if self._lease_keys.get(provider) == keys else 0,
+                'spent_this_process': self._spent.get(provider, 0),
+                'exhausted': self._exhausted.get(provider) == keys
+            }
+        return status
+
+
+# Singleton instance
+quota_ledger = QuotaLedger()
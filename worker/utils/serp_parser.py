@@ -0,0 +1,263 @@
+"""
+CLARITY PEARL - SERP PARSER
+Search result pages (Google, Bing, DuckDuckGo) -> normalized result records.
+
+The engines used to walk results in the browser: query_selector_all, then
+get_attribute / inner_text / evaluate_handle awaits per link, each one a CDP
+round trip. Here the page HTML is read once (`page.content()`) and parsed in
+Python. Every engine's selectors live in one table, and both Google layouts
+(desktop `div.g` and the Basic HTML `div.ZINbbc` served when we're throttled)
+are recognised in the same pass, so callers don't detect layouts themselves.
+
+Scripts and styles are cut out with one regex before parsing; a results page
+is mostly inline JS.
+"""
+
+import base64
+import re
+import urllib.parse
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+# Inline JS/CSS is most of a SERP's bytes and holds no results
+INVISIBLE_RE = re.compile(r"<(script|style|noscript|svg)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+WHITESPACE_RE = re.compile(r"\s+")
+# Elements innerText separates from their neighbours
+BLOCK_TAGS = {"address", "article", "br", "cite", "dd", "div", "dt", "h1", "h2", "h3", "h4", "h5", "h6", "header", "li", "p", "section", "td", "tr"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+Matcher = Callable[[str, Dict[str, str], set], bool]
+
+
+def _has_class(*names) -> Matcher:
+    return lambda tag, attrs, classes: tag != "a" and any(n in classes for n in names)
+
+
+def _tag_class(tag_name: str, *names) -> Matcher:
+    return lambda tag, attrs, classes: tag == tag_name and (not names or any(n in classes for n in names))
+
+
+# Per engine: what a result container is, which element is its title and
+# which holds the snippet, plus labels whose text is not part of the result
+# (Bing's "Web" caption badge). The result link is the anchor around (or
+# holding) the title; containers without one are dropped.
+ENGINES = {
+    "google": {
+        # Desktop `div.g`, Basic HTML `div.ZINbbc`
+        "container": _has_class("g", "ZINbbc"),
+        "title": lambda tag, attrs, classes: tag == "h3" or (tag == "div" and "vvjwJb" in classes),
+        "snippet": lambda tag, attrs, classes: "s3v9rd" in classes or "VwiC3b" in classes,
+    },
+    "bing": {
+        "container": _tag_class("li", "b_algo"),
+        "title": _tag_class("h2"),
+        "snippet": lambda tag, attrs, classes: (tag == "p" and not classes) or "b_caption" in classes or "b_lineclamp2" in classes,
+        "skip": _has_class("algoSlug_icon"),
+    },
+    "ddg": {
+        "container": lambda tag, attrs, classes: (tag == "article" and attrs.get("data-testid") == "result") or "result" in classes,
+        "title": lambda tag, attrs, classes: attrs.get("data-testid") == "result-title-a" or "result__a" in classes,
+        "snippet": lambda tag, attrs, classes: attrs.get("data-result") == "snippet" or "result__snippet" in classes,
+    },
+}
+
+
+class SerpResult:
+    """One organic result. `text` is the container's whole text (what the old inner_text() of it gave)."""
+
+    __slots__ = ("url", "title", "snippet", "text", "image", "position")
+
+    def __init__(self, url: str, title: str, snippet: str, text: str, image: Optional[str], position: int):
+        self.url = url
+        self.title = title
+        self.snippet = snippet
+        self.text = text
+        self.image = image
+        self.position = position
+
+    def __repr__(self):
+        return f"SerpResult({self.position}: {self.title!r} {self.url})"
+
+
+class _Record:
+    __slots__ = ("depth", "order", "url", "title", "snippet", "text", "image", "link_href", "link_text",
+                 "in_title", "in_snippet", "in_link", "in_skip", "title_link")
+
+    def __init__(self, depth, order):
+        self.depth = depth
+        self.order = order
+        self.url = None
+        self.title = []
+        self.snippet = []
+        self.text = []
+        self.image = None
+        self.link_href = None
+        self.link_text = []
+        self.in_title = 0   # depth of the open title element (0 = none)
+        self.in_snippet = 0
+        self.in_link = 0
+        self.in_skip = 0
+        self.title_link = False  # url came from the anchor around/inside the title
+
+
+class _SerpHTMLParser(HTMLParser):
+    def __init__(self, engine: Dict):
+        super().__init__(convert_charrefs=True)
+        self.engine = engine
+        self.stack: List[str] = []
+        self.open: List[_Record] = []  # innermost last
+        self.records: List[_Record] = []
+        self.opened = 0
+
+    def handle_starttag(self, tag, attr_list):
+        if tag in BLOCK_TAGS:
+            self._gap()
+        attrs = {k: v or "" for k, v in attr_list}
+        classes = set(attrs.get("class", "").split())
+        engine = self.engine
+
+        if tag in VOID_TAGS:
+            if tag == "img" and self.open and self.open[-1].image is None:
+                src = attrs.get("src") or attrs.get("data-src")
+                if src and not src.startswith("data:image/gif"):
+                    self.open[-1].image = src
+            return
+
+        self.stack.append(tag)
+        depth = len(self.stack)
+        if engine["container"](tag, attrs, classes):
+            self.opened += 1
+            self.open.append(_Record(depth, self.opened))
+            return
+        if not self.open:
+            return
+
+        record = self.open[-1]
+        if tag == "a" and attrs.get("href"):
+            href = attrs["href"]
+            if record.in_title and not record.title_link:
+                # <h3><a href>title</a></h3> (Bing) or <a data-testid=result-title-a> (DDG)
+                record.url, record.title_link = href, True
+            elif not record.in_link:
+                record.in_link = depth
+                record.link_href = href
+                if record.url is None:
+                    record.url = href
+                    record.link_text = []
+        if not record.in_title and engine["title"](tag, attrs, classes):
+            record.in_title = depth
+            record.title = []
+            if tag == "a" and attrs.get("href"):
+                record.url, record.title_link = attrs["href"], True
+            elif record.in_link and not record.title_link:
+                # <a href><h3>title</h3></a> (Google): the enclosing link is the result
+                record.url, record.title_link = record.link_href, True
+        if not record.in_snippet and engine["snippet"](tag, attrs, classes):
+            record.in_snippet = depth
+        if not record.in_skip and "skip" in engine and engine["skip"](tag, attrs, classes):
+            record.in_skip = depth
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or tag not in self.stack:
+            return
+        if tag in BLOCK_TAGS:
+            self._gap()
+        # Close everything up to the matching open tag (browsers' implied ends)
+        while self.stack:
+            depth = len(self.stack)
+            closed = self.stack.pop()
+            for record in self.open:
+                if record.in_title == depth:
+                    record.in_title = 0
+                if record.in_snippet == depth:
+                    record.in_snippet = 0
+                if record.in_link == depth:
+                    record.in_link = 0
+                if record.in_skip == depth:
+                    record.in_skip = 0
+            if self.open and self.open[-1].depth == depth:
+                self.records.append(self.open.pop())
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.open:
+            return
+        record = self.open[-1]
+        if record.in_skip:
+            return
+        for open_record in self.open:
+            open_record.text.append(data)
+        if record.in_title:
+            record.title.append(data)
+        if record.in_snippet:
+            record.snippet.append(data)
+        if record.in_link and record.link_href == record.url:
+            record.link_text.append(data)  # Title fallback: text of the result link
+
+    def _gap(self):
+        for record in self.open:
+            record.text.append(" ")
+            if record.in_snippet:
+                record.snippet.append(" ")
+
+    def close(self):
+        super().close()
+        while self.open:
+            self.records.append(self.open.pop())
+
+
+def _clean(parts: List[str]) -> str:
+    return WHITESPACE_RE.sub(" ", "".join(parts)).strip()
+
+
+def clean_href(href: str) -> Optional[str]:
+    """Unwraps Google (/url?q=), Bing (/ck/a?u=a1<base64>) and DuckDuckGo (/l/?uddg=) redirects; None for in-engine links."""
+    if not href:
+        return None
+    if "/url?" in href:
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
+        href = (query.get("q") or query.get("url") or [href])[0]
+    elif "bing.com/ck/a?" in href:
+        encoded = urllib.parse.parse_qs(urllib.parse.urlparse(href).query).get("u", [""])[0]
+        if encoded.startswith("a1"):
+            try:
+                href = base64.urlsafe_b64decode(encoded[2:] + "=" * (-len(encoded[2:]) % 4)).decode("utf-8")
+            except ValueError:
+                pass
+    elif "uddg=" in href:
+        href = urllib.parse.parse_qs(urllib.parse.urlparse(href).query).get("uddg", [href])[0]
+    if href.startswith("//"):
+        href = "https:" + href
+    return href if href.startswith("http") else None
+
+
+def parse_serp(html: str, engine: str) -> List[SerpResult]:
+    """
+    Organic results of a results page, in page order.
+
+    Args:
+        html: page.content() of a Google / Bing / DuckDuckGo results page
+        engine: 'google' | 'bing' | 'ddg'
+    """
+    parser = _SerpHTMLParser(ENGINES[engine])
+    parser.feed(INVISIBLE_RE.sub("", html or ""))
+    parser.close()
+
+    results, seen = [], set()
+    # Records close innermost-first; page order is the order they opened
+    for record in sorted(parser.records, key=lambda r: r.order):
+        url = clean_href(record.url)
+        if not url or url in seen:
+            continue
+        title = _clean(record.title) or _clean(record.link_text)
+        if not title:
+            continue
+        seen.add(url)
+        results.append(SerpResult(url, title, _clean(record.snippet), _clean(record.text), record.image, len(results) + 1))
+    return results
+
+
+async def fetch_serp(page, engine: str) -> List[SerpResult]:
+    """Parse the results page currently loaded in a Playwright page (one CDP call)."""
+    return parse_serp(await page.content(), engine)
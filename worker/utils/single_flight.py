@@ -0,0 +1,64 @@
+"""
+CLARITY PEARL - SINGLE-FLIGHT COALESCING
+Concurrent identical requests share one in-flight call.
+
+The first caller for a key starts the work; anyone asking for the same key
+while it is still running awaits the same task instead of spending another
+API call. Nothing is cached once the call settles - that is the job of the
+caches in front of each client.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key.
+    """
+
+    def __init__(self, name: str = "single-flight"):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() once per key among concurrent callers.
+
+        Args:
+            key: Hashable identity of the request (e.g. (query, type, num))
+            factory: Zero-arg callable returning the coroutine to run
+
+        Returns:
+            The shared result (exceptions are re-raised to every waiter)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._forget(k, _t))
+        # shield(): one waiter being cancelled must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved so an orphaned failure doesn't warn
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
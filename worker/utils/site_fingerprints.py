@@ -0,0 +1,116 @@
+"""
+CLARITY PEARL - WEBSITE FINGERPRINTS
+What a company website looked like the last time we crawled it.
+
+Per site: the crawled URLs with their ETag, Last-Modified and content hash,
+plus the contacts extracted from them. Revisits send conditional GETs; when
+every page answers 304 (or the same hash) the stored extraction is reused and
+nothing is parsed again. Website-derived enrichment layers can then keep their
+cached results instead of recomputing.
+
+Storage: in-process LRU in front of Supabase `website_fingerprints`.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# In-process sites kept (Render free tier: keep it small)
+MEMORY_ENTRIES = 2000
+
+
+def site_key(url: str) -> str:
+    """'https://Acme.com/' and 'https://acme.com' are the same site."""
+    return url.strip().rstrip("/").lower()
+
+
+def conditional_headers(page: Optional[Dict]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since for a stored page fingerprint."""
+    headers = {}
+    if page and page.get("etag"):
+        headers["If-None-Match"] = page["etag"]
+    if page and page.get("last_modified"):
+        headers["If-Modified-Since"] = page["last_modified"]
+    return headers
+
+
+class SiteFingerprints:
+    """
+    Per-site fetch fingerprints and last extraction. Use the module singleton `site_fingerprints`.
+    """
+
+    def __init__(self, supabase=None):
+        self.supabase = supabase
+        self.memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self.unchanged = 0
+        self.changed = 0
+
+    def get(self, url: str) -> Optional[Dict]:
+        """{"pages": {url: {"etag", "last_modified", "hash"}}, "extracted": {...}} or None."""
+        key = site_key(url)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        if not self.supabase:
+            return None
+        try:
+            res = self.supabase.table('website_fingerprints').select('pages, extracted').eq('site_url', key).execute()
+        except Exception as e:
+            print(f"⚠️ Website fingerprint lookup failed: {e}")
+            return None
+        if not res.data:
+            return None
+        record = {"pages": res.data[0].get('pages') or {}, "extracted": res.data[0].get('extracted')}
+        self._remember(key, record)
+        return record
+
+    def save(self, url: str, pages: Dict[str, Dict], extracted: Dict):
+        """Fingerprints and extraction of a full crawl."""
+        key = site_key(url)
+        self.changed += 1
+        self._remember(key, {"pages": pages, "extracted": extracted})
+        if not self.supabase:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            self.supabase.table('website_fingerprints').upsert({
+                "site_url": key,
+                "pages": pages,
+                "extracted": extracted,
+                "checked_at": now,
+                "changed_at": now
+            }).execute()
+        except Exception as e:
+            print(f"⚠️ Website fingerprint save failed: {e}")
+
+    def mark_unchanged(self, url: str):
+        self.unchanged += 1
+        if not self.supabase:
+            return
+        try:
+            self.supabase.table('website_fingerprints').update({
+                "checked_at": datetime.now(timezone.utc).isoformat()
+            }).eq('site_url', site_key(url)).execute()
+        except Exception as e:
+            print(f"⚠️ Website fingerprint touch failed: {e}")
+
+    def invalidate(self, url: str):
+        """The site changed: the next visit does a full crawl without revalidating first."""
+        record = self.memory.get(site_key(url))
+        if record is not None:
+            record["extracted"] = None
+        else:
+            self._remember(site_key(url), {"pages": {}, "extracted": None})
+
+    def _remember(self, key: str, record: Dict):
+        self.memory[key] = record
+        self.memory.move_to_end(key)
+        while len(self.memory) > MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        return {"unchanged": self.unchanged, "changed": self.changed, "entries": len(self.memory)}
+
+
+# Singleton instance
+site_fingerprints = SiteFingerprints()
@@ -0,0 +1,127 @@
+"""
+CLARITY PEARL - JOB TIME BUDGET
+A deadline that travels with the job through scraping and enrichment.
+
+The controller opens a budget per job (from search_metadata or priority) and
+activates it with `use_budget`; anything downstream (engines, the bridge, the
+layer scheduler) reads it with `get_budget()` instead of taking a new argument.
+Child budgets carve out a phase (scrape share, save reserve) and share the
+parent's skip log, so the job can report what was dropped to meet the deadline.
+Outside a job `get_budget()` returns an unlimited budget.
+"""
+
+import math
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Default SLA per job, by priority (higher priority = tighter deadline)
+PRIORITY_BUDGETS = [(5, 180), (2, 420)]
+DEFAULT_BUDGET_SECONDS = int(os.getenv("JOB_BUDGET_SECONDS", "900"))
+# Bounds for budgets requested through search_metadata
+MIN_BUDGET_SECONDS = 60
+MAX_BUDGET_SECONDS = 3600
+
+
+class TimeBudget:
+    """
+    Monotonic deadline plus a log of work skipped because of it.
+    """
+
+    def __init__(self, seconds: Optional[float], label: str = "job", skipped: Optional[Dict[str, int]] = None):
+        self.label = label
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds if seconds is not None else math.inf
+        self.skipped = skipped if skipped is not None else {}
+
+    @classmethod
+    def for_job(cls, job_data: Dict) -> "TimeBudget":
+        """
+        Budget for a claimed job.
+
+        search_metadata may carry `deadline_seconds` (relative) or `deadline_at`
+        (ISO timestamp); otherwise the job's priority picks a default.
+        """
+        metadata = job_data.get('search_metadata') or {}
+        seconds = None
+        try:
+            if metadata.get('deadline_seconds'):
+                seconds = float(metadata['deadline_seconds'])
+            elif metadata.get('deadline_at'):
+                deadline = datetime.fromisoformat(str(metadata['deadline_at']).replace("Z", "+00:00"))
+                if deadline.tzinfo is None:
+                    deadline = deadline.replace(tzinfo=timezone.utc)
+                seconds = (deadline - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Ignoring invalid job deadline: {e}")
+            seconds = None
+
+        if seconds is None:
+            priority = job_data.get('priority') or 0
+            seconds = next((budget for level, budget in PRIORITY_BUDGETS if priority >= level), DEFAULT_BUDGET_SECONDS)
+        return cls(max(MIN_BUDGET_SECONDS, min(seconds, MAX_BUDGET_SECONDS)))
+
+    # --- CLOCK ---
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float) -> float:
+        """A step's own timeout, shortened to what's left of the budget."""
+        return min(timeout, self.remaining())
+
+    def wait_timeout(self) -> Optional[float]:
+        """For asyncio.wait_for: None when unlimited."""
+        return None if self.deadline == math.inf else self.remaining()
+
+    # --- PHASES ---
+
+    def sub(self, label: str, fraction: float = 1.0, reserve: float = 0) -> "TimeBudget":
+        """
+        Child budget for one phase: `fraction` of what's left, minus `reserve`
+        seconds kept back for whatever runs after it. Shares the skip log.
+        """
+        if self.deadline == math.inf:
+            return TimeBudget(None, label, self.skipped)
+        return TimeBudget(max(0.0, self.remaining() * fraction - reserve), label, self.skipped)
+
+    # --- REPORTING ---
+
+    def note_skip(self, what: str, count: int = 1):
+        if count > 0:
+            self.skipped[what] = self.skipped.get(what, 0) + count
+
+    def report(self) -> Dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "budget_s": self.seconds,
+            "elapsed_s": round(elapsed, 1),
+            "deadline_hit": self.seconds is not None and elapsed >= self.seconds,
+            "skipped": dict(self.skipped)
+        }
+
+
+_UNLIMITED = TimeBudget(None, "unlimited")
+_current: ContextVar[TimeBudget] = ContextVar("time_budget", default=_UNLIMITED)
+
+
+def get_budget() -> TimeBudget:
+    """The budget of the job being processed (unlimited outside a job)."""
+    return _current.get()
+
+
+@contextmanager
+def use_budget(budget: TimeBudget):
+    """Make `budget` the active one for everything awaited inside the block."""
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
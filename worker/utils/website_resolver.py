@@ -0,0 +1,229 @@
+"""
+CLARITY PEARL - WEBSITE RESOLVER
+Company name -> official website, cheapest source first.
+
+1. cache:   this process already resolved the name (hits and misses)
+2. seen:    another lead of the same normalized company had a domain
+3. probe:   slug guesses (acmeroofing.com, acme-roofing.com...) that resolve in
+            DNS, answer a HEAD and whose homepage names the company
+4. hydra:   one search through the Hydra API tier
+5. browser: the Google -> Bing -> DuckDuckGo crawl, on a leased page
+
+Each tier only runs if the previous ones came up empty; every outcome is
+cached. Maps jobs hit this for most leads, so the browser is the exception.
+"""
+
+import asyncio
+import re
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from utils.company_cache import company_cache, normalize_domain
+from utils.deduplication_service import DeduplicationService
+from utils.http_client import http_client
+
+# Resolution cache (per process): misses expire sooner, a site may go live
+HIT_TTL = 30 * 86400
+MISS_TTL = 3 * 86400
+MEMORY_ENTRIES = 5000
+
+# Slug probing
+PROBE_TLDS = (".com", ".net", ".co")
+MAX_PROBES = 6
+DNS_TIMEOUT = 3
+PROBE_TIMEOUT = 5
+# Words that don't make it into a company's domain
+LEGAL_SUFFIXES = {"inc", "llc", "ltd", "co", "corp", "corporation", "company", "gmbh", "plc", "pllc", "lp", "llp", "pc", "sa", "ag", "bv"}
+STOPWORDS = {"the", "and", "of"}
+# Hosts a guessed domain may redirect to when it's parked or for sale
+PARKING_HOSTS = ("sedoparking.", "godaddy.", "dan.com", "afternic.", "hugedomains.", "parkingcrew.", "bodis.", "namecheap.", "squarespace.com/domain")
+PARKING_MARKERS = ("domain is for sale", "buy this domain", "domain may be for sale", "parked free", "this domain is parked")
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.S | re.I)
+
+
+class WebsiteResolver:
+    """
+    Tiered company website lookup. Use the module singleton `website_resolver`.
+    """
+
+    def __init__(self):
+        self.memory: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()  # key -> (url, expires)
+        self._normalizer = DeduplicationService(None)
+        self.sources: Dict[str, int] = {}
+
+    async def resolve(self, company_name: str, page=None) -> Tuple[Optional[str], str]:
+        """
+        Returns (url or None, source). source is the tier that answered:
+        'cache' | 'seen' | 'probe' | 'hydra' | 'browser' | 'none'.
+        Pass the Playwright page to allow the browser tier.
+        """
+        name = (company_name or "").strip()
+        if not name:
+            return None, "none"
+        key = self._normalizer.normalize_company(name)
+
+        cached = self.memory.get(key)
+        if cached and time.time() < cached[1]:
+            self.memory.move_to_end(key)
+            self._count("cache")
+            return cached[0], "cache"
+
+        url, source = None, "none"
+        domain = company_cache.seen_domain(name)
+        if domain:
+            url, source = f"https://{domain}", "seen"
+        if not url:
+            url = await self._probe(name)
+            source = "probe" if url else source
+        if not url:
+            url = await self._hydra(name)
+            source = "hydra" if url else source
+        if not url and page is not None:
+            url = await self._browser(name, page)
+            source = "browser" if url else source
+
+        self._remember(key, url)
+        self._count(source)
+        if url:
+            print(f"   🧭 Website for '{name}': {url} (via {source})")
+        return url, source
+
+    # --- TIERS ---
+
+    async def _probe(self, name: str) -> Optional[str]:
+        candidates = slug_domains(name)
+        if not candidates:
+            return None
+        resolving = [host for host, ok in zip(candidates, await asyncio.gather(*(_resolves(h) for h in candidates))) if ok]
+        if not resolving:
+            return None
+        # HEAD in parallel; keep the order of the guesses (best guess first)
+        answers = await asyncio.gather(*(_head(f"https://{host}") for host in resolving))
+        for final_url in answers:
+            if final_url and await _names_company(final_url, name):
+                return final_url
+        return None
+
+    async def _hydra(self, name: str) -> Optional[str]:
+        from utils.hydra_client import hydra_client
+        from scrapers.website_engine import WebsiteEngine
+        try:
+            results = await hydra_client.search(f"{name} official site", type="search", num=5)
+        except Exception as e:
+            print(f"   ⚠️ Resolver: Hydra lookup failed: {e}")
+            return None
+        is_valid = WebsiteEngine(None)._is_valid_company_url
+        links = [r.get('source_url') or r.get('link') for r in results or [] if isinstance(r, dict)]
+        links = [link for link in links if link and link.startswith("http") and is_valid(link)]
+        if not links:
+            return None
+        # Prefer a result whose domain carries the name over the first organic hit
+        slug = _slug_words(name)
+        for link in links:
+            host = normalize_domain(link) or ""
+            if slug and "".join(slug[:2]) in host.replace("-", ""):
+                return _homepage(link)
+        return _homepage(links[0])
+
+    async def _browser(self, name: str, page) -> Optional[str]:
+        from scrapers.website_engine import WebsiteEngine
+        from utils.page_pool import lease_page
+        async with lease_page(page) as leased:
+            return await WebsiteEngine(leased).find_company_website(name)
+
+    # --- CACHE ---
+
+    def _remember(self, key: str, url: Optional[str]):
+        self.memory[key] = (url, time.time() + (HIT_TTL if url else MISS_TTL))
+        self.memory.move_to_end(key)
+        while len(self.memory) > MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    def _count(self, source: str):
+        self.sources[source] = self.sources.get(source, 0) + 1
+
+    def get_stats(self) -> Dict:
+        """Resolutions per tier (how often the browser was still needed)."""
+        return dict(self.sources)
+
+
+def _slug_words(name: str) -> List[str]:
+    words = re.sub(r"[^a-z0-9\s]", " ", name.lower().replace("&", " and ")).split()
+    words = [w for w in words if w not in STOPWORDS]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return words
+
+
+def slug_domains(name: str) -> List[str]:
+    """Likely domains for a company name, best guess first: 'Acme Roofing, LLC' -> acmeroofing.com, ..."""
+    words = _slug_words(name)
+    if len(words) < 2:
+        return []  # "Bakery" -> bakery.com is someone else's site; leave one-word names to search
+    slugs = ["".join(words)]
+    slugs.append("-".join(words))
+    if len(words) > 2:
+        slugs.append("".join(words[:2]))  # "Acme Roofing Austin" -> acmeroofing
+    hosts = []
+    for tld in PROBE_TLDS:
+        for slug in slugs:
+            if 3 <= len(slug) <= 63:
+                hosts.append(slug + tld)
+    return hosts[:MAX_PROBES]
+
+
+def _homepage(url: str) -> str:
+    parts = urllib.parse.urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _headers() -> Dict[str, str]:
+    from scrapers.website_engine import HTTP_HEADERS
+    return HTTP_HEADERS
+
+
+async def _resolves(host: str) -> bool:
+    try:
+        await asyncio.wait_for(asyncio.get_running_loop().getaddrinfo(host, 443), timeout=DNS_TIMEOUT)
+        return True
+    except Exception:
+        return False
+
+
+async def _head(url: str) -> Optional[str]:
+    """Final URL after redirects if the site answers (and isn't parked), else None."""
+    try:
+        response = await http_client.request("HEAD", url, timeout=PROBE_TIMEOUT, retries=0, headers=_headers())
+    except Exception:
+        return None
+    # Some servers refuse HEAD but serve GET fine
+    if response.status >= 400 and response.status not in (403, 405):
+        return None
+    final = response.url or url
+    if any(host in final.lower() for host in PARKING_HOSTS):
+        return None
+    return _homepage(final)
+
+
+async def _names_company(url: str, name: str) -> bool:
+    """The homepage's title/opening text mentions the company (guards against namesakes and parked pages)."""
+    try:
+        response = await http_client.get(url, headers=_headers(), timeout=PROBE_TIMEOUT, retries=0)
+    except Exception:
+        return False
+    if not response.ok:
+        return False
+    head = response.text[:30000].lower()
+    if any(marker in head for marker in PARKING_MARKERS):
+        return False
+    words = [w for w in _slug_words(name) if w not in LEGAL_SUFFIXES]
+    title = TITLE_RE.search(head)
+    haystack = (title.group(1) if title else "") + " " + head[:10000]
+    found = sum(1 for w in words if w in haystack)
+    return bool(words) and found / len(words) >= 0.6
+
+
+# Singleton instance
+website_resolver = WebsiteResolver()